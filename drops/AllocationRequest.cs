@@ -9,6 +9,8 @@ namespace ServerlessPoolOptimizer
     public enum RequestType { Allocation, Deallocation }
     public class AllocationRequest
     {
+        // per thread, replications simulated in parallel number their requests independently
+        [ThreadStatic]
         private static int _requestIdCounter;
         public static event EventHandler<AllocationRequest> FireRequestComplete;
         public static void Init()
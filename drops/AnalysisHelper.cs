@@ -51,7 +51,8 @@ namespace ServerlessPoolOptimizer
         {
             foreach (var (poolLabel, poolDistributions) in trace.PoolLabelToDistributions)
             {
-                poolDistributions.SmoothedTrace = SmoothedTrace.CreateSmoothedTrace(poolDistributions.ArrivalTimeList, windowSize);
+                poolDistributions.SmoothedTrace = SmoothedTrace.CreateSmoothedTrace(poolDistributions.GetArrivalCounts(),
+                                                                                    poolDistributions.ArrivalTimeList, windowSize);
             }
         }
 
@@ -110,6 +111,10 @@ namespace ServerlessPoolOptimizer
                 AnalysisHelper.GenerateSuccessRateMap(poolDistributions.PercentileToPoolSizeDistributionMap[1.0],
                                                                         poolDistributions.PoolSizeToSuccessRateMap);
 
+                foreach (var poolSizeDistribution in poolDistributions.PercentileToPoolSizeDistributionMap.Values)
+                {
+                    (poolSizeDistribution as DistributionEmpiricalDoubleFrequencyArray)?.Freeze();
+                }
             }
         }
 
@@ -149,6 +154,8 @@ namespace ServerlessPoolOptimizer
                                             )
         {
             double windowSize;
+            // with a simulation seed the pod life cycles of every pool come from a stream of the pool, kept over the samples
+            var poolLifeCycleRandoms = exp.SimulationSeed != null ? new Dictionary<PoolLabel, Random>() : null;
             for (int i = 0; i < samplesCount; i++)
             {
                 if (exp.SamplingApproach == SamplingApproach.Average)
@@ -171,7 +178,8 @@ namespace ServerlessPoolOptimizer
                                                             hostRoleDemandCountDistribution,
                                                             hostRoleRecyclingCountDistribution,
                                                             poolLabels,
-                                                            1
+                                                            1,
+                                                            poolLifeCycleRandoms
                                                         );
                 if ((i + 1) % 100 == 0)
                 {
@@ -232,7 +240,8 @@ namespace ServerlessPoolOptimizer
                                                         Dictionary<double, IDistribution>? hostRoleDemandCountDistribution,
                                                         Dictionary<double, IDistribution>? hostRoleRecyclingCountDistribution,
                                                         List<PoolLabel>? poolLabels,
-                                                        ulong frequency
+                                                        ulong frequency,
+                                                        Dictionary<PoolLabel, Random>? poolLifeCycleRandoms
                                                         )
         {
 
@@ -244,15 +253,14 @@ namespace ServerlessPoolOptimizer
 
             SortedSet<SimEvent> podRecyclingEvents = new SortedSet<SimEvent>(new ComparerAllowDuplicate<SimEvent>());
             SortedSet<SimEvent> processedEvents = new SortedSet<SimEvent>(new ComparerAllowDuplicate<SimEvent>());
+            // the recycling events carry handles of these pods
+            PodStore pods = new PodStore();
             Dictionary<double, int> coreToCreatedPodsCount = new Dictionary<double, int>();
             Dictionary<double, int> coreToRecycledPodsCount = new Dictionary<double, int>();
 
-            IDictionary<PoolLabel, int> poolLabelToIndex = new Dictionary<PoolLabel, int>();
-            foreach (var poolLabel in trace.PoolLabelToTraceLines.Keys)
-            {
-                if (poolLabels == null || poolLabels.Contains(poolLabel))
-                    poolLabelToIndex.Add(poolLabel, 0);
-            }
+            var traceLineMerger = new TraceLineMerger(trace, poolLabels);
+            // request of the current merger head, created once per trace line
+            AllocationRequest? headRequest = null;
 
             double windowStartTime = 0.0;
             double windowEndTime = windowStartTime;
@@ -264,7 +272,15 @@ namespace ServerlessPoolOptimizer
                 //window expansion phase
                 while (windowEndTime - windowStartTime < windowSize)
                 {
-                    request = trace.GetNextRequest(poolLabelToIndex);
+                    if (headRequest == null)
+                    {
+                        var traceLine = traceLineMerger.Peek();
+                        if (traceLine != null)
+                        {
+                            headRequest = trace.LineFieldsToAllocationRequest(traceLine);
+                        }
+                    }
+                    request = headRequest;
                     nextEvent = podRecyclingEvents.Min;
                     if (request == null && nextEvent == null)
                     {
@@ -300,8 +316,9 @@ namespace ServerlessPoolOptimizer
                     if (request != null)
                     {
                         // increment pool index to get next request
-                        poolLabel = TraceLineFields.ConvertToPoolLabel(request.AllocationPoolGroupLabel.Runtime, request.AllocationPoolGroupLabel.RuntimeVersion, request.Cores);
-                        poolLabelToIndex[poolLabel]++;
+                        poolLabel = traceLineMerger.PeekPoolLabel();
+                        traceLineMerger.Advance();
+                        headRequest = null;
                         if (request.RequestType == RequestType.Deallocation)
                         {
                             // ignore deallocation requests
@@ -309,11 +326,19 @@ namespace ServerlessPoolOptimizer
                         }
                         counter++;
                         // create pod recycling event 
+                        Random? poolLifeCycleRandom = null;
+                        if (poolLifeCycleRandoms != null && exp.SimulationSeed is int simulationSeed
+                            && !poolLifeCycleRandoms.TryGetValue(poolLabel, out poolLifeCycleRandom))
+                        {
+                            poolLifeCycleRandom = RandomSource.CreateStream(simulationSeed, "HostRoleAnalysis/" + poolLabel);
+                            poolLifeCycleRandoms.Add(poolLabel, poolLifeCycleRandom);
+                        }
                         var podLifeCycle = trace.SamplePodLifeCycle(poolLabel,
                                                                     exp.SamplingApproach,
-                                                                    exp.IgnorePodTransitionsExceptCreation);
+                                                                    exp.IgnorePodTransitionsExceptCreation,
+                                                                    poolLifeCycleRandom);
                         var recycleTimePoint = request.ArrivalTimePoint + podLifeCycle.GetTransitionEndTimePoint(PodState.Recycled);
-                        Pod pod = new Pod(clock, 0, podLifeCycle, request.AllocationPoolGroupLabel, request.Cores, 0);
+                        var pod = new PodHandle(0, pods.Add(0, request.Cores, 0, podLifeCycle), 0);
                         nextEvent = simulator.CreateEvent(EventType.PodBecomesRecycled, 0.0, recycleTimePoint, null, null, pod);
 
                         // add request the list to move window start index 
@@ -330,12 +355,12 @@ namespace ServerlessPoolOptimizer
                     {
                         podRecyclingEvents.Remove(nextEvent);
                         processedEvents.Add(nextEvent);
-                        Pod pod = nextEvent.GetPod();
-                        if (!coreToRecycledPodsCount.ContainsKey(pod._podCores))
+                        double podCores = pods._podCores[nextEvent.GetPod().Slot];
+                        if (!coreToRecycledPodsCount.ContainsKey(podCores))
                         {
-                            coreToRecycledPodsCount.Add(pod._podCores, 0);
+                            coreToRecycledPodsCount.Add(podCores, 0);
                         }
-                        coreToRecycledPodsCount[pod._podCores]++;
+                        coreToRecycledPodsCount[podCores]++;
                     }
                 }
                 if (hostRoleDemandRateDistribution != null)
@@ -413,9 +438,9 @@ namespace ServerlessPoolOptimizer
                     }
                     else if (nextEvent.GetEventType() == EventType.PodBecomesRecycled)
                     {
-                        Pod pod = nextEvent.GetPod();
-                        coreToRecycledPodsCount[pod._podCores]--;
-                        Debug.Assert(coreToRecycledPodsCount[pod._podCores] >= 0);
+                        double podCores = pods._podCores[nextEvent.GetPod().Slot];
+                        coreToRecycledPodsCount[podCores]--;
+                        Debug.Assert(coreToRecycledPodsCount[podCores] >= 0);
                     }
                 }
             }
@@ -427,12 +452,14 @@ namespace ServerlessPoolOptimizer
                                 Dictionary<double, IDistribution>? percentileToPoolSizeDistributionMap,
                                 int samples)
         {
+            // the recycling trace is resampled every time, the timeline arrays are rebuilt in place
+            var timeline = new DemandEventTimeline();
             for (int i = 0; i < samples; i++)
             {
                 exp.Trace.SampleRecyclingTrace(exp);
+                timeline.Build(exp.Trace.requestsList, exp.Trace.deallocationList);
                 DropsPerRequestCoreDemandAnalysis(exp,
-                                                    exp.Trace.requestsList,
-                                                    exp.Trace.deallocationList,
+                                                    timeline,
                                                     supplyDemandDistribution,
                                                     exp.SamplingApproach,
                                                     percentileToPoolSizeDistributionMap
@@ -447,10 +474,15 @@ namespace ServerlessPoolOptimizer
                                 Dictionary<double, IDistribution>? percentileToPoolSizeDistributionMap,
                                 int samples)
         {
-            double windowSize;
             var supplyDemandFreqDistribution = supplyDemandDistribution;
-            for (int i = 0; i < samples; i++)
+            // the arrival timeline is the same for all samples, only the window size is sampled
+            var timeline = new DemandEventTimeline();
+            timeline.Build(allocationsArrivalTimeList, []);
+            int completedSamples = 0;
+            RunMonteCarloSamples(exp, samples, supplyDemandDistribution, percentileToPoolSizeDistributionMap,
+                (i, samplePercentileToPoolSizeDistributionMap) =>
             {
+                double windowSize;
                 if (exp.SamplingApproach == SamplingApproach.Average)
                 {
                     windowSize = supplyDemandFreqDistribution.GetMean();
@@ -465,16 +497,16 @@ namespace ServerlessPoolOptimizer
                 }
 
                 GenericPerRequestCoreDemandAnalysis(exp,
-                                                    allocationsArrivalTimeList,
-                                                    [],
+                                                    timeline,
                                                     windowSize,
                                                     1,
-                                                    percentileToPoolSizeDistributionMap
+                                                    samplePercentileToPoolSizeDistributionMap
                                                     );
 
-                if ((i + 1) % 50 == 0)
-                    Console.WriteLine("{0} samples Completed!", i + 1);
-            }
+                var completed = Interlocked.Increment(ref completedSamples);
+                if (completed % 50 == 0)
+                    Console.WriteLine("{0} samples Completed!", completed);
+            });
         }
 
         public static void PodDemandAnalysis(
@@ -484,107 +516,126 @@ namespace ServerlessPoolOptimizer
                                 Dictionary<double, IDistribution>? percentileToPoolSizeDistributionMap,
                                 int samples)
         {
-            for (int i = 0; i < samples; i++)
+            RunMonteCarloSamples(exp, samples, supplyDemandDistribution, percentileToPoolSizeDistributionMap,
+                (i, samplePercentileToPoolSizeDistributionMap) =>
             {
                 AnalysisHelper.PerRequestPodDemandAnalysis(allocationsArrivalTimeList, supplyDemandDistribution,
                                                                                     exp.SamplingApproach,
-                                                                                    percentileToPoolSizeDistributionMap
+                                                                                    samplePercentileToPoolSizeDistributionMap
                                                                                     );
-            }
+            });
         }
 
-        public static void GenericPerRequestCoreDemandAnalysis(Experiment exp,
-                                                        List<(PoolLabel, double)> requestsArrivalTime,
-                                                        List<(PoolLabel, double)> coreRecyclingArrivalTime,
-                                                        double windowSize,
-                                                        double frequency,
-                                                        Dictionary<double, IDistribution>? percentileToPoolSizeDistributionMap)
+        /*
+         *  Runs the Monte Carlo samples of a demand analysis. With AnalysisParallelism > 1 the samples are spread
+         *  over worker threads: sample i draws from its own generator seeded with (AnalysisSeed, i), so the sampled
+         *  values do not depend on the threads count or scheduling, and every worker fills its own copy of the
+         *  distributions that is merged into percentileToPoolSizeDistributionMap at the end.
+         */
+        private static void RunMonteCarloSamples(Experiment exp,
+                                                int samples,
+                                                IDistribution sampledDistribution,
+                                                Dictionary<double, IDistribution>? percentileToPoolSizeDistributionMap,
+                                                Action<int, Dictionary<double, IDistribution>?> runSample)
         {
+            if (exp.AnalysisParallelism <= 1 || samples <= 1)
+            {
+                for (int i = 0; i < samples; i++)
+                {
+                    runSample(i, percentileToPoolSizeDistributionMap);
+                }
+                return;
+            }
 
-            List<(RequestType, (PoolLabel, double))> eventsList = new List<(RequestType, (PoolLabel, double))>();
-
-            int allocationIdx = 0;
-            int recyclingIdx = 0;
+            // empirical distributions sort/accumulate lazily on first read, do it before the workers share them
+            sampledDistribution.Prepare();
 
-            while (allocationIdx < requestsArrivalTime.Count || recyclingIdx < coreRecyclingArrivalTime.Count)
-            {
-                if (allocationIdx < requestsArrivalTime.Count && recyclingIdx < coreRecyclingArrivalTime.Count)
+            var parallelOptions = new ParallelOptions { MaxDegreeOfParallelism = exp.AnalysisParallelism };
+            Parallel.For(0, samples, parallelOptions,
+                () => CreateWorkerDistributionMap(percentileToPoolSizeDistributionMap),
+                (i, loopState, workerDistributionMap) =>
                 {
-                    var nextAllocationTS = requestsArrivalTime[allocationIdx].Item2;
-                    var nextRecyclingTS = coreRecyclingArrivalTime[recyclingIdx].Item2;
-                    if (nextAllocationTS <= nextRecyclingTS)
+                    var previousRandom = RandomSource.InitThread(unchecked(exp.AnalysisSeed * 1000003 + i));
+                    try
                     {
-                        eventsList.Add((RequestType.Allocation, requestsArrivalTime[allocationIdx]));
-                        allocationIdx++;
+                        runSample(i, workerDistributionMap);
                     }
-                    else
+                    finally
                     {
-                        eventsList.Add((RequestType.Deallocation, coreRecyclingArrivalTime[recyclingIdx]));
-                        recyclingIdx++;
+                        RandomSource.ResetThread(previousRandom);
                     }
-                }
-
-                else if (allocationIdx < requestsArrivalTime.Count)
+                    return workerDistributionMap;
+                },
+                workerDistributionMap =>
                 {
-                    eventsList.Add((RequestType.Allocation, requestsArrivalTime[allocationIdx]));
-                    allocationIdx++;
-                }
+                    if (percentileToPoolSizeDistributionMap == null)
+                    {
+                        return;
+                    }
+                    lock (percentileToPoolSizeDistributionMap)
+                    {
+                        foreach (var (percentile, distribution) in workerDistributionMap)
+                        {
+                            Utilities.AddDistribution(distribution, percentileToPoolSizeDistributionMap[percentile]);
+                        }
+                    }
+                });
+        }
 
-                else if (recyclingIdx < coreRecyclingArrivalTime.Count)
-                {
-                    eventsList.Add((RequestType.Deallocation, coreRecyclingArrivalTime[recyclingIdx]));
-                    recyclingIdx++;
-                }
+        private static Dictionary<double, IDistribution>? CreateWorkerDistributionMap(Dictionary<double, IDistribution>? percentileToDistributionMap)
+        {
+            if (percentileToDistributionMap == null)
+            {
+                return null;
             }
+            var workerDistributionMap = new Dictionary<double, IDistribution>();
+            foreach (var (percentile, distribution) in percentileToDistributionMap)
+            {
+                workerDistributionMap.Add(percentile, (IDistribution)Activator.CreateInstance(distribution.GetType()));
+            }
+            return workerDistributionMap;
+        }
 
-            int startIdx = 0;
-            int endIdx = 0;
-            Dictionary<double, int> podsCountMap = new Dictionary<double, int>();
+        public static void GenericPerRequestCoreDemandAnalysis(Experiment exp,
+                                                        DemandEventTimeline timeline,
+                                                        double windowSize,
+                                                        double frequency,
+                                                        Dictionary<double, IDistribution>? percentileToPoolSizeDistributionMap)
+        {
+            bool countRecycling = exp.HostRoleOptimizationMethod == HostRoleOptimizationMethod.DROPS;
+            var timePoints = timeline.TimePoints;
+            var isAllocation = timeline.IsAllocation;
+            var coreClasses = timeline.CoreClasses;
+            int[] podsCountPerClass = new int[timeline.CoreClassSizes.Count];
 
-            while (endIdx < eventsList.Count)
+            int startIdx = 0;
+            for (int endIdx = 0; endIdx < timeline.Count; endIdx++)
             {
-                var eventItem = eventsList[endIdx];
-                double cores = eventItem.Item2.Item1.Cores;
-                bool addToDist = false;
-                if (!podsCountMap.ContainsKey(cores))
-                {
-                    podsCountMap.Add(cores, 0);
-                }
-
-                if (eventItem.Item1 == RequestType.Allocation)
+                if (isAllocation[endIdx])
                 {
-                    podsCountMap[cores]++;
-                    addToDist = true;
+                    podsCountPerClass[coreClasses[endIdx]]++;
                 }
-                else
+                else if (countRecycling)
                 {
-                    if (exp.HostRoleOptimizationMethod == HostRoleOptimizationMethod.DROPS)
-                    {
-                        podsCountMap[cores]--;
-                    }
+                    podsCountPerClass[coreClasses[endIdx]]--;
                 }
 
-                while (startIdx <= endIdx && eventsList[endIdx].Item2.Item2 - eventsList[startIdx].Item2.Item2 >= windowSize)
+                while (startIdx <= endIdx && timePoints[endIdx] - timePoints[startIdx] >= windowSize)
                 {
-                    eventItem = eventsList[startIdx];
-                    cores = eventItem.Item2.Item1.Cores;
-                    if (eventItem.Item1 == RequestType.Allocation)
+                    if (isAllocation[startIdx])
                     {
-                        podsCountMap[cores]--;
+                        podsCountPerClass[coreClasses[startIdx]]--;
                     }
-                    else
+                    else if (countRecycling)
                     {
-                        if (exp.HostRoleOptimizationMethod == HostRoleOptimizationMethod.DROPS)
-                        {
-                            podsCountMap[cores]++;
-                        }
+                        podsCountPerClass[coreClasses[startIdx]]++;
                     }
                     startIdx++;
                 }
 
-                if (percentileToPoolSizeDistributionMap != null && addToDist)
+                if (percentileToPoolSizeDistributionMap != null && isAllocation[endIdx])
                 {
-                    double hostRoleCount = Math.Ceiling(Utilities.ComputeNeededHostRoles(podsCountMap, exp.HostRoleCores, exp.MaxPodsPerHostRole));
+                    double hostRoleCount = Math.Ceiling(timeline.ComputeNeededHostRoles(podsCountPerClass, exp.HostRoleCores, exp.MaxPodsPerHostRole));
                     if (hostRoleCount > 0)
                     {
                         foreach (var (percentile, distribution) in percentileToPoolSizeDistributionMap)
@@ -593,76 +644,29 @@ namespace ServerlessPoolOptimizer
                         }
                     }
                 }
-                endIdx++;
             }
         }
 
         public static void DropsPerRequestCoreDemandAnalysis(Experiment exp,
-                                                List<(PoolLabel, double)> requestsArrivalTime,
-                                                List<(PoolLabel, double)> coreRecyclingArrivalTime,
+                                                DemandEventTimeline timeline,
                                                 IDistribution creationTimeDistribution,
                                                 SamplingApproach samplingApproach,
                                                 Dictionary<double, IDistribution>? percentileToPoolSizeDistributionMap)
         {
+            bool countRecycling = exp.HostRoleOptimizationMethod == HostRoleOptimizationMethod.DROPS;
+            var timePoints = timeline.TimePoints;
+            var isAllocation = timeline.IsAllocation;
+            var coreClasses = timeline.CoreClasses;
+            int[] podsCountPerClass = new int[timeline.CoreClassSizes.Count];
 
-            List<(RequestType, (PoolLabel, double))> eventsList = new List<(RequestType, (PoolLabel, double))>();
-
-            int allocationIdx = 0;
-            int recyclingIdx = 0;
-            while (allocationIdx < requestsArrivalTime.Count || recyclingIdx < coreRecyclingArrivalTime.Count)
+            for (int endIdx = 0; endIdx < timeline.Count; endIdx++)
             {
-                if (allocationIdx < requestsArrivalTime.Count && recyclingIdx < coreRecyclingArrivalTime.Count)
+                if (!isAllocation[endIdx])
                 {
-                    var nextAllocationTS = requestsArrivalTime[allocationIdx].Item2;
-                    var nextRecyclingTS = coreRecyclingArrivalTime[recyclingIdx].Item2;
-                    if (nextAllocationTS <= nextRecyclingTS)
-                    {
-                        eventsList.Add((RequestType.Allocation, requestsArrivalTime[allocationIdx]));
-                        allocationIdx++;
-                    }
-                    else
-                    {
-                        eventsList.Add((RequestType.Deallocation, coreRecyclingArrivalTime[recyclingIdx]));
-                        recyclingIdx++;
-                    }
-                }
-
-                else if (allocationIdx < requestsArrivalTime.Count)
-                {
-                    eventsList.Add((RequestType.Allocation, requestsArrivalTime[allocationIdx]));
-                    allocationIdx++;
-                }
-
-                else if (recyclingIdx < coreRecyclingArrivalTime.Count)
-                {
-                    eventsList.Add((RequestType.Deallocation, coreRecyclingArrivalTime[recyclingIdx]));
-                    recyclingIdx++;
-                }
-            }
-
-            int startIdx = 0;
-            int endIdx = 0;
-            Dictionary<double, int> podsCountMap = new Dictionary<double, int>();
-            while (endIdx < eventsList.Count)
-            {
-
-                if (eventsList[endIdx].Item1 == RequestType.Deallocation)
-                {
-                    endIdx++;
                     continue;
                 }
-                var eventItem = eventsList[endIdx];
-                double cores = eventItem.Item2.Item1.Cores;
-                if (!podsCountMap.ContainsKey(cores))
-                {
-                    podsCountMap.Add(cores, 0);
-                }
 
-
-                foreach (var (size, count) in podsCountMap)
-                {
-                    podsCountMap[size] = 0;
-                }
+                Array.Clear(podsCountPerClass);
 
                 var creationTimeSample = creationTimeDistribution.GetSample();
                 switch (samplingApproach)
@@ -672,27 +676,21 @@ namespace ServerlessPoolOptimizer
                         break;
                 }
 
-                startIdx = endIdx;
-
-                while (startIdx >= 0 && eventsList[endIdx].Item2.Item2 - eventsList[startIdx].Item2.Item2 < creationTimeSample)
+                int startIdx = endIdx;
+                while (startIdx >= 0 && timePoints[endIdx] - timePoints[startIdx] < creationTimeSample)
                 {
-                    eventItem = eventsList[startIdx];
-                    cores = eventItem.Item2.Item1.Cores;
-                    if (eventItem.Item1 == RequestType.Allocation)
+                    if (isAllocation[startIdx])
                     {
-                        podsCountMap[cores]++;
+                        podsCountPerClass[coreClasses[startIdx]]++;
                     }
-                    else
+                    else if (countRecycling)
                     {
-                        if (exp.HostRoleOptimizationMethod == HostRoleOptimizationMethod.DROPS)
-                        {
-                            podsCountMap[cores]--;
-                        }
+                        podsCountPerClass[coreClasses[startIdx]]--;
                     }
                     startIdx--;
                 }
 
-                double hostRoleCount = Math.Ceiling(Utilities.ComputeNeededHostRoles(podsCountMap, exp.HostRoleCores, exp.MaxPodsPerHostRole));
+                double hostRoleCount = Math.Ceiling(timeline.ComputeNeededHostRoles(podsCountPerClass, exp.HostRoleCores, exp.MaxPodsPerHostRole));
                 if (hostRoleCount <= 0)
                 {
                     hostRoleCount = 1;
@@ -704,10 +702,9 @@ namespace ServerlessPoolOptimizer
                         distribution.AddValueFrequency(percentile * hostRoleCount, 1);
                     }
                 }
-                endIdx++;
-                if (endIdx % 100000 == 0)
+                if ((endIdx + 1) % 100000 == 0)
                 {
-                    Console.WriteLine("DROPS Per-core analysis: completed analysis for {0} events", endIdx);
+                    Console.WriteLine("DROPS Per-core analysis: completed analysis for {0} events", endIdx + 1);
                 }
             }
         }
@@ -755,60 +752,104 @@ namespace ServerlessPoolOptimizer
             }
         }
 
+        // predicted load per window (in file order) of every pool of a prediction file, parsed once per process
+        private static readonly Dictionary<string, Dictionary<PoolLabel, List<double>>> _predictedTracesCache =
+                                                                new Dictionary<string, Dictionary<PoolLabel, List<double>>>();
+
         public static void ParseSmoothedTraces(Experiment exp)
         {
-
-            string line = "";
-            try
+            var poolLabelToPredictedLoads = LoadPredictedTraces(exp.PredictedTraceFile);
+            foreach (var (poolLabel, poolDistributions) in exp.TestTrace.PoolLabelToDistributions)
             {
-
-                foreach (var (poolLabel, poolDistributions) in exp.TestTrace.PoolLabelToDistributions)
+                var trace = new List<(int, double)>();
+                if (poolLabelToPredictedLoads.TryGetValue(poolLabel, out var predictedLoads))
                 {
-                    poolDistributions.SmoothedTrace = new SmoothedTrace
-                    {
-                        WindowSize = exp.PredictionWindowSize,
-                        Trace = new List<(int, double)>()
-                    };
-                }
-
-                StreamReader reader = new StreamReader(exp.PredictedTraceFile);
-                line = reader.ReadLine();
-                line = reader.ReadLine();
-                while (line != null)
-                {
-                    string runtimeString = "";
-                    string runtimeVersionString = "";
-                    double cores;
-
-                    var tmp = line.Split(",");
-                    runtimeString = tmp[0].Split("_")[0].Split("=")[1];
-                    runtimeVersionString = tmp[0].Split("_")[1].Split("=")[1];
-                    var coreStr = (tmp[0].Split("_")[2]).Replace("m", "");
-                    cores = Double.Parse(coreStr);
-                    if (cores > 2)
+                    trace.Capacity = predictedLoads.Count;
+                    foreach (var predictedLoad in predictedLoads)
                     {
-                        cores = 0.25;
+                        trace.Add((0, predictedLoad / exp.PredictionWindowSize));
                     }
+                }
+                poolDistributions.SmoothedTrace = new SmoothedTrace
+                {
+                    WindowSize = exp.PredictionWindowSize,
+                    Trace = trace
+                };
+            }
+        }
+
+        /*
+         *  Reads the prediction file (item_id,...,predicted requests per window) into per-pool lists, shared read-only
+         *  by all the experiments that use the same file. The item id of a pool is only split the first time it is
+         *  seen. If the file cannot be read, the rows read so far are used and the file is read again next time.
+         */
+        private static Dictionary<PoolLabel, List<double>> LoadPredictedTraces(string predictedTraceFile)
+        {
+            lock (_predictedTracesCache)
+            {
+                if (_predictedTracesCache.TryGetValue(predictedTraceFile, out var cachedTraces))
+                {
+                    return cachedTraces;
+                }
+            }
 
-                    PoolLabel poolLabel = new PoolLabel(new AllocationLabel(runtimeString, runtimeVersionString), cores);
-                    if (!exp.TestTrace.PoolLabelToDistributions.ContainsKey(poolLabel))
+            var poolLabelToPredictedLoads = new Dictionary<PoolLabel, List<double>>();
+            var itemIdToPredictedLoads = new Dictionary<string, List<double>>();
+            string line = "";
+            try
+            {
+                using (StreamReader reader = new StreamReader(predictedTraceFile))
+                {
+                    line = reader.ReadLine();
+                    line = reader.ReadLine();
+                    while (line != null)
                     {
+                        int firstComma = line.IndexOf(',');
+                        string itemId = line.Substring(0, firstComma);
+                        if (!itemIdToPredictedLoads.TryGetValue(itemId, out var predictedLoads))
+                        {
+                            var poolLabel = ParsePredictedTraceItemId(itemId);
+                            if (!poolLabelToPredictedLoads.TryGetValue(poolLabel, out predictedLoads))
+                            {
+                                predictedLoads = new List<double>();
+                                poolLabelToPredictedLoads.Add(poolLabel, predictedLoads);
+                            }
+                            itemIdToPredictedLoads.Add(itemId, predictedLoads);
+                        }
+                        var tmp = line.Split(",");
+                        predictedLoads.Add(Double.Parse(tmp[2]));
                         line = reader.ReadLine();
-                        continue;
                     }
-                    var poolDistributions = exp.TestTrace.PoolLabelToDistributions[poolLabel];
-                    var trace = poolDistributions.SmoothedTrace.Trace;
-                    var avgLoad = Double.Parse(tmp[2]) / exp.PredictionWindowSize;
-                    trace.Add((0, avgLoad));
-                    line = reader.ReadLine();
                 }
             }
             catch (Exception e)
             {
-                Console.WriteLine("Exception while reading {0}", exp.PredictedTraceFile);
+                Console.WriteLine("Exception while reading {0}", predictedTraceFile);
                 Console.WriteLine(e.ToString());
                 Console.WriteLine(line);
+                return poolLabelToPredictedLoads;
+            }
+
+            lock (_predictedTracesCache)
+            {
+                _predictedTracesCache[predictedTraceFile] = poolLabelToPredictedLoads;
+            }
+            return poolLabelToPredictedLoads;
+        }
+
+        // item ids are <key>=<runtime>_<key>=<runtime version>_<cores>[m]
+        private static PoolLabel ParsePredictedTraceItemId(string itemId)
+        {
+            var itemParts = itemId.Split("_");
+            string runtimeString = itemParts[0].Split("=")[1];
+            string runtimeVersionString = itemParts[1].Split("=")[1];
+            var coreStr = itemParts[2].Replace("m", "");
+            double cores = Double.Parse(coreStr);
+            if (cores > 2)
+            {
+                cores = 0.25;
             }
+            return new PoolLabel(new AllocationLabel(runtimeString, runtimeVersionString), cores);
         }
 
         public static void DumpFrequencyDistribution(IDistribution distribution, string filePath)
@@ -831,6 +872,17 @@ namespace ServerlessPoolOptimizer
             }
         }
 
+        // percentile of the pod demand distribution used to size a pool for a target success rate
+        internal static double AdjustPoolTargetPercentile(double targetPercentile)
+        {
+            var adjustedPercentile = targetPercentile;
+            if (adjustedPercentile != 1.0)
+            {
+                adjustedPercentile = 1 - 0.5959 * (1 - adjustedPercentile);
+            }
+            return adjustedPercentile;
+        }
+
         internal static int FindBufferSizeToMatchPercentile(Dictionary<int, double> bufferSizeToSuccessRateMap, double targetPercentile)
         {
             List<int> SortedSizes = new List<int>(bufferSizeToSuccessRateMap.Keys);
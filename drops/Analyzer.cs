@@ -4,7 +4,7 @@ namespace ServerlessPoolOptimizer
 {
     public class Analyzer
     {
-        public static void RunExperiments(List<Experiment> experiments)
+        public static void RunExperiments(List<Experiment> experiments, Action<Experiment>? experimentComplete = null)
         {
             RandomSource.Init();
             for (int i = 0; i < experiments.Count; i++)
@@ -12,6 +12,7 @@ namespace ServerlessPoolOptimizer
                 var exp = experiments[i];
                 exp.Id = i;
                 RunOneExperiment(exp);
+                experimentComplete?.Invoke(exp);
             }
         }
 
@@ -83,25 +84,43 @@ namespace ServerlessPoolOptimizer
             // create the smoothed trace
             AnalysisHelper.CreateSmoothedTraces(exp, exp.PredictionWindowSize);
 
-            // perform pod demand analysis
-            if (exp.StaticPoolSizesMap == null)
+            var hostRoleDemandCountDist = new DistributionEmpiricalFrequencyArray();
+            var hostRoleDemandCountDistDict = new Dictionary<double, IDistribution>
             {
-                AnalysisHelper.PodDemandAnalysis(exp, exp.PoolDemandAnalysisSamplesCount);
-            }
+                { 1.0, hostRoleDemandCountDist }
+            };
 
-            if (exp.OptimizerAggressivePodCreation)
+            if (exp.DemandAnalysisCacheDirectory != null)
             {
-                AnalysisHelper.HostRoleAnalysisPerPool(exp, exp.Trace,
-                                                        exp.HostRoleInitializationDemandDistribution,
-                                                        1);
+                // pod and core demand analysis, loaded from the cache or run on their own random sequence
+                DemandAnalysisCache.LoadOrRunDemandAnalysis(exp, hostRoleDemandCountDist, () =>
+                {
+                    if (exp.OptimizerAggressivePodCreation)
+                    {
+                        AnalysisHelper.HostRoleAnalysisPerPool(exp, exp.Trace,
+                                                                exp.HostRoleInitializationDemandDistribution,
+                                                                1);
+                    }
+                });
             }
-
-            var hostRoleDemandCountDistDict = new Dictionary<double, IDistribution>
+            else
             {
-                { 1.0, new DistributionEmpiricalFrequencyArray() }
-            };
+                // perform pod demand analysis
+                if (exp.StaticPoolSizesMap == null)
+                {
+                    AnalysisHelper.PodDemandAnalysis(exp, exp.PoolDemandAnalysisSamplesCount);
+                }
 
-            AnalysisHelper.CoreDemandAnalysis(exp, hostRoleDemandCountDistDict, exp.HostRoleDemandAnalysisSamplesCount);
+                if (exp.OptimizerAggressivePodCreation)
+                {
+                    AnalysisHelper.HostRoleAnalysisPerPool(exp, exp.Trace,
+                                                            exp.HostRoleInitializationDemandDistribution,
+                                                            1);
+                }
+
+                AnalysisHelper.CoreDemandAnalysis(exp, hostRoleDemandCountDistDict, exp.HostRoleDemandAnalysisSamplesCount);
+                hostRoleDemandCountDist.Freeze();
+            }
 
             var successRateMap = new Dictionary<int, double>();
             AnalysisHelper.GenerateSuccessRateMap(hostRoleDemandCountDistDict[1.0], successRateMap);
@@ -154,6 +173,8 @@ namespace ServerlessPoolOptimizer
 
             var simTime = new SimulationTime();
             var simulator = new Simulator(simTime);
+            simulator.ReuseEvents = exp.ReclaimTerminalObjects;
+            Validation.Level = exp.ValidationLevel ?? Validation.DefaultLevel;
             var openLoopLoader = new OpenLoopLoad(simulator, null, null, exp, exp.TestTrace, simTime);
             var serverlessService = new ServerlessService(simTime, simulator, exp, targetPercentile, hostRolesCount,
                                                             exp.HostRoleInitializationDemandDistribution,
@@ -260,11 +281,7 @@ namespace ServerlessPoolOptimizer
 
             var dstTracePoolGroupParameters = testPoolGroupParameters;
 
-            var adjustedPercentile = targetPercentile;
-            if (adjustedPercentile != 1.0)
-            {
-                adjustedPercentile = 1 - 0.5959 * (1 - adjustedPercentile);
-            }
+            var adjustedPercentile = AnalysisHelper.AdjustPoolTargetPercentile(targetPercentile);
 
             foreach (var (allocationLabel, poolsParameters) in poolGroupParameters.RuntimeToPoolParameters)
             {
@@ -0,0 +1,306 @@
+using System.Diagnostics;
+using System.Globalization;
+using System.Security.Cryptography;
+using System.Text;
+
+namespace ServerlessPoolOptimizer
+{
+    /*
+     *  On-disk cache of the pre-simulation demand analysis: the per-pool size distributions (PodDemandAnalysis) and
+     *  the host role demand count distribution (CoreDemandAnalysis). One binary file per set of analysis inputs
+     *  (trace files, sampling approach, samples counts, host role parameters, seed), the success rate maps are
+     *  regenerated from the loaded distributions. The analyses run on their own generator seeded with AnalysisSeed,
+     *  so the global random source is left in the same state whether the cache is hit or not. Files loaded or saved
+     *  are also kept in memory, a long-running process (drops --serve) reads each of them once.
+     */
+    public static class DemandAnalysisCache
+    {
+        // bump when the file layout or the analysis itself changes, older files are then ignored
+        private const int FormatVersion = 2;
+        private const string FileMagic = "DROPS-DEMAND-ANALYSIS";
+        // cache file content by cache key
+        private static readonly Dictionary<string, byte[]> _residentFiles = new Dictionary<string, byte[]>();
+
+        // betweenAnalyses runs after the pod demand analysis and before the core demand analysis, on the random
+        // source of the caller, whether the analyses are loaded or run
+        public static void LoadOrRunDemandAnalysis(Experiment exp, DistributionEmpiricalFrequencyArray hostRoleDemandCountDist,
+                                                    Action betweenAnalyses)
+        {
+            var key = GetCacheKey(exp);
+            var cacheFilePath = Path.Combine(exp.DemandAnalysisCacheDirectory, GetCacheFileName(key));
+            if (TryLoad(exp, key, cacheFilePath, hostRoleDemandCountDist))
+            {
+                Console.WriteLine("Loaded the demand analysis from {0}", cacheFilePath);
+                betweenAnalyses();
+                return;
+            }
+
+            var hostRoleDemandCountDistDict = new Dictionary<double, IDistribution>
+            {
+                { 1.0, hostRoleDemandCountDist }
+            };
+            var analysisRandom = new Random(exp.AnalysisSeed);
+            var previousRandom = RandomSource.UseThread(analysisRandom);
+            try
+            {
+                if (exp.StaticPoolSizesMap == null)
+                {
+                    AnalysisHelper.PodDemandAnalysis(exp, exp.PoolDemandAnalysisSamplesCount);
+                }
+                RandomSource.ResetThread(previousRandom);
+                betweenAnalyses();
+                RandomSource.UseThread(analysisRandom);
+                AnalysisHelper.CoreDemandAnalysis(exp, hostRoleDemandCountDistDict, exp.HostRoleDemandAnalysisSamplesCount);
+            }
+            finally
+            {
+                RandomSource.ResetThread(previousRandom);
+            }
+            hostRoleDemandCountDist.Freeze();
+
+            Save(exp, key, cacheFilePath, hostRoleDemandCountDist);
+        }
+
+        private static string GetCacheKey(Experiment exp)
+        {
+            var key = new StringBuilder();
+            key.AppendFormat(CultureInfo.InvariantCulture, "version={0}\n", FormatVersion);
+            AppendFileKey(key, "trainingTrace", exp.AllocationTracePath);
+            // the pools missing from the testing trace or the static pool sizes are removed from the training trace
+            AppendFileKey(key, "testingTrace", exp.TestAllocationTracePath);
+            AppendFileKey(key, "lifeCycleTrace", exp.PodLifeCycleTracePath);
+            key.AppendFormat(CultureInfo.InvariantCulture, "poolOptimization={0}\n", exp.PoolOptimizationMethod);
+            key.AppendFormat(CultureInfo.InvariantCulture, "hostRoleOptimization={0}\n", exp.HostRoleOptimizationMethod);
+            key.AppendFormat(CultureInfo.InvariantCulture, "podDemandAnalysis={0}\n", exp.StaticPoolSizesMap == null);
+            if (exp.StaticPoolSizesMap != null)
+            {
+                key.AppendFormat(CultureInfo.InvariantCulture, "staticPoolSizes={0}\n",
+                                    String.Join(",", exp.StaticPoolSizesMap.Select(pair => String.Format(CultureInfo.InvariantCulture, "{0}={1}", pair.Key, pair.Value))
+                                                                            .Order(StringComparer.Ordinal)));
+            }
+            key.AppendFormat(CultureInfo.InvariantCulture, "samplingApproach={0},{1}\n",
+                                exp.SamplingApproach, exp.RecyclingTraceSamplingApproach);
+            key.AppendFormat(CultureInfo.InvariantCulture, "samples={0},{1}\n",
+                                exp.PoolDemandAnalysisSamplesCount, exp.HostRoleDemandAnalysisSamplesCount);
+            key.AppendFormat(CultureInfo.InvariantCulture, "seed={0},{1}\n", exp.AnalysisSeed, exp.AnalysisParallelism > 1);
+            key.AppendFormat(CultureInfo.InvariantCulture, "percentiles={0}\n", String.Join(",", exp.TargetPercentiles.Select(p => p.ToString("R", CultureInfo.InvariantCulture))));
+            key.AppendFormat(CultureInfo.InvariantCulture, "pools={0},{1}\n", exp.UseCombinedPool, exp.IgnorePodTransitionsExceptCreation);
+            key.AppendFormat(CultureInfo.InvariantCulture, "lifeCycle={0},{1}\n", exp.PodLifeCycleJoinWindow, exp.LifeCycleDistributionType);
+            key.AppendFormat(CultureInfo.InvariantCulture, "hostRole={0},{1},{2}\n",
+                                exp.HostRoleCores, exp.HostRoleReservedCores, exp.MaxPodsPerHostRole);
+            var creationDistribution = exp.HostRoleInitializationDemandDistribution;
+            key.AppendFormat(CultureInfo.InvariantCulture, "hostRoleCreation={0},{1},{2}\n",
+                                creationDistribution.GetType().Name, creationDistribution.Count(), creationDistribution.GetMean());
+            return key.ToString();
+        }
+
+        // a trace is identified by its path, size and modification time
+        private static void AppendFileKey(StringBuilder key, string name, string filePath)
+        {
+            if (filePath == null)
+            {
+                key.AppendFormat(CultureInfo.InvariantCulture, "{0}=\n", name);
+                return;
+            }
+            var fileInfo = new FileInfo(filePath);
+            key.AppendFormat(CultureInfo.InvariantCulture, "{0}={1},{2},{3}\n", name, fileInfo.FullName,
+                                fileInfo.Exists ? fileInfo.Length : -1,
+                                fileInfo.Exists ? fileInfo.LastWriteTimeUtc.Ticks : -1);
+        }
+
+        private static string GetCacheFileName(string key)
+        {
+            var hash = SHA256.HashData(Encoding.UTF8.GetBytes(key));
+            return String.Format("demand-analysis-{0}.bin", Convert.ToHexString(hash, 0, 16).ToLowerInvariant());
+        }
+
+        private static bool TryLoad(Experiment exp, string key, string cacheFilePath,
+                                    DistributionEmpiricalFrequencyArray hostRoleDemandCountDist)
+        {
+            try
+            {
+                byte[]? content;
+                lock (_residentFiles)
+                {
+                    _residentFiles.TryGetValue(key, out content);
+                }
+                if (content == null)
+                {
+                    if (!File.Exists(cacheFilePath))
+                    {
+                        return false;
+                    }
+                    content = File.ReadAllBytes(cacheFilePath);
+                }
+                using var reader = new BinaryReader(new MemoryStream(content), Encoding.UTF8);
+                if (reader.ReadString() != FileMagic || reader.ReadString() != key)
+                {
+                    Console.WriteLine("Ignoring the demand analysis cache {0}: inputs do not match", cacheFilePath);
+                    return false;
+                }
+
+                // the pools of the file are the pools of the trace, also when there is no pod demand analysis
+                var poolLabelToDistributions = exp.Trace.PoolLabelToDistributions;
+                int poolsCount = reader.ReadInt32();
+                if (poolsCount != poolLabelToDistributions.Count)
+                {
+                    Console.WriteLine("Ignoring the demand analysis cache {0}: pools do not match", cacheFilePath);
+                    return false;
+                }
+                // read everything before touching the trace distributions, a truncated file leaves them empty
+                var poolsPairs = new List<(PoolLabel, List<(double, (double, double, double, double, double), double[], double[])>)>();
+                foreach (var (poolLabel, poolDistributions) in poolLabelToDistributions)
+                {
+                    if (reader.ReadString() != poolLabel.ToString())
+                    {
+                        Console.WriteLine("Ignoring the demand analysis cache {0}: pools do not match", cacheFilePath);
+                        return false;
+                    }
+                    var percentilesPairs = new List<(double, (double, double, double, double, double), double[], double[])>();
+                    int percentilesCount = reader.ReadInt32();
+                    if ((percentilesCount > 0) != (exp.StaticPoolSizesMap == null))
+                    {
+                        return false;
+                    }
+                    for (int i = 0; i < percentilesCount; i++)
+                    {
+                        var percentile = reader.ReadDouble();
+                        var (moments, values, frequencies) = ReadDistribution(reader);
+                        if (!poolDistributions.PercentileToPoolSizeDistributionMap.ContainsKey(percentile))
+                        {
+                            return false;
+                        }
+                        percentilesPairs.Add((percentile, moments, values, frequencies));
+                    }
+                    poolsPairs.Add((poolLabel, percentilesPairs));
+                }
+                var (hostRoleMoments, hostRoleValues, hostRoleFrequencies) = ReadDistribution(reader);
+
+                foreach (var (poolLabel, percentilesPairs) in poolsPairs)
+                {
+                    var poolDistributions = poolLabelToDistributions[poolLabel];
+                    foreach (var (percentile, moments, values, frequencies) in percentilesPairs)
+                    {
+                        var distribution = poolDistributions.PercentileToPoolSizeDistributionMap[percentile];
+                        RestoreDistribution(distribution, moments, values, frequencies);
+                        (distribution as DistributionEmpiricalDoubleFrequencyArray)?.Freeze();
+                    }
+                    if (exp.StaticPoolSizesMap == null)
+                    {
+                        AnalysisHelper.GenerateSuccessRateMap(poolDistributions.PercentileToPoolSizeDistributionMap[1.0],
+                                                                poolDistributions.PoolSizeToSuccessRateMap);
+                    }
+                }
+                RestoreDistribution(hostRoleDemandCountDist, hostRoleMoments, hostRoleValues, hostRoleFrequencies);
+                hostRoleDemandCountDist.Freeze();
+                lock (_residentFiles)
+                {
+                    _residentFiles[key] = content;
+                }
+                return true;
+            }
+            catch (Exception e) when (e is IOException || e is EndOfStreamException || e is UnauthorizedAccessException)
+            {
+                Console.WriteLine("Ignoring the demand analysis cache {0}: {1}", cacheFilePath, e.Message);
+                return false;
+            }
+        }
+
+        private static void Save(Experiment exp, string key, string cacheFilePath,
+                                DistributionEmpiricalFrequencyArray hostRoleDemandCountDist)
+        {
+            var content = new MemoryStream();
+            using (var writer = new BinaryWriter(content, Encoding.UTF8, true))
+            {
+                writer.Write(FileMagic);
+                writer.Write(key);
+                var poolLabelToDistributions = exp.Trace.PoolLabelToDistributions;
+                writer.Write(poolLabelToDistributions.Count);
+                foreach (var (poolLabel, poolDistributions) in poolLabelToDistributions)
+                {
+                    writer.Write(poolLabel.ToString());
+                    if (exp.StaticPoolSizesMap != null)
+                    {
+                        // the static pool sizes replace the pod demand analysis
+                        writer.Write(0);
+                        continue;
+                    }
+                    writer.Write(poolDistributions.PercentileToPoolSizeDistributionMap.Count);
+                    foreach (var (percentile, distribution) in poolDistributions.PercentileToPoolSizeDistributionMap)
+                    {
+                        writer.Write(percentile);
+                        WriteDistribution(writer, distribution);
+                    }
+                }
+                WriteDistribution(writer, hostRoleDemandCountDist);
+            }
+            var fileContent = content.ToArray();
+            lock (_residentFiles)
+            {
+                _residentFiles[key] = fileContent;
+            }
+
+            // written next to the final file and renamed, concurrent runs and replications never read a partial cache
+            var tmpFilePath = String.Format("{0}.{1}-{2}.tmp", cacheFilePath, Environment.ProcessId, Environment.CurrentManagedThreadId);
+            try
+            {
+                Directory.CreateDirectory(exp.DemandAnalysisCacheDirectory);
+                File.WriteAllBytes(tmpFilePath, fileContent);
+                File.Move(tmpFilePath, cacheFilePath, true);
+                Console.WriteLine("Saved the demand analysis to {0}", cacheFilePath);
+            }
+            catch (Exception e) when (e is IOException || e is UnauthorizedAccessException)
+            {
+                Console.WriteLine("Could not save the demand analysis cache {0}: {1}", cacheFilePath, e.Message);
+                File.Delete(tmpFilePath);
+            }
+        }
+
+        internal static void WriteDistribution(BinaryWriter writer, IDistribution distribution)
+        {
+            var (sumX, sumXX, count, min, max) = ((DistributionEmpirical)distribution).GetMoments();
+            writer.Write(sumX);
+            writer.Write(sumXX);
+            writer.Write(count);
+            writer.Write(min);
+            writer.Write(max);
+            int pairsCount = distribution.Count() > 0 ? ((IDistributionEmpirical)distribution).PairsCount() : 0;
+            writer.Write(pairsCount);
+            for (int i = 0; i < pairsCount; i++)
+            {
+                var valueFreqPair = ((IDistributionEmpirical)distribution).GetValueFreqPairByIndex(i);
+                writer.Write(valueFreqPair.Key);
+                writer.Write(valueFreqPair.Value.Item1);
+            }
+        }
+
+        internal static ((double, double, double, double, double), double[], double[]) ReadDistribution(BinaryReader reader)
+        {
+            var moments = (reader.ReadDouble(), reader.ReadDouble(), reader.ReadDouble(), reader.ReadDouble(), reader.ReadDouble());
+            int pairsCount = reader.ReadInt32();
+            var values = new double[pairsCount];
+            var frequencies = new double[pairsCount];
+            for (int i = 0; i < pairsCount; i++)
+            {
+                values[i] = reader.ReadDouble();
+                frequencies[i] = reader.ReadDouble();
+            }
+            return (moments, values, frequencies);
+        }
+
+        // the pairs go through the interface, the empirical distributions hide the base AddValueFrequency
+        internal static void RestoreDistribution(IDistribution distribution,
+                                                (double, double, double, double, double) moments,
+                                                double[] values,
+                                                double[] frequencies)
+        {
+            Debug.Assert(distribution.Count() == 0);
+            for (int i = 0; i < values.Length; i++)
+            {
+                distribution.AddValueFrequency(values[i], frequencies[i]);
+            }
+            // the pairs re-accumulate the sums in another order, keep the analysis values bit for bit
+            ((DistributionEmpirical)distribution).SetMoments(moments);
+        }
+    }
+}
@@ -0,0 +1,95 @@
+using System.Diagnostics;
+
+namespace ServerlessPoolOptimizer
+{
+    /*
+     *  Merged allocation/recycling timeline used by the core demand analysis. The events are stored as parallel
+     *  arrays (time point, allocation flag, core class) so a sample is a scan over plain arrays, and the arrays are
+     *  reused when the timeline is rebuilt for the next sample. Pod sizes are mapped to dense core classes in the
+     *  order they first appear, which is the insertion order of the pods count map used before.
+     */
+    public class DemandEventTimeline
+    {
+        public double[] TimePoints;
+        public bool[] IsAllocation;
+        public int[] CoreClasses;
+        public int Count;
+        public readonly List<double> CoreClassSizes;
+        private readonly Dictionary<double, int> _coreSizeToClass;
+
+        public DemandEventTimeline()
+        {
+            TimePoints = Array.Empty<double>();
+            IsAllocation = Array.Empty<bool>();
+            CoreClasses = Array.Empty<int>();
+            Count = 0;
+            CoreClassSizes = new List<double>();
+            _coreSizeToClass = new Dictionary<double, int>();
+        }
+
+        public void Build(List<(PoolLabel, double)> requestsArrivalTime, List<(PoolLabel, double)> coreRecyclingArrivalTime)
+        {
+            EnsureCapacity(requestsArrivalTime.Count + coreRecyclingArrivalTime.Count);
+            CoreClassSizes.Clear();
+            _coreSizeToClass.Clear();
+            Count = 0;
+
+            int allocationIdx = 0;
+            int recyclingIdx = 0;
+            while (allocationIdx < requestsArrivalTime.Count || recyclingIdx < coreRecyclingArrivalTime.Count)
+            {
+                if (recyclingIdx >= coreRecyclingArrivalTime.Count
+                    || (allocationIdx < requestsArrivalTime.Count
+                        && requestsArrivalTime[allocationIdx].Item2 <= coreRecyclingArrivalTime[recyclingIdx].Item2))
+                {
+                    Add(true, requestsArrivalTime[allocationIdx]);
+                    allocationIdx++;
+                }
+                else
+                {
+                    Add(false, coreRecyclingArrivalTime[recyclingIdx]);
+                    recyclingIdx++;
+                }
+            }
+        }
+
+        private void Add(bool isAllocation, (PoolLabel, double) request)
+        {
+            double cores = request.Item1.Cores;
+            if (!_coreSizeToClass.TryGetValue(cores, out int coreClass))
+            {
+                coreClass = CoreClassSizes.Count;
+                _coreSizeToClass.Add(cores, coreClass);
+                CoreClassSizes.Add(cores);
+            }
+            TimePoints[Count] = request.Item2;
+            IsAllocation[Count] = isAllocation;
+            CoreClasses[Count] = coreClass;
+            Count++;
+        }
+
+        private void EnsureCapacity(int size)
+        {
+            if (TimePoints.Length >= size)
+            {
+                return;
+            }
+            TimePoints = new double[size];
+            IsAllocation = new bool[size];
+            CoreClasses = new int[size];
+        }
+
+        // same result (and summation order) as Utilities.ComputeNeededHostRoles over the pods count map
+        public double ComputeNeededHostRoles(int[] podsCountPerClass, double hostRoleCores, int hostRoleMaxPods)
+        {
+            Debug.Assert(podsCountPerClass.Length >= CoreClassSizes.Count);
+            double hostRoles = 0;
+            for (int coreClass = 0; coreClass < CoreClassSizes.Count; coreClass++)
+            {
+                hostRoles += Utilities.ComputeNeededHostRoles(podsCountPerClass[coreClass], CoreClassSizes[coreClass],
+                                                                hostRoleCores, hostRoleMaxPods);
+            }
+            return hostRoles;
+        }
+    }
+}
@@ -180,6 +180,17 @@ namespace ServerlessPoolOptimizer
             return count;
         }
 
+        // (sum, sum of squares, count, min, max), persisted with the value/frequency pairs by the demand analysis cache
+        public (double, double, double, double, double) GetMoments()
+        {
+            return (_sumX, _sumXX, count, _min, _max);
+        }
+
+        public void SetMoments((double, double, double, double, double) moments)
+        {
+            (_sumX, _sumXX, count, _min, _max) = moments;
+        }
+
         public int PairsCount()
         {
             throw new NotImplementedException();
@@ -189,6 +200,10 @@ namespace ServerlessPoolOptimizer
         {
             throw new NotImplementedException();
         }
+
+        public void Prepare()
+        {
+        }
     }
 
     public class DistributionEmpiricalPractical : DistributionEmpirical, IDistributionEmpirical
@@ -258,6 +273,12 @@ namespace ServerlessPoolOptimizer
             return _arrayDistribution.GetTail(pPercentile);
         }
 
+        public new void Prepare()
+        {
+            _frequencyDistribution.Prepare();
+            _arrayDistribution.Prepare();
+        }
+
         public new string ToString()
         {
             return _arrayDistribution.ToString();
@@ -278,11 +299,38 @@ namespace ServerlessPoolOptimizer
     {
         private readonly SortedDictionary<RoundedDouble, (double, double)> _vals;
         private bool _isCumulativeFreqValid;
+        // compacted copy of _vals (sorted values, frequencies and prefix sums), rebuilt when values are added
+        private double[] _compactValues;
+        private double[] _compactFrequencies;
+        private double[] _compactCumulativeFrequencies;
+        private bool _isFrozen;
         public DistributionEmpiricalFrequencyArray()
             : base()
         {
             _vals = new SortedDictionary<RoundedDouble, (double, double)>();
             _isCumulativeFreqValid = false;
+            _compactValues = Array.Empty<double>();
+            _compactFrequencies = Array.Empty<double>();
+            _compactCumulativeFrequencies = Array.Empty<double>();
+            _isFrozen = false;
+        }
+
+        // builds the compacted arrays and marks the distribution as read-only, tail and sample lookups are then
+        // binary searches over the prefix sums without touching the sorted dictionary
+        public void Freeze()
+        {
+            UpdateCumulativeFrequency();
+            _isFrozen = true;
+        }
+
+        public new void Prepare()
+        {
+            UpdateCumulativeFrequency();
+        }
+
+        public bool IsFrozen()
+        {
+            return _isFrozen;
         }
 
         public double Count()
@@ -300,20 +348,20 @@ namespace ServerlessPoolOptimizer
             base.Clear();
             _vals.Clear();
             _isCumulativeFreqValid = false;
+            _isFrozen = false;
         }
 
         public int FindIndexBinarySearch(ulong index)
         {
             Debug.Assert(_isCumulativeFreqValid);
             int left = 0;
-            int right = _vals.Count() - 1;
+            int right = _vals.Count - 1;
             int result = -1;
 
             while (left <= right)
             {
                 int mid = left + (right - left) / 2;
-                var valueFreqPair = GetValueFreqPairByIndex(mid);
-                if (valueFreqPair.Value.Item2 > index)
+                if (_compactCumulativeFrequencies[mid] > index)
                 {
                     result = mid;
                     right = mid - 1;
@@ -333,12 +381,23 @@ namespace ServerlessPoolOptimizer
             {
                 return;
             }
+            int pairsCount = _vals.Count;
+            if (_compactValues.Length < pairsCount)
+            {
+                int capacity = Math.Max(pairsCount, 2 * _compactValues.Length);
+                _compactValues = new double[capacity];
+                _compactFrequencies = new double[capacity];
+                _compactCumulativeFrequencies = new double[capacity];
+            }
             double cumulativeFrequency = 0;
-            foreach (var key in _vals.Keys.ToList())
+            int index = 0;
+            foreach (var (key, (freq, _)) in _vals)
             {
-                var (freq, cumFreq) = _vals[key];
                 cumulativeFrequency += freq;
-                _vals[key] = (freq, cumulativeFrequency);
+                _compactValues[index] = key.Value;
+                _compactFrequencies[index] = freq;
+                _compactCumulativeFrequencies[index] = cumulativeFrequency;
+                index++;
             }
             _isCumulativeFreqValid = true;
             Debug.Assert((ulong)cumulativeFrequency == (ulong)Count());
@@ -348,7 +407,8 @@ namespace ServerlessPoolOptimizer
         {
             Debug.Assert(index < PairsCount());
             UpdateCumulativeFrequency();
-            KeyValuePair<double, (double, double)> keyValuePair = new(_vals.ElementAt(index).Key.Value, _vals.ElementAt(index).Value);
+            KeyValuePair<double, (double, double)> keyValuePair = new(_compactValues[index],
+                                                                        (_compactFrequencies[index], _compactCumulativeFrequencies[index]));
             return keyValuePair;
         }
 
@@ -384,6 +444,7 @@ namespace ServerlessPoolOptimizer
         public override void AddValue(double val)
         {
             var roundedDouble = new RoundedDouble(val, 1);
+            Debug.Assert(!_isFrozen);
             base.AddValue(roundedDouble.Value);
             _isCumulativeFreqValid = false;
             if (!_vals.TryGetValue(roundedDouble, out (double, double) freqCumFreqPair))
@@ -396,6 +457,7 @@ namespace ServerlessPoolOptimizer
 
         new public void AddValueFrequency(double val, double freq)
         {
+            Debug.Assert(!_isFrozen);
             base.AddValueFrequency(val, freq);
             _isCumulativeFreqValid = false;
             var roundedDouble = new RoundedDouble(val, 1);
@@ -476,11 +538,38 @@ namespace ServerlessPoolOptimizer
     {
         private readonly SortedDictionary<RoundedDouble, (double, double)> _vals;
         private bool _isCumulativeFreqValid;
+        // compacted copy of _vals (sorted values, frequencies and prefix sums), rebuilt when values are added
+        private double[] _compactValues;
+        private double[] _compactFrequencies;
+        private double[] _compactCumulativeFrequencies;
+        private bool _isFrozen;
         public DistributionEmpiricalDoubleFrequencyArray()
             : base()
         {
             _vals = new SortedDictionary<RoundedDouble, (double, double)>();
             _isCumulativeFreqValid = false;
+            _compactValues = Array.Empty<double>();
+            _compactFrequencies = Array.Empty<double>();
+            _compactCumulativeFrequencies = Array.Empty<double>();
+            _isFrozen = false;
+        }
+
+        // builds the compacted arrays and marks the distribution as read-only, tail and sample lookups are then
+        // binary searches over the prefix sums without touching the sorted dictionary
+        public void Freeze()
+        {
+            UpdateCumulativeFrequency();
+            _isFrozen = true;
+        }
+
+        public new void Prepare()
+        {
+            UpdateCumulativeFrequency();
+        }
+
+        public bool IsFrozen()
+        {
+            return _isFrozen;
         }
 
         new public double Count()
@@ -498,6 +587,7 @@ namespace ServerlessPoolOptimizer
             _vals.Clear();
             base.Clear();
             _isCumulativeFreqValid = false;
+            _isFrozen = false;
         }
 
          new public double GetValueByIndex(ulong index)
@@ -515,14 +605,13 @@ namespace ServerlessPoolOptimizer
         {
             Debug.Assert(_isCumulativeFreqValid);
             int left = 0;
-            int right = _vals.Count() - 1;
+            int right = _vals.Count - 1;
             int result = -1;
 
             while (left <= right)
             {
                 int mid = left + (right - left) / 2;
-                var valueFreqPair = GetValueFreqPairByIndex(mid);
-                if (valueFreqPair.Value.Item2 > index)
+                if (_compactCumulativeFrequencies[mid] > index)
                 {
                     result = mid;
                     right = mid - 1;
@@ -541,12 +630,23 @@ namespace ServerlessPoolOptimizer
             {
                 return;
             }
+            int pairsCount = _vals.Count;
+            if (_compactValues.Length < pairsCount)
+            {
+                int capacity = Math.Max(pairsCount, 2 * _compactValues.Length);
+                _compactValues = new double[capacity];
+                _compactFrequencies = new double[capacity];
+                _compactCumulativeFrequencies = new double[capacity];
+            }
             double cumulativeFrequency = 0;
-            foreach (var key in _vals.Keys.ToList())
+            int index = 0;
+            foreach (var (key, (freq, _)) in _vals)
             {
-                var (freq, cumFreq) = _vals[key];
                 cumulativeFrequency += freq;
-                _vals[key] = (freq, cumulativeFrequency);
+                _compactValues[index] = key.Value;
+                _compactFrequencies[index] = freq;
+                _compactCumulativeFrequencies[index] = cumulativeFrequency;
+                index++;
             }
             _isCumulativeFreqValid = true;
             Debug.Assert((ulong)cumulativeFrequency == (ulong)Count());
@@ -556,7 +656,8 @@ namespace ServerlessPoolOptimizer
         {
             Debug.Assert(index < PairsCount());
             UpdateCumulativeFrequency();
-            KeyValuePair<double, (double, double)> keyValuePair = new(_vals.ElementAt(index).Key.Value, _vals.ElementAt(index).Value);
+            KeyValuePair<double, (double, double)> keyValuePair = new(_compactValues[index],
+                                                                        (_compactFrequencies[index], _compactCumulativeFrequencies[index]));
             return keyValuePair;
         }
 
@@ -573,6 +674,7 @@ namespace ServerlessPoolOptimizer
 
         public void AddValueFrequency(double val, double freq)
         {
+            Debug.Assert(!_isFrozen);
             base.AddValueFrequency(val, freq);
             _isCumulativeFreqValid = false;
             var roundedDouble = new RoundedDouble(val, 2);
@@ -587,6 +689,7 @@ namespace ServerlessPoolOptimizer
         public override void AddValue(double val)
         {
             var roundedDouble = new RoundedDouble(val, 2);
+            Debug.Assert(!_isFrozen);
             base.AddValue(roundedDouble.Value);
             _isCumulativeFreqValid = false;
             if (!_vals.TryGetValue(roundedDouble, out (double, double) freqCumFreqPair))
@@ -670,6 +773,15 @@ namespace ServerlessPoolOptimizer
             return _vals[index];
         }
 
+        public new void Prepare()
+        {
+            if (!_sorted)
+            {
+                _vals.Sort();
+                _sorted = true;
+            }
+        }
+
         public new double GetSample()
         {
             if (!_sorted)
@@ -759,6 +871,344 @@ namespace ServerlessPoolOptimizer
             return s;
         }
 
+        public override string GetSignature(double pLoad, double pUtilization, bool pOutputFlag)
+        {
+            return ToString() + "\n" + GetMeasurement(pLoad, pUtilization, pOutputFlag);
+        }
+    }
+    /*
+     *  Log-bucketed quantile sketch (DDSketch style). A value x > 0 is counted in bucket ceil(log_gamma(x)),
+     *  where gamma = (1 + a) / (1 - a), so every reported quantile is within a relative error a of the exact one.
+     *  Memory depends on the range of the values instead of their count, adding a value is O(1) and
+     *  tails/samples are binary searches over the non-empty buckets. Two sketches with the same accuracy can be merged.
+     */
+    public class DistributionEmpiricalSketch : DistributionEmpirical, IDistributionEmpirical
+    {
+        private readonly double _relativeAccuracy;
+        private readonly double _gamma;
+        private readonly double _logGamma;
+        // dense bucket counts, _counts[i] holds bucket _minBucketIndex + i
+        private double[] _counts;
+        private int _minBucketIndex;
+        private int _usedBuckets;
+        // counts for values <= 0 (e.g., zero specialization durations)
+        private double _zeroCount;
+        // compacted non-empty buckets, rebuilt lazily after values are added
+        private double[] _pairValues;
+        private double[] _pairFrequencies;
+        private double[] _pairCumulativeFrequencies;
+        private int _pairsCount;
+        // set once the compacted arrays are filled, readers that see it set skip the lock
+        private volatile bool _isCompacted;
+        private readonly object _compactLock = new object();
+
+        public DistributionEmpiricalSketch(double pRelativeAccuracy = 0.01)
+            : base()
+        {
+            Debug.Assert(pRelativeAccuracy > 0 && pRelativeAccuracy < 1);
+            _relativeAccuracy = pRelativeAccuracy;
+            _gamma = (1 + pRelativeAccuracy) / (1 - pRelativeAccuracy);
+            _logGamma = Math.Log(_gamma);
+            _counts = new double[64];
+            _minBucketIndex = 0;
+            _usedBuckets = 0;
+            _zeroCount = 0;
+            _pairValues = Array.Empty<double>();
+            _pairFrequencies = Array.Empty<double>();
+            _pairCumulativeFrequencies = Array.Empty<double>();
+            _pairsCount = 0;
+            _isCompacted = false;
+        }
+
+        public double RelativeAccuracy()
+        {
+            return _relativeAccuracy;
+        }
+
+        public new double Count()
+        {
+            return base.count;
+        }
+
+        public new int PairsCount()
+        {
+            Compact();
+            return _pairsCount;
+        }
+
+        public new void Clear()
+        {
+            base.Clear();
+            Array.Clear(_counts);
+            _minBucketIndex = 0;
+            _usedBuckets = 0;
+            _zeroCount = 0;
+            _pairsCount = 0;
+            _isCompacted = false;
+        }
+
+        private int GetBucketIndex(double val)
+        {
+            return (int)Math.Ceiling(Math.Log(val) / _logGamma);
+        }
+
+        private double GetBucketValue(int bucketIndex)
+        {
+            // the value with the smallest relative error to both ends of the bucket
+            return 2.0 * Math.Pow(_gamma, bucketIndex) / (_gamma + 1.0);
+        }
+
+        private void AddToBucket(double val, double freq)
+        {
+            _isCompacted = false;
+            if (val <= 0)
+            {
+                _zeroCount += freq;
+                return;
+            }
+            int bucketIndex = GetBucketIndex(val);
+            if (_usedBuckets == 0)
+            {
+                _minBucketIndex = bucketIndex;
+                _usedBuckets = 1;
+            }
+            else if (bucketIndex < _minBucketIndex)
+            {
+                int shift = _minBucketIndex - bucketIndex;
+                EnsureCapacity(_usedBuckets + shift);
+                Array.Copy(_counts, 0, _counts, shift, _usedBuckets);
+                Array.Clear(_counts, 0, shift);
+                _minBucketIndex = bucketIndex;
+                _usedBuckets += shift;
+            }
+            else if (bucketIndex - _minBucketIndex >= _usedBuckets)
+            {
+                _usedBuckets = bucketIndex - _minBucketIndex + 1;
+                EnsureCapacity(_usedBuckets);
+            }
+            _counts[bucketIndex - _minBucketIndex] += freq;
+        }
+
+        private void EnsureCapacity(int size)
+        {
+            if (size <= _counts.Length)
+            {
+                return;
+            }
+            var newCounts = new double[Math.Max(size, 2 * _counts.Length)];
+            Array.Copy(_counts, newCounts, _counts.Length);
+            _counts = newCounts;
+        }
+
+        public override void AddValue(double val)
+        {
+            base.AddValue(val);
+            AddToBucket(val, 1);
+        }
+
+        public new void AddValueFrequency(double val, double freq)
+        {
+            base.AddValueFrequency(val, freq);
+            AddToBucket(val, freq);
+        }
+
+        public void Merge(DistributionEmpiricalSketch other)
+        {
+            Debug.Assert(_relativeAccuracy == other._relativeAccuracy);
+            if (other.count == 0)
+            {
+                return;
+            }
+            if (count == 0)
+            {
+                _min = other._min;
+                _max = other._max;
+            }
+            else
+            {
+                _min = Math.Min(_min, other._min);
+                _max = Math.Max(_max, other._max);
+            }
+            _sumX += other._sumX;
+            _sumXX += other._sumXX;
+            count += other.count;
+            _isCompacted = false;
+            _zeroCount += other._zeroCount;
+            for (int i = 0; i < other._usedBuckets; i++)
+            {
+                if (other._counts[i] > 0)
+                {
+                    AddToBucket(other.GetBucketValue(other._minBucketIndex + i), other._counts[i]);
+                }
+            }
+        }
+
+        public new void Prepare()
+        {
+            Compact();
+        }
+
+        private void Compact()
+        {
+            if (_isCompacted)
+            {
+                return;
+            }
+            lock (_compactLock)
+            {
+                if (_isCompacted)
+                {
+                    return;
+                }
+                CompactBuckets();
+            }
+        }
+
+        private void CompactBuckets()
+        {
+            int pairs = _zeroCount > 0 ? 1 : 0;
+            for (int i = 0; i < _usedBuckets; i++)
+            {
+                if (_counts[i] > 0)
+                {
+                    pairs++;
+                }
+            }
+            if (_pairValues.Length < pairs)
+            {
+                _pairValues = new double[pairs];
+                _pairFrequencies = new double[pairs];
+                _pairCumulativeFrequencies = new double[pairs];
+            }
+            int pairIndex = 0;
+            double cumulativeFrequency = 0;
+            if (_zeroCount > 0)
+            {
+                cumulativeFrequency += _zeroCount;
+                _pairValues[pairIndex] = Math.Min(_min, 0);
+                _pairFrequencies[pairIndex] = _zeroCount;
+                _pairCumulativeFrequencies[pairIndex] = cumulativeFrequency;
+                pairIndex++;
+            }
+            for (int i = 0; i < _usedBuckets; i++)
+            {
+                if (_counts[i] <= 0)
+                {
+                    continue;
+                }
+                cumulativeFrequency += _counts[i];
+                // clamp to the observed range so the extreme buckets never report a value that was not seen
+                _pairValues[pairIndex] = Math.Clamp(GetBucketValue(_minBucketIndex + i), _min, _max);
+                _pairFrequencies[pairIndex] = _counts[i];
+                _pairCumulativeFrequencies[pairIndex] = cumulativeFrequency;
+                pairIndex++;
+            }
+            _pairsCount = pairs;
+            _isCompacted = true;
+        }
+
+        private int FindPairIndex(double rank)
+        {
+            // first pair whose cumulative frequency is greater than rank
+            int left = 0;
+            int right = _pairsCount - 1;
+            int result = _pairsCount - 1;
+            while (left <= right)
+            {
+                int mid = left + (right - left) / 2;
+                if (_pairCumulativeFrequencies[mid] > rank)
+                {
+                    result = mid;
+                    right = mid - 1;
+                }
+                else
+                {
+                    left = mid + 1;
+                }
+            }
+            return result;
+        }
+
+        public new double GetValueByIndex(ulong index)
+        {
+            Debug.Assert(index < (ulong)count);
+            Compact();
+            return _pairValues[FindPairIndex(index)];
+        }
+
+        public new KeyValuePair<double, (double, double)> GetValueFreqPairByIndex(int index)
+        {
+            Compact();
+            Debug.Assert(index < _pairsCount);
+            return new(_pairValues[index], (_pairFrequencies[index], _pairCumulativeFrequencies[index]));
+        }
+
+        public new double GetSample()
+        {
+            Debug.Assert(count > 0);
+            double probability = RandomSource.GetNext();
+            ulong index = (ulong)(probability * count);
+            return GetValueByIndex(index);
+        }
+
+        public override double GetVariance()
+        {
+            Debug.Assert(count > 0);
+            double mean = _sumX / count;
+            return Math.Max(0, _sumXX / count - mean * mean);
+        }
+
+        private static void CheckPercentile(double i)
+        {
+            Debug.Assert(0 <= i);
+            Debug.Assert(i <= 1);
+        }
+
+        public override double GetTail(double pPercentile)
+        {
+            Debug.Assert(count > 0);
+            CheckPercentile(pPercentile);
+            double val;
+            switch (pPercentile)
+            {
+                case 0.0:
+                    val = _min;
+                    break;
+                case 1.0:
+                    val = _max;
+                    break;
+                default:
+                    ulong index = (ulong)Math.Ceiling(pPercentile * (count - 1));
+                    val = GetValueByIndex(index);
+                    break;
+            }
+            return val;
+        }
+
+        public override string ToString()
+        {
+            var s = String.Format("XRES DistSketch signature " +
+                                     "count:{0}, min:{1:00.00}, median:{2:00.00}, average:{3:00.00}, " +
+                                     "p90:{4:00.00}, p95:{5:00.00}, p99:{6:00.00}, p999:{7:00.00}, " +
+                                     "max:{8:00.00}, rate:{9:00.00}",
+                count, GetTail(0), GetTail(0.5), GetMean(),
+                GetTail(0.9), GetTail(0.95), GetTail(0.99), GetTail(0.999),
+                GetTail(1), GetRate());
+            return s;
+        }
+
+        public new string GetMeasurement(double pLoad, double pUtilization, bool pOutputFlag)
+        {
+            var s = "";
+            if (pOutputFlag)
+            {
+                s += "#load\tutil\tmin\tmedian\taverage\tp90\tp95\tp99\tp999\tmax\trate\tcount\n";
+            }
+            s += String.Format("{0:00.00}\t{1:00.00}\t{2:00.00}\t{3:00.00}\t{4:00.00}\t{5:00.00}\t{6:00.00}\t{7:00.00}\t{8:00.00}\t{9:00.00}\t{10:00.00}\t{11}\n",
+                pLoad, pUtilization, GetTail(0), GetTail(0.5), GetMean(), GetTail(0.9), GetTail(0.95), GetTail(0.99), GetTail(0.999), GetTail(1), GetRate(), count);
+            return s;
+        }
+
         public override string GetSignature(double pLoad, double pUtilization, bool pOutputFlag)
         {
             return ToString() + "\n" + GetMeasurement(pLoad, pUtilization, pOutputFlag);
@@ -27,11 +27,18 @@ namespace ServerlessPoolOptimizer
         public int PairsCount();
 
         public KeyValuePair<double, (double, double)> GetValueFreqPairByIndex(int index);
+
+        // builds the state the reads compute lazily (sorted values, prefix sums), so that threads sharing the
+        // distribution afterwards only read it
+        public void Prepare();
     };
 
     public static class RandomSource
     {
         static private Random _myRandom;
+        // per-thread generator used by parallel analysis workers, falls back to the global one when not set
+        [ThreadStatic]
+        static private Random? _threadRandom;
 
         public static void Init()
         {
@@ -39,9 +46,45 @@ namespace ServerlessPoolOptimizer
             // _myRandom = new Random(DateTime.Now.Millisecond);
         }
 
+        // returns the generator the thread used before, to be restored with ResetThread
+        public static Random? InitThread(int seed)
+        {
+            var previousRandom = _threadRandom;
+            _threadRandom = new Random(seed);
+            return previousRandom;
+        }
+
+        // makes the thread draw from an existing generator, returns the previous one for ResetThread
+        public static Random? UseThread(Random random)
+        {
+            var previousRandom = _threadRandom;
+            _threadRandom = random;
+            return previousRandom;
+        }
+
+        public static void ResetThread(Random? previousRandom = null)
+        {
+            _threadRandom = previousRandom;
+        }
+
         public static double GetNext()
         {
-            return _myRandom.NextDouble();
+            return (_threadRandom ?? _myRandom).NextDouble();
+        }
+
+        /*
+         *  Generator of a named random stream (a pool, the host roles). The seed only depends on the simulation seed
+         *  and the name (FNV-1a, string.GetHashCode changes between processes), so the experiments of a replication
+         *  draw the same values for the same stream whatever the order of their events (common random numbers).
+         */
+        public static Random CreateStream(int simulationSeed, string streamName)
+        {
+            uint hash = 2166136261;
+            foreach (char c in streamName)
+            {
+                hash = unchecked((hash ^ c) * 16777619);
+            }
+            return new Random(unchecked(simulationSeed * 1000003 + (int)hash));
         }
 
     }
@@ -53,6 +96,10 @@ namespace ServerlessPoolOptimizer
         private readonly double _range = pMax - pMin;
         //Debug.Assert(_range > 0);
 
+        public void Prepare()
+        {
+        }
+
         public double GetSample()
         {
             double val = _range * RandomSource.GetNext() + _min;
@@ -39,6 +39,9 @@ namespace ServerlessPoolOptimizer
         internal double TotalRequests;
         internal double percentile;
         internal List<HostRole> HostRolesList;
+        // cost breakdown of the host roles released during the run (see Experiment.ReclaimTerminalObjects)
+        internal HostRoleStateTimeTracker? ReclaimedHostRolesTimeTracker;
+        internal int ReclaimedHostRolesCount;
 
         public PercentileResults(List<PoolLabel> poolLabelsList)
         {
@@ -378,6 +381,11 @@ namespace ServerlessPoolOptimizer
         public Trace TestTrace { get; set; }
         public string TraceSummaryStr;
         public string TestTraceSummaryStr;
+        // if > 0, the life cycle trace is joined while streaming the allocation trace, life cycles that are not
+        // allocated within this window (in seconds) are evicted. If 0, the whole allocation trace is kept for the join
+        public double PodLifeCycleJoinWindow;
+        // Practical keeps every life cycle value, Sketch keeps a bounded-size quantile sketch per distribution
+        public LifeCycleDistributionType LifeCycleDistributionType;
 
         /*
          *  Statistical Analysis parameters
@@ -389,6 +397,12 @@ namespace ServerlessPoolOptimizer
         public int HostRoleDemandAnalysisSamplesCount;
         // defines how we take samples from distribution, either randomly or the average 
         public SamplingApproach SamplingApproach;
+        // number of threads used by the Monte Carlo demand analysis (1 runs the samples serially on the global random source)
+        public int AnalysisParallelism;
+        // seed of the parallel Monte Carlo analysis, sample i always uses the same random sequence for a given seed
+        public int AnalysisSeed;
+        // if set, the pod and core demand analysis results are cached in this directory, keyed by their inputs
+        public string DemandAnalysisCacheDirectory;
         // ignored in the current algorithm 
 
 
@@ -421,6 +435,14 @@ namespace ServerlessPoolOptimizer
         public bool IgnorePodTransitionsExceptCreation;
         // if true, pods recycling is enabled 
         public bool RecyclePodsSimulatorFlag;
+        // if true, recycled pods and deleted host roles are folded into the cost accumulators and released,
+        // and simulation events are reused, so memory does not grow with the number of pods created
+        public bool ReclaimTerminalObjects;
+        // invariant checking of the simulation hot path: Full, Sampled or Off (null keeps the build default)
+        public ValidationLevel? ValidationLevel;
+        // if set, every pool and the host roles sample their life cycles from their own stream seeded with it, so
+        // experiments with the same seed see the same random numbers (null samples from the shared random source)
+        public int? SimulationSeed;
 
 
         /*
@@ -487,7 +509,15 @@ namespace ServerlessPoolOptimizer
                             HostRoleOptimizationMethod pVmOptimizationMethod = HostRoleOptimizationMethod.DROPS,
                             RecyclingTraceSamplingApproach pRecyclingTraceSamplingApproach = RecyclingTraceSamplingApproach.Random,
                             double pReactiveScalingUpFactor = 1.35,
-                            double pReactiveScalingDownFactor = 1
+                            double pReactiveScalingDownFactor = 1,
+                            double pPodLifeCycleJoinWindow = 0,
+                            LifeCycleDistributionType pLifeCycleDistributionType = LifeCycleDistributionType.Practical,
+                            int pAnalysisParallelism = 1,
+                            int pAnalysisSeed = 0,
+                            bool pReclaimTerminalObjects = false,
+                            ValidationLevel? pValidationLevel = null,
+                            int? pSimulationSeed = null,
+                            string pDemandAnalysisCacheDirectory = null
                         )
         {
             ExpName = pExpName;
@@ -539,6 +569,14 @@ namespace ServerlessPoolOptimizer
             ReactiveScalingUpFactor = pReactiveScalingUpFactor;
             ReactiveScalingDownFactor = pReactiveScalingDownFactor;
             MaxExtraCores = 0;
+            PodLifeCycleJoinWindow = pPodLifeCycleJoinWindow;
+            LifeCycleDistributionType = pLifeCycleDistributionType;
+            AnalysisParallelism = pAnalysisParallelism;
+            AnalysisSeed = pAnalysisSeed;
+            DemandAnalysisCacheDirectory = pDemandAnalysisCacheDirectory;
+            ReclaimTerminalObjects = pReclaimTerminalObjects;
+            ValidationLevel = pValidationLevel;
+            SimulationSeed = pSimulationSeed;
         }
 
         internal void InitResultsObject(List<PoolLabel> poolLabelsList)
@@ -93,14 +93,18 @@ namespace ServerlessPoolOptimizer
         private readonly double _reservedCores;
         private readonly int _maxPods;
         private double _idleCores;
-        public readonly List<Pod> HostedPods;
+        public readonly List<PodHandle> HostedPods;
         private int _hostedPodsCount;
         private readonly ISimulationTimeReader _clock;
         private double _timePointBootStart;
         private double _timePointBootComplete;
         public double _timePointDeleted;
         public HostRoleStateTimeTracker HostRoleStateTimeTracker;
+        // pod core-time of the recycled pods already removed from HostedPods
+        private readonly HostRoleStateTimeTracker _reclaimedPodsTimeTracker;
         private PoolGroupId? _assignedPoolGroup;
+        // pools of the service, indexed by the pool index of the hosted pod handles
+        private readonly IReadOnlyList<Pool> _pools;
 
         public event EventHandler<(HostRole, HostRoleState)> FireScheduleHostRoleStateTransitionAt;
 
@@ -110,6 +114,7 @@ namespace ServerlessPoolOptimizer
                         int pMaxPods,
                         double pBootDemand,
                         double pReservedCores,
+                        IReadOnlyList<Pool> pPools,
                         System.EventHandler<(ServerlessPoolOptimizer.HostRole, ServerlessPoolOptimizer.HostRoleState)> StateTransitionHandler)
         {
             _id = pId;
@@ -119,14 +124,16 @@ namespace ServerlessPoolOptimizer
             _reservedCores = pReservedCores;
             _maxPods = pMaxPods;
             _idleCores = pMaxCores;
-            HostedPods = new List<Pod>();
+            HostedPods = new List<PodHandle>();
             _hostedPodsCount = 0;
             _timePointBootStart = _clock.Now;
             _timePointBootComplete = _timePointBootStart + pBootDemand;
             _timePointDeleted = -1;
             HostRoleStateTimeTracker = new HostRoleStateTimeTracker(_id);
             HostRoleStateTimeTracker.LastAllocationTimePoint = _timePointBootComplete;
+            _reclaimedPodsTimeTracker = new HostRoleStateTimeTracker(pId);
             _assignedPoolGroup = null;
+            _pools = pPools;
             FireScheduleHostRoleStateTransitionAt += StateTransitionHandler;
         }
 
@@ -167,26 +174,26 @@ namespace ServerlessPoolOptimizer
             return _idleCores >= _pReqestedCore && _hostedPodsCount < _maxPods;
         }
 
-        internal bool PlacePod(Pod pod)
+        internal bool PlacePod(PodHandle pod, double podCores)
         {
-            if (!IsReady() || _idleCores < pod._podCores || _hostedPodsCount >= _maxPods)
+            if (!IsReady() || _idleCores < podCores || _hostedPodsCount >= _maxPods)
             {
                 return false;
             }
             HostRoleStateTimeTracker.HostRoleUnallocatedCores += _idleCores * (_clock.Now - HostRoleStateTimeTracker.LastAllocationTimePoint);
             HostRoleStateTimeTracker.LastAllocationTimePoint = _clock.Now;
-            _idleCores -= pod._podCores;
+            _idleCores -= podCores;
             HostedPods.Add(pod);
             _hostedPodsCount++;
             return true;
         }
 
-        internal void DeallocatePod(Pod pod)
+        internal void DeallocatePod(double podCores)
         {
             Debug.Assert(IsReady() || IsBeingDeleted());
             HostRoleStateTimeTracker.HostRoleUnallocatedCores += _idleCores * (_clock.Now - HostRoleStateTimeTracker.LastAllocationTimePoint);
             HostRoleStateTimeTracker.LastAllocationTimePoint = _clock.Now;
-            _idleCores += pod._podCores;
+            _idleCores += podCores;
             // HostedPods.Remove(pod);
             _hostedPodsCount--;
             Debug.Assert(_idleCores <= _maxCores);
@@ -197,6 +204,25 @@ namespace ServerlessPoolOptimizer
             }
         }
 
+        // folds the core-time of a recycled pod into the host role and drops its handle
+        internal void ReclaimPod(PodHandle pod, PodLifeCycleTimestamps podRealLifeCycle, double podCores)
+        {
+            AddPodTime(_reclaimedPodsTimeTracker, podRealLifeCycle, podCores);
+            HostedPods.Remove(pod);
+        }
+
+        private static void AddPodTime(HostRoleStateTimeTracker tracker, PodLifeCycleTimestamps podReadLifeCycle, double podCores)
+        {
+            tracker.PodCreation += podReadLifeCycle._durationCreation * podCores;
+            tracker.PodPending += podReadLifeCycle._durationPending * podCores;
+            tracker.PodReady += podReadLifeCycle._durationReady * podCores;
+            tracker.PodAllocated += podReadLifeCycle._durationAllocated * podCores;
+            tracker.PodSpecialization += 0;
+            tracker.PodUserWorkload += podReadLifeCycle._durationUserWorkload * podCores;
+            tracker.PodDeletion += podReadLifeCycle._durationDeleted * podCores;
+            tracker.PodRecycling += podReadLifeCycle._durationRecyclingVm * podCores;
+        }
+
         public void SetState(HostRoleState pState)
         {
             switch (pState)
@@ -269,26 +295,19 @@ namespace ServerlessPoolOptimizer
                 HostRoleStateTimeTracker.LastAllocationTimePoint = hostRoleLastTimePoint;
             }
 
-            HostRoleStateTimeTracker.PodCreation = 0;
-            HostRoleStateTimeTracker.PodPending = 0;
-            HostRoleStateTimeTracker.PodReady = 0;
-            HostRoleStateTimeTracker.PodAllocated = 0;
-            HostRoleStateTimeTracker.PodSpecialization = 0;
-            HostRoleStateTimeTracker.PodUserWorkload = 0;
-            HostRoleStateTimeTracker.PodDeletion = 0;
-            HostRoleStateTimeTracker.PodRecycling = 0;
+            HostRoleStateTimeTracker.PodCreation = _reclaimedPodsTimeTracker.PodCreation;
+            HostRoleStateTimeTracker.PodPending = _reclaimedPodsTimeTracker.PodPending;
+            HostRoleStateTimeTracker.PodReady = _reclaimedPodsTimeTracker.PodReady;
+            HostRoleStateTimeTracker.PodAllocated = _reclaimedPodsTimeTracker.PodAllocated;
+            HostRoleStateTimeTracker.PodSpecialization = _reclaimedPodsTimeTracker.PodSpecialization;
+            HostRoleStateTimeTracker.PodUserWorkload = _reclaimedPodsTimeTracker.PodUserWorkload;
+            HostRoleStateTimeTracker.PodDeletion = _reclaimedPodsTimeTracker.PodDeletion;
+            HostRoleStateTimeTracker.PodRecycling = _reclaimedPodsTimeTracker.PodRecycling;
 
             foreach (var pod in HostedPods)
             {
-                PodLifeCycleTimestamps podReadLifeCycle = pod.GetRealLifeCycle();
-                HostRoleStateTimeTracker.PodCreation += podReadLifeCycle._durationCreation * pod._podCores;
-                HostRoleStateTimeTracker.PodPending += podReadLifeCycle._durationPending * pod._podCores;
-                HostRoleStateTimeTracker.PodReady += podReadLifeCycle._durationReady * pod._podCores;
-                HostRoleStateTimeTracker.PodAllocated += podReadLifeCycle._durationAllocated * pod._podCores;
-                HostRoleStateTimeTracker.PodSpecialization += 0;
-                HostRoleStateTimeTracker.PodUserWorkload += podReadLifeCycle._durationUserWorkload * pod._podCores;
-                HostRoleStateTimeTracker.PodDeletion += podReadLifeCycle._durationDeleted * pod._podCores;
-                HostRoleStateTimeTracker.PodRecycling += podReadLifeCycle._durationRecyclingVm * pod._podCores;
+                var pool = _pools[pod.PoolIndex];
+                AddPodTime(HostRoleStateTimeTracker, pool.GetRealPodLifeCycle(pod), pool.GetPodCores(pod));
             }
         }
 
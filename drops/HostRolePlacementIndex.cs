@@ -0,0 +1,100 @@
+using System.Diagnostics;
+
+namespace ServerlessPoolOptimizer
+{
+    /*
+     *  Ready, non-full host roles ordered by idle cores for best-fit pod placement. Ties are broken by the order
+     *  the host roles joined the ready list, which is the order the stable sort over the ready list gave before.
+     *  The key of a host role must be updated (Update) every time its idle cores change.
+     */
+    public class HostRolePlacementIndex
+    {
+        private class KeyComparer : IComparer<(double, long, HostRole?)>
+        {
+            public int Compare((double, long, HostRole?) x, (double, long, HostRole?) y)
+            {
+                int result = x.Item1.CompareTo(y.Item1);
+                if (result != 0)
+                {
+                    return result;
+                }
+                return x.Item2.CompareTo(y.Item2);
+            }
+        }
+
+        private readonly SortedSet<(double, long, HostRole?)> _sortedHostRoles;
+        private readonly Dictionary<HostRole, (double, long, HostRole?)> _hostRoleToKey;
+        private long _sequence;
+
+        public HostRolePlacementIndex()
+        {
+            _sortedHostRoles = new SortedSet<(double, long, HostRole?)>(new KeyComparer());
+            _hostRoleToKey = new Dictionary<HostRole, (double, long, HostRole?)>();
+            _sequence = 0;
+        }
+
+        public int Count()
+        {
+            return _hostRoleToKey.Count;
+        }
+
+        // called when the host role joins the ready list
+        public void Add(HostRole hostRole)
+        {
+            Debug.Assert(!_hostRoleToKey.ContainsKey(hostRole));
+            var idleCores = hostRole.GetIdleCores();
+            if (idleCores <= 0)
+            {
+                return;
+            }
+            var key = (idleCores, _sequence++, (HostRole?)hostRole);
+            _sortedHostRoles.Add(key);
+            _hostRoleToKey.Add(hostRole, key);
+        }
+
+        // called when the host role leaves the ready list
+        public void Remove(HostRole hostRole)
+        {
+            if (_hostRoleToKey.Remove(hostRole, out var key))
+            {
+                _sortedHostRoles.Remove(key);
+            }
+        }
+
+        // called after the idle cores of a host role in the ready list changed, keeps its position among ties
+        public void Update(HostRole hostRole)
+        {
+            if (!_hostRoleToKey.Remove(hostRole, out var key))
+            {
+                return;
+            }
+            _sortedHostRoles.Remove(key);
+            var idleCores = hostRole.GetIdleCores();
+            if (idleCores <= 0)
+            {
+                return;
+            }
+            var newKey = (idleCores, key.Item2, (HostRole?)hostRole);
+            _sortedHostRoles.Add(newKey);
+            _hostRoleToKey.Add(hostRole, newKey);
+        }
+
+        // host role with the least idle cores that can still fit the pod, null if there is none
+        public HostRole? FindBestFit(double podCores)
+        {
+            if (_sortedHostRoles.Count == 0)
+            {
+                return null;
+            }
+            var max = _sortedHostRoles.Max;
+            if (max.Item1 < podCores)
+            {
+                return null;
+            }
+            var candidates = _sortedHostRoles.GetViewBetween((podCores, long.MinValue, null), max);
+            var hostRole = candidates.Min.Item3;
+            Debug.Assert(hostRole != null && hostRole.HasCapacity(podCores));
+            return hostRole;
+        }
+    }
+}
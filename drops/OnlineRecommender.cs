@@ -0,0 +1,385 @@
+using System.Diagnostics;
+using System.Text.Json;
+
+namespace ServerlessPoolOptimizer
+{
+    /*
+     *  Frequency of integer demand values over a sliding time window, kept as a ring of time buckets: adding a
+     *  value and expiring a bucket are O(1) per value, memory is bounded by the number of buckets and distinct
+     *  values, whatever the number of requests in the window.
+     */
+    public class SlidingHistogram
+    {
+        private readonly double _bucketWidth;
+        private readonly Dictionary<int, long>[] _buckets;
+        // absolute index (time point / bucket width) of the newest bucket, -1 before the first value
+        private long _newestBucket;
+        // window frequency of every value, indexed by value
+        private long[] _counts;
+        private long _total;
+
+        public SlidingHistogram(double pWindowSize, int pBucketsCount)
+        {
+            Debug.Assert(pWindowSize > 0 && pBucketsCount > 0);
+            _bucketWidth = pWindowSize / pBucketsCount;
+            _buckets = new Dictionary<int, long>[pBucketsCount];
+            for (int i = 0; i < pBucketsCount; i++)
+            {
+                _buckets[i] = new Dictionary<int, long>();
+            }
+            _newestBucket = -1;
+            _counts = new long[16];
+            _total = 0;
+        }
+
+        public long Count()
+        {
+            return _total;
+        }
+
+        public void Add(double timePoint, int value)
+        {
+            Debug.Assert(value >= 0);
+            Advance(timePoint);
+            var bucket = _buckets[_newestBucket % _buckets.Length];
+            bucket[value] = bucket.GetValueOrDefault(value) + 1;
+            if (value >= _counts.Length)
+            {
+                Array.Resize(ref _counts, Math.Max(value + 1, _counts.Length * 2));
+            }
+            _counts[value]++;
+            _total++;
+        }
+
+        // expires the buckets that are out of the window ending at timePoint
+        public void Advance(double timePoint)
+        {
+            long bucketIndex = (long)(timePoint / _bucketWidth);
+            if (_newestBucket == -1 || bucketIndex - _newestBucket >= _buckets.Length)
+            {
+                foreach (var bucket in _buckets)
+                {
+                    Expire(bucket);
+                }
+                _newestBucket = bucketIndex;
+                return;
+            }
+            while (_newestBucket < bucketIndex)
+            {
+                _newestBucket++;
+                Expire(_buckets[_newestBucket % _buckets.Length]);
+            }
+        }
+
+        /*
+         *  Smallest value whose cumulative frequency reaches the target percentile, the same choice as
+         *  GenerateSuccessRateMap + FindBufferSizeToMatchPercentile over a distribution of the window values.
+         */
+        public int GetSizeToMatchPercentile(double targetPercentile)
+        {
+            double cumFreq = 0;
+            int maxValue = 0;
+            for (int value = 0; value < _counts.Length; value++)
+            {
+                if (_counts[value] == 0)
+                {
+                    continue;
+                }
+                cumFreq += _counts[value];
+                maxValue = value;
+                if (cumFreq / _total >= targetPercentile)
+                {
+                    return value;
+                }
+            }
+            return maxValue;
+        }
+
+        private void Expire(Dictionary<int, long> bucket)
+        {
+            foreach (var (value, count) in bucket)
+            {
+                _counts[value] -= count;
+                _total -= count;
+            }
+            bucket.Clear();
+        }
+    }
+
+    /*
+     *  Online DROPS sizing over a stream of allocation trace lines (stdin or a file being appended to). Every
+     *  allocation is turned into the demand samples of the batch analysis as it arrives:
+     *   - pod demand of its pool (PerRequestPodDemandAnalysis): the request plus the earlier requests of the pool
+     *     whose replacement pod is not ready yet, kept in a heap of replenishment time points;
+     *   - host role demand (DropsPerRequestCoreDemandAnalysis): pods allocated minus pods recycled within a sampled
+     *     VM creation delay, over a queue of the events of the last maximum creation delay.
+     *  Samples go to sliding window histograms, pool and host role sizes for the target percentiles are written
+     *  every Cadence seconds of trace time. The life cycle distributions (supply delay, allocated to recycled) come
+     *  from the training allocation and life cycle traces, pools without them are ignored.
+     */
+    public class OnlineRecommender
+    {
+        private class PoolDemandState
+        {
+            public readonly PoolLabel PoolLabel;
+            public readonly PodLifeCycleDistributions LifeCycleDistributions;
+            // replenishment time points of the requests whose replacement pod is not ready yet
+            public readonly PriorityQueue<double, double> Replenishments;
+            public readonly SlidingHistogram PodDemand;
+
+            public PoolDemandState(PoolLabel pPoolLabel, PodLifeCycleDistributions pLifeCycleDistributions,
+                                    double pWindowSize, int pBucketsCount)
+            {
+                PoolLabel = pPoolLabel;
+                LifeCycleDistributions = pLifeCycleDistributions;
+                Replenishments = new PriorityQueue<double, double>();
+                PodDemand = new SlidingHistogram(pWindowSize, pBucketsCount);
+            }
+        }
+
+        private readonly Experiment _exp;
+        private readonly double _windowSize;
+        private readonly int _windowBucketsCount;
+        private readonly double _cadence;
+        private readonly Dictionary<PoolLabel, PoolDemandState> _pools;
+        private readonly HashSet<PoolLabel> _unknownPools;
+        private readonly SlidingHistogram _hostRoleDemand;
+        private readonly double _maxHostRoleCreationDelay;
+        // (time point, cores, +1 allocated / -1 recycled) of the last _maxHostRoleCreationDelay seconds
+        private readonly Queue<(double, double, int)> _hostRoleEvents;
+        // sampled recycling time points (allocation + allocated to recycled delay) not reached yet, with the cores
+        private readonly PriorityQueue<double, double> _pendingRecyclings;
+        private readonly Dictionary<double, int> _podsCountPerCores;
+        private DateTime _referenceDateTime;
+        private double _nextRecommendationTimePoint;
+        private long _requestsCount;
+
+        public OnlineRecommender(Experiment pExp, double pWindowSize, int pWindowBucketsCount, double pCadence)
+        {
+            _exp = pExp;
+            _windowSize = pWindowSize;
+            _windowBucketsCount = pWindowBucketsCount;
+            _cadence = pCadence;
+            _pools = new Dictionary<PoolLabel, PoolDemandState>();
+            _unknownPools = new HashSet<PoolLabel>();
+            _hostRoleDemand = new SlidingHistogram(pWindowSize, pWindowBucketsCount);
+            _maxHostRoleCreationDelay = pExp.HostRoleInitializationDemandDistribution.GetTail(1.0);
+            _hostRoleEvents = new Queue<(double, double, int)>();
+            _pendingRecyclings = new PriorityQueue<double, double>();
+            _podsCountPerCores = new Dictionary<double, int>();
+            _referenceDateTime = DateTime.MinValue;
+            _nextRecommendationTimePoint = pCadence;
+            _requestsCount = 0;
+
+            foreach (var (poolLabel, poolDistributions) in pExp.Trace.PoolLabelToDistributions)
+            {
+                var lifeCycleDistributions = poolDistributions.PodLifeCycleDistributions;
+                if (lifeCycleDistributions._supplyDelayDistribution.Count() == 0)
+                {
+                    continue;
+                }
+                _pools.Add(poolLabel, new PoolDemandState(poolLabel, lifeCycleDistributions, pWindowSize, pWindowBucketsCount));
+            }
+        }
+
+        /*
+         *  Config: {"rootPath", "tracesFolder", "trainingTraceName", "lifeCycleTraceName", "vmCreationCdfPath",
+         *  "percentiles", "window" (s), "windowBuckets", "cadence" (s), "input" (trace file or "-" for stdin),
+         *  "follow" (keep reading the input file as it grows), "output" (csv file or "-" for stdout)}, plus the
+         *  optional experiment parameters.
+         */
+        public static void Run(string configFile)
+        {
+            string json = File.ReadAllText(configFile);
+            using JsonDocument doc = JsonDocument.Parse(json);
+            JsonElement config = doc.RootElement;
+
+            string rootDirectory = config.GetProperty("rootPath").GetString();
+            string tracesDirectory = rootDirectory + config.GetProperty("tracesFolder").GetString() + "/";
+            List<double> percentiles = new();
+            foreach (JsonElement p in config.GetProperty("percentiles").EnumerateArray())
+            {
+                percentiles.Add(p.GetDouble());
+            }
+            var exp = new Experiment(
+                            pExpName: "online-DROPS",
+                            pTrainingTracePath: tracesDirectory + config.GetProperty("trainingTraceName").GetString(),
+                            pLifeCycleTracePath: tracesDirectory + config.GetProperty("lifeCycleTraceName").GetString(),
+                            pTargetPercentiles: percentiles,
+                            pVmCreationCdf: Utilities.GetVmCreationDistribution(tracesDirectory + config.GetProperty("vmCreationCdfPath").GetString()));
+            Utilities.ParseOptionalExperimentParameters(config, exp);
+
+            double windowSize = config.TryGetProperty("window", out JsonElement windowElem) ? windowElem.GetDouble() : Parameter.RecommenderWindowSize;
+            int windowBucketsCount = config.TryGetProperty("windowBuckets", out JsonElement windowBucketsElem) ? windowBucketsElem.GetInt32() : Parameter.RecommenderWindowBucketsCount;
+            double cadence = config.TryGetProperty("cadence", out JsonElement cadenceElem) ? cadenceElem.GetDouble() : Parameter.RecommenderCadence;
+            string input = config.TryGetProperty("input", out JsonElement inputElem) ? inputElem.GetString() : "-";
+            bool follow = config.TryGetProperty("follow", out JsonElement followElem) && followElem.GetBoolean();
+            string output = config.TryGetProperty("output", out JsonElement outputElem) ? outputElem.GetString() : "-";
+
+            TextWriter recommendations;
+            if (output == "-")
+            {
+                // the log goes to stderr, stdout only has the recommendations
+                recommendations = Console.Out;
+                Console.SetOut(Console.Error);
+            }
+            else
+            {
+                recommendations = new StreamWriter(output) { AutoFlush = true };
+            }
+
+            RandomSource.Init();
+            Console.WriteLine("Parsing the life cycle distributions...");
+            exp.Trace = new Trace(TraceType.AllocationTrace, exp.AllocationTracePath, exp.PodLifeCycleTracePath);
+            exp.Trace.Parse(exp);
+            var recommender = new OnlineRecommender(exp, windowSize, windowBucketsCount, cadence);
+            TextReader allocations = input == "-"
+                                        ? Console.In
+                                        : new StreamReader(new FileStream(input, FileMode.Open, FileAccess.Read, FileShare.ReadWrite));
+            using (allocations)
+            {
+                recommender.Consume(new TraceReader(allocations, TraceType.AllocationTrace), input != "-" && follow, recommendations);
+            }
+            recommendations.Flush();
+            if (output != "-")
+            {
+                recommendations.Close();
+            }
+        }
+
+        public void Consume(TraceReader traceReader, bool follow, TextWriter recommendations)
+        {
+            recommendations.WriteLine("TimePoint,Percentile,Pool,Recommended Size,Window Samples");
+            for (int i = 0; i < Parameter.TraceSkipLinesCount; i++)
+            {
+                ReadLine(traceReader, follow);
+            }
+            string? line;
+            double timePoint = 0.0;
+            while ((line = ReadLine(traceReader, follow)) != null)
+            {
+                var lineFields = traceReader.LineToTraceFields(line);
+                if (lineFields == null)
+                {
+                    continue;
+                }
+                if (_referenceDateTime == DateTime.MinValue)
+                {
+                    _referenceDateTime = lineFields.RealTime;
+                }
+                timePoint = traceReader.ComputeTimeDiff(_referenceDateTime, lineFields.RealTime);
+                while (timePoint >= _nextRecommendationTimePoint)
+                {
+                    WriteRecommendations(recommendations, _nextRecommendationTimePoint);
+                    _nextRecommendationTimePoint += _cadence;
+                }
+                if (lineFields.TraceLineType == TraceLineType.Allocation)
+                {
+                    AddAllocation(TraceLineFields.ConvertToPoolLabel(lineFields), timePoint);
+                }
+            }
+            WriteRecommendations(recommendations, timePoint);
+            Console.WriteLine("Consumed {0} allocation requests, ignored pools without life cycles: {1}",
+                                _requestsCount, String.Join(" ", _unknownPools));
+        }
+
+        private static string? ReadLine(TraceReader traceReader, bool follow)
+        {
+            string? line;
+            while ((line = traceReader.ReadLine()) == null && follow)
+            {
+                Thread.Sleep(Parameter.RecommenderFollowPollInterval);
+            }
+            return line;
+        }
+
+        private void AddAllocation(PoolLabel poolLabel, double timePoint)
+        {
+            if (!_pools.TryGetValue(poolLabel, out var pool))
+            {
+                _unknownPools.Add(poolLabel);
+                return;
+            }
+            _requestsCount++;
+
+            // pod demand: this request plus the earlier ones still waiting for their replacement pod
+            var replenishments = pool.Replenishments;
+            while (replenishments.Count > 0 && replenishments.Peek() <= timePoint)
+            {
+                replenishments.Dequeue();
+            }
+            pool.PodDemand.Add(timePoint, replenishments.Count + 1);
+            var supplyDelayDistribution = pool.LifeCycleDistributions._supplyDelayDistribution;
+            var supplyDelay = _exp.SamplingApproach == SamplingApproach.Average
+                                ? supplyDelayDistribution.GetMean()
+                                : supplyDelayDistribution.GetSample();
+            replenishments.Enqueue(timePoint + supplyDelay, timePoint + supplyDelay);
+
+            // host role demand: pods allocated minus pods recycled within a sampled VM creation delay
+            var allocatedToRecycledDistribution = pool.LifeCycleDistributions._allocatedToRecycledDistribution;
+            if (allocatedToRecycledDistribution.Count() > 0)
+            {
+                var allocatedToRecycled = _exp.RecyclingTraceSamplingApproach == RecyclingTraceSamplingApproach.Average
+                                            ? allocatedToRecycledDistribution.GetMean()
+                                            : allocatedToRecycledDistribution.GetSample();
+                _pendingRecyclings.Enqueue(poolLabel.Cores, timePoint + allocatedToRecycled);
+            }
+            while (_pendingRecyclings.TryPeek(out double recycledCores, out double recyclingTimePoint) && recyclingTimePoint <= timePoint)
+            {
+                _pendingRecyclings.Dequeue();
+                _hostRoleEvents.Enqueue((recyclingTimePoint, recycledCores, -1));
+            }
+            _hostRoleEvents.Enqueue((timePoint, poolLabel.Cores, 1));
+            while (_hostRoleEvents.Peek().Item1 <= timePoint - _maxHostRoleCreationDelay)
+            {
+                _hostRoleEvents.Dequeue();
+            }
+            _hostRoleDemand.Add(timePoint, ComputeHostRoleDemand(timePoint));
+        }
+
+        private int ComputeHostRoleDemand(double timePoint)
+        {
+            var creationDelayDistribution = _exp.HostRoleInitializationDemandDistribution;
+            var creationDelay = creationDelayDistribution.GetSample();
+            if (_exp.SamplingApproach == SamplingApproach.Average)
+            {
+                creationDelay = creationDelayDistribution.GetMean();
+            }
+            _podsCountPerCores.Clear();
+            foreach (var (eventTimePoint, cores, podsDelta) in _hostRoleEvents)
+            {
+                if (timePoint - eventTimePoint < creationDelay)
+                {
+                    _podsCountPerCores[cores] = _podsCountPerCores.GetValueOrDefault(cores) + podsDelta;
+                }
+            }
+            double hostRoleCount = Math.Ceiling(Utilities.ComputeNeededHostRoles(_podsCountPerCores, _exp.HostRoleCores, _exp.MaxPodsPerHostRole));
+            return hostRoleCount <= 0 ? 1 : (int)hostRoleCount;
+        }
+
+        private void WriteRecommendations(TextWriter recommendations, double timePoint)
+        {
+            _hostRoleDemand.Advance(timePoint);
+            foreach (var targetPercentile in _exp.TargetPercentiles)
+            {
+                var adjustedPercentile = AnalysisHelper.AdjustPoolTargetPercentile(targetPercentile);
+                foreach (var pool in _pools.Values)
+                {
+                    pool.PodDemand.Advance(timePoint);
+                    if (pool.PodDemand.Count() == 0)
+                    {
+                        continue;
+                    }
+                    recommendations.WriteLine(String.Format("{0},{1},{2},{3},{4}", timePoint, targetPercentile, pool.PoolLabel,
+                                                pool.PodDemand.GetSizeToMatchPercentile(adjustedPercentile), pool.PodDemand.Count()));
+                }
+                if (_hostRoleDemand.Count() > 0)
+                {
+                    recommendations.WriteLine(String.Format("{0},{1},{2},{3},{4}", timePoint, targetPercentile, "HostRoles",
+                                                _hostRoleDemand.GetSizeToMatchPercentile(targetPercentile), _hostRoleDemand.Count()));
+                }
+            }
+            recommendations.Flush();
+        }
+    }
+}
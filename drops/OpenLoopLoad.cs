@@ -14,6 +14,7 @@ namespace ServerlessPoolOptimizer
         private readonly IDistribution? _requestedPodsDistribution = pRequestedPodsDistribution;
         private readonly IDistribution? _requestedCoresDistribution = pRequestedPodsDistribution;
         private Trace? _trace = pTrace;
+        private TraceArrivalCursor? _traceCursor = null;
         private readonly ISimulationTimeReader _clock = pSimulationTime;
         private double _traceLastRequestArrivalTime = 0.0;
         private double _sumInterArrival = 0.0;
@@ -56,32 +57,40 @@ namespace ServerlessPoolOptimizer
             FireGetMyStatus(this, ToString());
         }
 
-        private void GenerateRequestsFromTrace(int requestBatchIndex)
+        /*
+         *  Only the next trace request is scheduled: it is pulled from the cursor when the previous one arrives, so the
+         *  simulator queue holds one pending arrival instead of whole batches. The end of trace event keeps the trigger
+         *  time of the last request of the last batch.
+         */
+        private void GenerateRequestsFromTrace(AllocationRequest? arrivedRequest)
         {
-            if (_endOfTraceEventAlreadtFired)
+            if (_traceCursor == null)
+            {
+                _traceCursor = new TraceArrivalCursor(_trace, _traceReferenceTimePoint);
+                _traceLastRequestArrivalTime = _traceCursor.GetLastBatchArrivalTimePoint();
+                SimEvent endOfTraceEvent = _simulator.CreateEvent(EventType.EndOfTrace, _clock.Now, _traceLastRequestArrivalTime, null, null, null);
+                FireEndOfTrace(this, endOfTraceEvent);
+            }
+            else if (arrivedRequest == null)
             {
+                // not an arrival (e.g. end of trace with queued requests), the next request is already scheduled
                 return;
             }
-            List<AllocationRequest> requestsList = _trace.GetNextRequestsBatch(requestBatchIndex, _traceReferenceTimePoint);
-            if (requestsList.Count == 0)
+            if (_endOfTraceEventAlreadtFired)
             {
-                if (!_endOfTraceEventAlreadtFired)
-                {
-                    _trace.Close();
-                    _endOfTraceEventAlreadtFired = true;
-                    SimEvent newEvent = _simulator.CreateEvent(EventType.EndOfTrace, _clock.Now, _traceLastRequestArrivalTime, null, null, null);
-                    FireEndOfTrace(this, newEvent);
-                }
                 return;
             }
-            _traceLastRequestArrivalTime = requestsList[requestsList.Count - 1].ArrivalTimePoint;
-            for (int i = 0; i < requestsList.Count; i++)
+            AllocationRequest? request = _traceCursor.Next();
+            if (request == null)
             {
-                var nextEvent = _simulator.CreateEvent(EventType.RequestArrive, _clock.Now, requestsList[i].ArrivalTimePoint, requestsList[i], null, null);
-                _requestArrivedCounter++;
-                _sumInterArrival += requestsList[i].ArrivalTimePoint;
-                FireRequestWillArrive(this, nextEvent);
+                _trace.Close();
+                _endOfTraceEventAlreadtFired = true;
+                return;
             }
+            var nextEvent = _simulator.CreateEvent(EventType.RequestArrive, _clock.Now, request.ArrivalTimePoint, request, null, null);
+            _requestArrivedCounter++;
+            _sumInterArrival += request.ArrivalTimePoint;
+            FireRequestWillArrive(this, nextEvent);
         }
 
         private void GenerateRequestsFromDistributions()
@@ -102,7 +111,7 @@ namespace ServerlessPoolOptimizer
             }
         }
 
-        public void HandleRequestNowArrivesNotification(object sender, AllocationRequest r)
+        public void HandleRequestNowArrivesNotification(object sender, AllocationRequest? r)
         {
             if (_requestBatchCounter == 0)
             {
@@ -110,7 +119,7 @@ namespace ServerlessPoolOptimizer
             }
             if (_trace != null)
             {
-                GenerateRequestsFromTrace(_requestBatchCounter);
+                GenerateRequestsFromTrace(r);
             }
             else
             {
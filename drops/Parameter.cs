@@ -11,6 +11,16 @@ namespace ServerlessPoolOptimizer
         Random, Average
     }
 
+    public enum LifeCycleDistributionType
+    {
+        Practical, Sketch
+    }
+
+    public enum ValidationLevel
+    {
+        Full, Sampled, Off
+    }
+
     public class Parameter
     {
         public static readonly double[] PossibleCoreAllocations = [2.00, 1.00, 0.25];
@@ -23,6 +33,25 @@ namespace ServerlessPoolOptimizer
         public static readonly int ReactiveMinVmPoolSize = 5;
         public static readonly int ReactiveExtraVmPoolSize = 5;
         public static readonly int ReactiveMaxPoolSize = 4500;
+        public static readonly double SketchRelativeAccuracy = 0.01;
+        // with LifeCycleDistributionType.Sketch, the full life cycles kept per pool for sampling (reservoir sample)
+        public static readonly int LifeCycleReservoirSize = 10000;
+        // with ValidationLevel.Sampled, one state transition out of this many is checked
+        public static readonly int ValidationSampleEvery = 1000;
+        // replay stats rows per block handed to the background writer, and blocks allowed to wait for it
+        public static readonly int StatsWriterBlockRows = 1024;
+        public static readonly int StatsWriterMaxPendingBlocks = 16;
+        public static readonly int StatsWriterBufferSize = 1 << 16;
+        // finest window of the per-pool arrival counts, smoothed traces of multiples of it are derived from the counts
+        public static readonly double SmoothedTraceBaseResolution = 1.0;
+        // pending client connections of drops --serve on a Unix socket
+        public static readonly int ServerSocketBacklog = 16;
+        // drops --recommend: demand window (s), its buckets, seconds of trace time between recommendations, and the
+        // wait (ms) before reading again a followed input file at its end
+        public static readonly double RecommenderWindowSize = 3600;
+        public static readonly int RecommenderWindowBucketsCount = 60;
+        public static readonly double RecommenderCadence = 300;
+        public static readonly int RecommenderFollowPollInterval = 1000;
 
         public static Dictionary<PoolLabel, int> GetProductionPoolSizes()
         {
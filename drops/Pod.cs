@@ -25,12 +25,17 @@ namespace ServerlessPoolOptimizer
         internal IDistribution _fullLifeCycleDistribution; // the combination of all states
         internal IDistribution _allocatedToRecycledDistribution; // from allocated --> recycled
         internal List<PodLifeCycleTimestamps> _lifeCyclesList;
+        // with the sketch distributions, _lifeCyclesList is a uniform reservoir sample of at most this many life cycles
+        private readonly int _lifeCyclesCapacity;
+        private long _lifeCyclesSeen;
+        private readonly Random _reservoirRandom;
         public PodLifeCycleDistributions(IDistribution pCreationDemandDistribution, IDistribution pPendingDemandDistribution,
                                         IDistribution pIdleDurationDistribution, IDistribution pAllocatedDemandDistribution,
                                         IDistribution pSpecializedDemandDistribution, IDistribution pUserWorkloadDemandDistribution,
                                         IDistribution pDeleteDemandDistribution, IDistribution pVmRecyclingDemandDistribution,
                                         IDistribution pSupplyDelayDistribution, IDistribution pDeleteRecycleDelayDistribution,
-                                        IDistribution pFullLifeCycleDistribution, IDistribution pAllocatedToRecycledDistribution)
+                                        IDistribution pFullLifeCycleDistribution, IDistribution pAllocatedToRecycledDistribution,
+                                        int pLifeCyclesCapacity = int.MaxValue)
         {
             _creationDemandDistribution = pCreationDemandDistribution;
             _pendingDemandDistribution = pPendingDemandDistribution;
@@ -45,6 +50,25 @@ namespace ServerlessPoolOptimizer
             _fullLifeCycleDistribution = pFullLifeCycleDistribution;
             _allocatedToRecycledDistribution = pAllocatedToRecycledDistribution;
             _lifeCyclesList = new List<PodLifeCycleTimestamps>();
+            _lifeCyclesCapacity = pLifeCyclesCapacity;
+            _lifeCyclesSeen = 0;
+            // its own generator, the reservoir replacements do not consume draws of the simulation
+            _reservoirRandom = new Random(0);
+        }
+
+        internal void AddLifeCycle(PodLifeCycleTimestamps lifeCycle)
+        {
+            _lifeCyclesSeen++;
+            if (_lifeCyclesList.Count < _lifeCyclesCapacity)
+            {
+                _lifeCyclesList.Add(lifeCycle);
+                return;
+            }
+            long index = _reservoirRandom.NextInt64(_lifeCyclesSeen);
+            if (index < _lifeCyclesCapacity)
+            {
+                _lifeCyclesList[(int)index] = lifeCycle;
+            }
         }
 
         internal int MinLength()
@@ -64,15 +88,21 @@ namespace ServerlessPoolOptimizer
             return (int)min;
         }
 
-        internal PodLifeCycleTimestamps SampleLifeCycle()
+        internal PodLifeCycleTimestamps SampleLifeCycle(Random? random = null)
         {
-            int index = (int)(RandomSource.GetNext() * _lifeCyclesList.Count);
+            double next = random != null ? random.NextDouble() : RandomSource.GetNext();
+            int index = (int)(next * _lifeCyclesList.Count);
             return _lifeCyclesList[index];
         }
 
     }
 
-    public class PodLifeCycleTimestamps
+    /*
+     *  Stored inline in the PodStore rows (value type) so pods do not allocate and computing the real life cycle
+     *  of a pod does not allocate. Copies are independent: modifying a sampled life cycle does not change the
+     *  entry of the life cycles list it came from.
+     */
+    public struct PodLifeCycleTimestamps
     {
         internal readonly double _timePointCreation;
         internal double _durationCreation; // TS = _durationCreation + _timePointCreation  
@@ -99,33 +129,43 @@ namespace ServerlessPoolOptimizer
             _durationRecyclingVm = pDurationRecyclingVm;
         }
 
-        public void Assert()
+        public readonly void Assert()
         {
-            Debug.Assert(_timePointCreation >= 0);
-            Debug.Assert(_durationCreation >= 0);
-            Debug.Assert(_durationPending >= 0);
-            // Debug.Assert(_durationReady >= 0);
-            Debug.Assert(_durationAllocated >= 0);
-            Debug.Assert(_durationSpecialized >= 0);
-            Debug.Assert(_durationUserWorkload >= 0);
-            Debug.Assert(_durationDeleted >= 0);
-            Debug.Assert(_durationRecyclingVm >= 0);
+            if (Validation.Level == ValidationLevel.Off)
+            {
+                return;
+            }
+            Validation.Check(_timePointCreation >= 0
+                                && _durationCreation >= 0
+                                && _durationPending >= 0
+                                // && _durationReady >= 0
+                                && _durationAllocated >= 0
+                                && _durationSpecialized >= 0
+                                && _durationUserWorkload >= 0
+                                && _durationDeleted >= 0
+                                && _durationRecyclingVm >= 0,
+                                "negative duration in pod life cycle: {0}", this);
         }
 
-        public void AssertLifeCycle()
+        public readonly void AssertLifeCycle()
         {
-            Debug.Assert(_timePointCreation >= 0);
-            Debug.Assert(GetTransitionEndTimePoint(PodState.Created) >= _timePointCreation);
-            Debug.Assert(GetTransitionEndTimePoint(PodState.Pending) >= GetTransitionEndTimePoint(PodState.Created));
-            Debug.Assert(GetTransitionEndTimePoint(PodState.Ready) >= GetTransitionEndTimePoint(PodState.Pending));
-            Debug.Assert(GetTransitionEndTimePoint(PodState.Allocated) >= GetTransitionEndTimePoint(PodState.Ready));
-            Debug.Assert(GetTransitionEndTimePoint(PodState.Specialized) >= GetTransitionEndTimePoint(PodState.Allocated));
-            Debug.Assert(GetTransitionEndTimePoint(PodState.UserWorkload) >= GetTransitionEndTimePoint(PodState.Specialized));
-            Debug.Assert(GetTransitionEndTimePoint(PodState.Deleted) >= GetTransitionEndTimePoint(PodState.UserWorkload));
-            Debug.Assert(GetTransitionEndTimePoint(PodState.Recycled) >= GetTransitionEndTimePoint(PodState.Deleted));
+            if (Validation.Level == ValidationLevel.Off)
+            {
+                return;
+            }
+            Validation.Check(_timePointCreation >= 0
+                                && GetTransitionEndTimePoint(PodState.Created) >= _timePointCreation
+                                && GetTransitionEndTimePoint(PodState.Pending) >= GetTransitionEndTimePoint(PodState.Created)
+                                && GetTransitionEndTimePoint(PodState.Ready) >= GetTransitionEndTimePoint(PodState.Pending)
+                                && GetTransitionEndTimePoint(PodState.Allocated) >= GetTransitionEndTimePoint(PodState.Ready)
+                                && GetTransitionEndTimePoint(PodState.Specialized) >= GetTransitionEndTimePoint(PodState.Allocated)
+                                && GetTransitionEndTimePoint(PodState.UserWorkload) >= GetTransitionEndTimePoint(PodState.Specialized)
+                                && GetTransitionEndTimePoint(PodState.Deleted) >= GetTransitionEndTimePoint(PodState.UserWorkload)
+                                && GetTransitionEndTimePoint(PodState.Recycled) >= GetTransitionEndTimePoint(PodState.Deleted),
+                                "pod life cycle transitions are out of order: {0}", this);
         }
 
-        public double GetTransitionEndTimePoint(PodState state)
+        public readonly double GetTransitionEndTimePoint(PodState state)
         {
             double timePoint = _timePointCreation;
             switch (state)
@@ -190,7 +230,7 @@ namespace ServerlessPoolOptimizer
             return timePoint;
         }
 
-        public override string ToString()
+        public override readonly string ToString()
         {
             string str = "";
             str += String.Format("Creation time = {0}, ", _timePointCreation);
@@ -209,117 +249,219 @@ namespace ServerlessPoolOptimizer
 
     }
 
-    public class Pod
+    /*
+     *  A pod of a pool: the index of the pool in its pool group, the slot of the pod in the pool PodStore and the
+     *  pod id. Slots of reclaimed pods are reused, an event scheduled for a pod that was reclaimed since then
+     *  has a handle whose id no longer matches the slot (see PodStore.IsLive).
+     */
+    public readonly struct PodHandle : IEquatable<PodHandle>
     {
-        internal readonly int _id;
-        internal PodState _myState;
-        internal double _podCores;
-        internal PodState _lastStateBeforeDeleted;
-        internal readonly PodLifeCycleTimestamps LifeCycleTimestamps;
-        internal readonly AllocationLabel _allocationLabel;
-        // the core size of the pool itself. Pod can have a smaller size.
-        internal readonly int _hostRoleId;
-        internal readonly double _poolCores;
-        private readonly ISimulationTimeReader _clock;
-
-        internal Pod(ISimulationTimeReader pSimulationTimeReaderdouble, int podId,
-                    PodLifeCycleTimestamps pLifeCycleTimestamps, AllocationLabel pAllocationLabel,
-                    double pPoolCores, int pHostRoleId)
+        internal readonly int PoolIndex;
+        internal readonly int Slot;
+        internal readonly int Id;
+
+        internal PodHandle(int pPoolIndex, int pSlot, int pId)
+        {
+            PoolIndex = pPoolIndex;
+            Slot = pSlot;
+            Id = pId;
+        }
+
+        public bool Equals(PodHandle other)
         {
-            _clock = pSimulationTimeReaderdouble;
-            _id = podId;
-            _podCores = pPoolCores;
-            _myState = PodState.Created;
-            _lastStateBeforeDeleted = PodState.Created;
-            LifeCycleTimestamps = pLifeCycleTimestamps;
-            _allocationLabel = pAllocationLabel;
-            _poolCores = pPoolCores;
-            _hostRoleId = pHostRoleId;
-            LifeCycleTimestamps.Assert();
+            return PoolIndex == other.PoolIndex && Slot == other.Slot && Id == other.Id;
         }
 
-        public void AdjustCores(double newCores)
+        public override bool Equals(object? obj)
         {
-            Debug.Assert(_podCores >= newCores);
-            _podCores = newCores;
+            return obj is PodHandle other && Equals(other);
         }
 
-        public PodLifeCycleTimestamps GetRealLifeCycle()
+        public override int GetHashCode()
         {
+            return HashCode.Combine(PoolIndex, Slot, Id);
+        }
+
+        public override string ToString()
+        {
+            return String.Format("pool {0}, slot {1}, pod {2}", PoolIndex, Slot, Id);
+        }
+    }
+
+    /*
+     *  The pods of a pool as a structure of arrays, one row per pod slot: id, state, cores, host role and life cycle.
+     *  Creating a pod fills a row instead of allocating an object, and the pool state lists are linked through the
+     *  _previousInState/_nextInState slots instead of list nodes. Free slots (reclaimed pods) are reused first.
+     */
+    public class PodStore
+    {
+        private const int InitialCapacity = 64;
+        internal int[] _ids;
+        internal PodState[] _states;
+        internal PodState[] _lastStatesBeforeDeleted;
+        internal double[] _podCores;
+        internal int[] _hostRoleIds;
+        internal PodLifeCycleTimestamps[] _lifeCycles;
+        // state list links (-1 at the ends), _isInStateList guards against adding a pod to two lists
+        internal int[] _previousInState;
+        internal int[] _nextInState;
+        internal bool[] _isInStateList;
+        private int _usedSlots;
+        private readonly Stack<int> _freeSlots;
+
+        public PodStore()
+        {
+            _ids = new int[InitialCapacity];
+            _states = new PodState[InitialCapacity];
+            _lastStatesBeforeDeleted = new PodState[InitialCapacity];
+            _podCores = new double[InitialCapacity];
+            _hostRoleIds = new int[InitialCapacity];
+            _lifeCycles = new PodLifeCycleTimestamps[InitialCapacity];
+            _previousInState = new int[InitialCapacity];
+            _nextInState = new int[InitialCapacity];
+            _isInStateList = new bool[InitialCapacity];
+            _usedSlots = 0;
+            _freeSlots = new Stack<int>();
+        }
+
+        // slots holding a pod, live or recycled
+        public int Count
+        {
+            get { return _usedSlots - _freeSlots.Count; }
+        }
+
+        internal int Add(int podId, double podCores, int hostRoleId, PodLifeCycleTimestamps lifeCycle)
+        {
+            if (!_freeSlots.TryPop(out int slot))
+            {
+                if (_usedSlots == _ids.Length)
+                {
+                    Grow(2 * _ids.Length);
+                }
+                slot = _usedSlots;
+                _usedSlots++;
+            }
+            _ids[slot] = podId;
+            _states[slot] = PodState.Created;
+            _lastStatesBeforeDeleted[slot] = PodState.Created;
+            _podCores[slot] = podCores;
+            _hostRoleIds[slot] = hostRoleId;
+            _lifeCycles[slot] = lifeCycle;
+            _previousInState[slot] = -1;
+            _nextInState[slot] = -1;
+            _isInStateList[slot] = false;
+            return slot;
+        }
+
+        // the slot is reused by the next pod, events still scheduled for the released pod are recognized by its id
+        internal void Release(int slot)
+        {
+            Debug.Assert(!_isInStateList[slot]);
+            _ids[slot] = -1;
+            _freeSlots.Push(slot);
+        }
+
+        internal bool IsLive(PodHandle pod)
+        {
+            return _ids[pod.Slot] == pod.Id;
+        }
+
+        private void Grow(int capacity)
+        {
+            Array.Resize(ref _ids, capacity);
+            Array.Resize(ref _states, capacity);
+            Array.Resize(ref _lastStatesBeforeDeleted, capacity);
+            Array.Resize(ref _podCores, capacity);
+            Array.Resize(ref _hostRoleIds, capacity);
+            Array.Resize(ref _lifeCycles, capacity);
+            Array.Resize(ref _previousInState, capacity);
+            Array.Resize(ref _nextInState, capacity);
+            Array.Resize(ref _isInStateList, capacity);
+        }
+
+        public void AdjustCores(int slot, double newCores)
+        {
+            Debug.Assert(_podCores[slot] >= newCores);
+            _podCores[slot] = newCores;
+        }
+
+        public PodLifeCycleTimestamps GetRealLifeCycle(int slot, double now)
+        {
+            ref readonly PodLifeCycleTimestamps lifeCycle = ref _lifeCycles[slot];
             PodLifeCycleTimestamps realLifeCycle = new PodLifeCycleTimestamps(
-                LifeCycleTimestamps._timePointCreation
+                lifeCycle._timePointCreation
             );
 
-            switch (_myState)
+            switch (_states[slot])
             {
                 case PodState.Created:
-                    realLifeCycle._durationCreation = _clock.Now - LifeCycleTimestamps._timePointCreation;
+                    realLifeCycle._durationCreation = now - lifeCycle._timePointCreation;
                     break;
                 case PodState.Pending:
-                    realLifeCycle._durationCreation = LifeCycleTimestamps._durationCreation;
-                    double timePointPending = LifeCycleTimestamps.GetTransitionEndTimePoint(PodState.Created);
-                    Debug.Assert(_clock.Now >= timePointPending);
-                    realLifeCycle._durationPending = _clock.Now - timePointPending;
+                    realLifeCycle._durationCreation = lifeCycle._durationCreation;
+                    double timePointPending = lifeCycle.GetTransitionEndTimePoint(PodState.Created);
+                    Debug.Assert(now >= timePointPending);
+                    realLifeCycle._durationPending = now - timePointPending;
                     break;
                 case PodState.Ready:
-                    realLifeCycle._durationCreation = LifeCycleTimestamps._durationCreation;
-                    realLifeCycle._durationPending = LifeCycleTimestamps._durationPending;
-                    double timePointReady = LifeCycleTimestamps.GetTransitionEndTimePoint(PodState.Pending);
-                    Debug.Assert(_clock.Now >= timePointReady);
-                    realLifeCycle._durationReady = _clock.Now - timePointReady;
+                    realLifeCycle._durationCreation = lifeCycle._durationCreation;
+                    realLifeCycle._durationPending = lifeCycle._durationPending;
+                    double timePointReady = lifeCycle.GetTransitionEndTimePoint(PodState.Pending);
+                    Debug.Assert(now >= timePointReady);
+                    realLifeCycle._durationReady = now - timePointReady;
                     break;
                 case PodState.Allocated:
-                    realLifeCycle._durationCreation = LifeCycleTimestamps._durationCreation;
-                    realLifeCycle._durationPending = LifeCycleTimestamps._durationPending;
-                    realLifeCycle._durationReady = LifeCycleTimestamps._durationReady;
-                    double timePointAllocated = LifeCycleTimestamps.GetTransitionEndTimePoint(PodState.Ready);
-                    Debug.Assert(_clock.Now >= timePointAllocated);
-                    realLifeCycle._durationAllocated = _clock.Now - timePointAllocated;
+                    realLifeCycle._durationCreation = lifeCycle._durationCreation;
+                    realLifeCycle._durationPending = lifeCycle._durationPending;
+                    realLifeCycle._durationReady = lifeCycle._durationReady;
+                    double timePointAllocated = lifeCycle.GetTransitionEndTimePoint(PodState.Ready);
+                    Debug.Assert(now >= timePointAllocated);
+                    realLifeCycle._durationAllocated = now - timePointAllocated;
                     break;
                 case PodState.Specialized:
-                    realLifeCycle._durationCreation = LifeCycleTimestamps._durationCreation;
-                    realLifeCycle._durationPending = LifeCycleTimestamps._durationPending;
-                    realLifeCycle._durationReady = LifeCycleTimestamps._durationReady;
-                    realLifeCycle._durationAllocated = LifeCycleTimestamps._durationAllocated;
-                    double timePointSpecialized = LifeCycleTimestamps.GetTransitionEndTimePoint(PodState.Allocated);
-                    Debug.Assert(_clock.Now >= timePointSpecialized);
-                    realLifeCycle._durationSpecialized = _clock.Now - timePointSpecialized;
+                    realLifeCycle._durationCreation = lifeCycle._durationCreation;
+                    realLifeCycle._durationPending = lifeCycle._durationPending;
+                    realLifeCycle._durationReady = lifeCycle._durationReady;
+                    realLifeCycle._durationAllocated = lifeCycle._durationAllocated;
+                    double timePointSpecialized = lifeCycle.GetTransitionEndTimePoint(PodState.Allocated);
+                    Debug.Assert(now >= timePointSpecialized);
+                    realLifeCycle._durationSpecialized = now - timePointSpecialized;
                     break;
                 case PodState.UserWorkload:
-                    realLifeCycle._durationCreation = LifeCycleTimestamps._durationCreation;
-                    realLifeCycle._durationPending = LifeCycleTimestamps._durationPending;
-                    realLifeCycle._durationReady = LifeCycleTimestamps._durationReady;
-                    realLifeCycle._durationAllocated = LifeCycleTimestamps._durationAllocated;
-                    realLifeCycle._durationSpecialized = LifeCycleTimestamps._durationSpecialized;
-                    double _timePointUserWorkload = LifeCycleTimestamps.GetTransitionEndTimePoint(PodState.Specialized);
-                    Debug.Assert(_clock.Now >= _timePointUserWorkload);
-                    realLifeCycle._durationUserWorkload = _clock.Now - _timePointUserWorkload;
+                    realLifeCycle._durationCreation = lifeCycle._durationCreation;
+                    realLifeCycle._durationPending = lifeCycle._durationPending;
+                    realLifeCycle._durationReady = lifeCycle._durationReady;
+                    realLifeCycle._durationAllocated = lifeCycle._durationAllocated;
+                    realLifeCycle._durationSpecialized = lifeCycle._durationSpecialized;
+                    double _timePointUserWorkload = lifeCycle.GetTransitionEndTimePoint(PodState.Specialized);
+                    Debug.Assert(now >= _timePointUserWorkload);
+                    realLifeCycle._durationUserWorkload = now - _timePointUserWorkload;
                     break;
                 case PodState.Deleted:
-                    realLifeCycle._durationCreation = LifeCycleTimestamps._durationCreation;
-                    realLifeCycle._durationPending = LifeCycleTimestamps._durationPending;
-                    realLifeCycle._durationReady = LifeCycleTimestamps._durationReady;
-                    realLifeCycle._durationAllocated = LifeCycleTimestamps._durationAllocated;
-                    realLifeCycle._durationSpecialized = LifeCycleTimestamps._durationSpecialized;
-                    realLifeCycle._durationUserWorkload = LifeCycleTimestamps._durationUserWorkload;
-                    double _timePointDeleted = LifeCycleTimestamps.GetTransitionEndTimePoint(PodState.UserWorkload);
-                    Debug.Assert(_clock.Now >= _timePointDeleted);
-                    realLifeCycle._durationDeleted = _clock.Now - _timePointDeleted;
+                    realLifeCycle._durationCreation = lifeCycle._durationCreation;
+                    realLifeCycle._durationPending = lifeCycle._durationPending;
+                    realLifeCycle._durationReady = lifeCycle._durationReady;
+                    realLifeCycle._durationAllocated = lifeCycle._durationAllocated;
+                    realLifeCycle._durationSpecialized = lifeCycle._durationSpecialized;
+                    realLifeCycle._durationUserWorkload = lifeCycle._durationUserWorkload;
+                    double _timePointDeleted = lifeCycle.GetTransitionEndTimePoint(PodState.UserWorkload);
+                    Debug.Assert(now >= _timePointDeleted);
+                    realLifeCycle._durationDeleted = now - _timePointDeleted;
                     break;
                 case PodState.BeingRecycled:
-                    realLifeCycle._durationCreation = LifeCycleTimestamps._durationCreation;
-                    realLifeCycle._durationPending = LifeCycleTimestamps._durationPending;
-                    realLifeCycle._durationReady = LifeCycleTimestamps._durationReady;
-                    realLifeCycle._durationAllocated = LifeCycleTimestamps._durationAllocated;
-                    realLifeCycle._durationSpecialized = LifeCycleTimestamps._durationSpecialized;
-                    realLifeCycle._durationUserWorkload = LifeCycleTimestamps._durationUserWorkload;
-                    realLifeCycle._durationDeleted = LifeCycleTimestamps._durationDeleted;
-                    double _timePointRecycledStart = LifeCycleTimestamps.GetTransitionEndTimePoint(PodState.Deleted);
-                    Debug.Assert(_clock.Now >= _timePointRecycledStart);
-                    realLifeCycle._durationRecyclingVm = _clock.Now - _timePointRecycledStart;
+                    realLifeCycle._durationCreation = lifeCycle._durationCreation;
+                    realLifeCycle._durationPending = lifeCycle._durationPending;
+                    realLifeCycle._durationReady = lifeCycle._durationReady;
+                    realLifeCycle._durationAllocated = lifeCycle._durationAllocated;
+                    realLifeCycle._durationSpecialized = lifeCycle._durationSpecialized;
+                    realLifeCycle._durationUserWorkload = lifeCycle._durationUserWorkload;
+                    realLifeCycle._durationDeleted = lifeCycle._durationDeleted;
+                    double _timePointRecycledStart = lifeCycle.GetTransitionEndTimePoint(PodState.Deleted);
+                    Debug.Assert(now >= _timePointRecycledStart);
+                    realLifeCycle._durationRecyclingVm = now - _timePointRecycledStart;
                     break;
                 case PodState.Recycled:
-                    realLifeCycle = LifeCycleTimestamps;
+                    realLifeCycle = lifeCycle;
                     break;
                 default:
                     throw new ArgumentOutOfRangeException();
@@ -327,6 +469,5 @@ namespace ServerlessPoolOptimizer
 
             return realLifeCycle;
         }
-
     }
-}
\ No newline at end of file
+}
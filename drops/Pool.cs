@@ -87,20 +87,106 @@ namespace ServerlessPoolOptimizer
         }
     }
 
+    /*
+     *  Pods of a pool in one life cycle state, in the order they entered it. The list is linked through the state
+     *  links of the pod slots in the PodStore, so adding, removing and taking the oldest or newest pod are O(1)
+     *  and nothing is allocated on a transition.
+     */
+    public class PodStateList
+    {
+        private readonly PodStore _store;
+        private int _first;
+        private int _last;
+        private int _count;
+
+        public PodStateList(PodStore pStore)
+        {
+            _store = pStore;
+            _first = -1;
+            _last = -1;
+            _count = 0;
+        }
+
+        public int Count
+        {
+            get { return _count; }
+        }
+
+        public void Add(int slot)
+        {
+            Debug.Assert(!_store._isInStateList[slot]);
+            _store._isInStateList[slot] = true;
+            _store._previousInState[slot] = _last;
+            _store._nextInState[slot] = -1;
+            if (_last == -1)
+            {
+                _first = slot;
+            }
+            else
+            {
+                _store._nextInState[_last] = slot;
+            }
+            _last = slot;
+            _count++;
+        }
+
+        public void Remove(int slot)
+        {
+            Debug.Assert(_store._isInStateList[slot]);
+            int previous = _store._previousInState[slot];
+            int next = _store._nextInState[slot];
+            if (previous == -1)
+            {
+                _first = next;
+            }
+            else
+            {
+                _store._nextInState[previous] = next;
+            }
+            if (next == -1)
+            {
+                _last = previous;
+            }
+            else
+            {
+                _store._previousInState[next] = previous;
+            }
+            _store._isInStateList[slot] = false;
+            _count--;
+        }
+
+        // slot of the oldest pod in the state, -1 when empty
+        public int First()
+        {
+            return _first;
+        }
+
+        // slot of the newest pod in the state, -1 when empty
+        public int Last()
+        {
+            return _last;
+        }
+    }
+
     public class Pool
     {
         private readonly Simulator _simulator;
         private int _podIdCounter;
         public readonly PoolParameters _poolParameters;
-        private readonly List<Pod> _createdPodList;
-        private readonly List<Pod> _pendingPodList;
-        private readonly List<Pod> _readyPodList;
-        private readonly List<Pod> _allocatedPodList;
-        private readonly List<Pod> _specializedPodList;
-        private readonly List<Pod> _userWorkloadPodList;
-        private readonly List<Pod> _deletedPodList;
-        private readonly List<Pod> _beingRecycledPodList;
-        private readonly List<Pod> _recycledPodList;
+        // index of the pool in its pool group, carried by the handles of its pods
+        public int PoolIndex;
+        private readonly PodStore _pods;
+        private readonly PodStateList _createdPodList;
+        private readonly PodStateList _pendingPodList;
+        private readonly PodStateList _readyPodList;
+        private readonly PodStateList _allocatedPodList;
+        private readonly PodStateList _specializedPodList;
+        private readonly PodStateList _userWorkloadPodList;
+        private readonly PodStateList _deletedPodList;
+        private readonly PodStateList _beingRecycledPodList;
+        private readonly PodStateList _recycledPodList;
+        // recycled pods that were released instead of kept in _recycledPodList (see Experiment.ReclaimTerminalObjects)
+        private int _reclaimedPodsCount;
         private readonly ISimulationTimeReader _clock;
         private readonly Experiment _experiment;
         public PoolStatistics PoolStatistics;
@@ -108,6 +194,8 @@ namespace ServerlessPoolOptimizer
         public PoolLabel PoolLabel;
         public int PredictionWindowCurrentIdx;
         public int OptimalPoolSizeWindowCurrentIdx;
+        // life cycle stream of the pool when the experiment has a simulation seed
+        private readonly Random? _lifeCycleRandom;
         public event EventHandler<SimEvent> FireSchedulePodStateTransitionAt;
 
         public Pool(ISimulationTimeReader pSimulationTimeReaderdouble,
@@ -127,17 +215,24 @@ namespace ServerlessPoolOptimizer
             RequestQueue = new RequestQueue(pSimulationTimeReaderdouble);
             _clock = pSimulationTimeReaderdouble;
             _poolParameters = pPoolParameters;
-            _createdPodList = new List<Pod>();
-            _pendingPodList = new List<Pod>();
-            _readyPodList = new List<Pod>();
-            _allocatedPodList = new List<Pod>();
-            _specializedPodList = new List<Pod>();
-            _userWorkloadPodList = new List<Pod>();
-            _deletedPodList = new List<Pod>();
-            _beingRecycledPodList = new List<Pod>();
-            _recycledPodList = new List<Pod>();
+            PoolIndex = -1;
+            _pods = new PodStore();
+            _createdPodList = new PodStateList(_pods);
+            _pendingPodList = new PodStateList(_pods);
+            _readyPodList = new PodStateList(_pods);
+            _allocatedPodList = new PodStateList(_pods);
+            _specializedPodList = new PodStateList(_pods);
+            _userWorkloadPodList = new PodStateList(_pods);
+            _deletedPodList = new PodStateList(_pods);
+            _beingRecycledPodList = new PodStateList(_pods);
+            _recycledPodList = new PodStateList(_pods);
+            _reclaimedPodsCount = 0;
             PredictionWindowCurrentIdx = 0;
             OptimalPoolSizeWindowCurrentIdx = 0;
+            if (pExp.SimulationSeed != null)
+            {
+                _lifeCycleRandom = RandomSource.CreateStream(pExp.SimulationSeed.Value, PoolLabel.ToString());
+            }
         }
 
         public PodLifeCycleTimestamps GeneratePodLifeCycleFromDistributionsUsingMean(double timePointCreation)
@@ -176,7 +271,7 @@ namespace ServerlessPoolOptimizer
         public PodLifeCycleTimestamps GeneratePodLifeCycleFromDistributions(double timePointCreation)
         {
             Debug.Assert(_poolParameters._lifeCycleDistributions != null);
-            var lifeCycle = _poolParameters._lifeCycleDistributions.SampleLifeCycle();
+            var lifeCycle = _poolParameters._lifeCycleDistributions.SampleLifeCycle(_lifeCycleRandom);
             lifeCycle._durationReady = 0;
 
             if (_experiment.IgnorePodTransitionsExceptCreation)
@@ -205,9 +300,9 @@ namespace ServerlessPoolOptimizer
             return lifecycle2;
         }
 
-        public Pod CreatePod(int pHostRoleId, PodLifeCycleTimestamps? podLifeCycleTimestamps)
+        public PodHandle CreatePod(int pHostRoleId, PodLifeCycleTimestamps? podLifeCycleTimestamps)
         {
-            Debug.Assert(podLifeCycleTimestamps != null || _poolParameters._lifeCycleDistributions != null, "no lifecycle distributions for " + PoolLabel);
+            Validation.Check(podLifeCycleTimestamps != null || _poolParameters._lifeCycleDistributions != null, "no lifecycle distributions for {0}", PoolLabel);
             if (podLifeCycleTimestamps == null)
             {
                 switch (_experiment.SamplingApproach)
@@ -222,42 +317,46 @@ namespace ServerlessPoolOptimizer
                         throw new ArgumentOutOfRangeException();
                 }
             }
-            var newPod = new Pod(_clock, _podIdCounter, podLifeCycleTimestamps, _poolParameters.AllocationLabel, _poolParameters.Cores, pHostRoleId);
+            Debug.Assert(PoolIndex >= 0);
+            int slot = _pods.Add(_podIdCounter, _poolParameters.Cores, pHostRoleId, podLifeCycleTimestamps.Value);
+            _pods._lifeCycles[slot].Assert();
+            var newPod = new PodHandle(PoolIndex, slot, _podIdCounter);
             _podIdCounter++;
             return newPod;
         }
 
-        public Pod? AllocateOnePod(AllocationRequest request)
+        public PodHandle? AllocateOnePod(AllocationRequest request)
         {
-            foreach (var pod in _readyPodList)
+            // every pod in the ready list is Ready, the oldest one is allocated first
+            int slot = _readyPodList.First();
+            if (slot != -1)
             {
-                if (pod._myState == PodState.Ready)
-                {
-                    // pod.AdjustCores(request.Cores);
-                    double pendingEndTimePoint = pod.LifeCycleTimestamps.GetTransitionEndTimePoint(PodState.Pending);
-                    Debug.Assert(_clock.Now >= pendingEndTimePoint, String.Format("Event in the future: now = {0}, event time = {1}, PID = {2}, lifecycle: {3}",
-                                                                                        _clock.Now, pendingEndTimePoint, pod._id, pod.LifeCycleTimestamps));
-                    double readyDuration = _clock.Now - pendingEndTimePoint;
-                    Debug.Assert(readyDuration >= 0);
-                    pod.LifeCycleTimestamps._durationReady = readyDuration;
-                    HandlePodStateTransition(pod, PodState.Allocated);
-                    request.PodId = pod._id;
-                    PoolStatistics._totalRequestsCount++;
-                    PoolStatistics._windowRequestsCount++;
-
-                    if (_experiment.UseRequestsQueue && request.ArrivalTimePoint < _clock.Now)
-                    {
-                        PoolStatistics._windowFailedRequestsCount++;
-                        PoolStatistics._totalFailedRequestsCount++;
-                    }
-                    else
-                    {
-                        PoolStatistics._windowSucceededRequestsCount++;
-                        PoolStatistics._totalSucceededRequestsCount++;
-                    }
+                Debug.Assert(_pods._states[slot] == PodState.Ready);
+                // _pods.AdjustCores(slot, request.Cores);
+                double pendingEndTimePoint = _pods._lifeCycles[slot].GetTransitionEndTimePoint(PodState.Pending);
+                Validation.Check(_clock.Now >= pendingEndTimePoint, "Event in the future: now = {0}, event time = {1}, PID = {2}, lifecycle: {3}",
+                                                                                    _clock.Now, pendingEndTimePoint, _pods._ids[slot], _pods._lifeCycles[slot]);
+                double readyDuration = _clock.Now - pendingEndTimePoint;
+                Debug.Assert(readyDuration >= 0);
+                _pods._lifeCycles[slot]._durationReady = readyDuration;
+                var pod = GetHandle(slot);
+                HandlePodStateTransition(pod, PodState.Allocated);
+                request.PodId = pod.Id;
+                PoolStatistics._totalRequestsCount++;
+                PoolStatistics._windowRequestsCount++;
 
-                    return pod;
+                if (_experiment.UseRequestsQueue && request.ArrivalTimePoint < _clock.Now)
+                {
+                    PoolStatistics._windowFailedRequestsCount++;
+                    PoolStatistics._totalFailedRequestsCount++;
+                }
+                else
+                {
+                    PoolStatistics._windowSucceededRequestsCount++;
+                    PoolStatistics._totalSucceededRequestsCount++;
                 }
+
+                return pod;
             }
             if (_experiment.UseRequestsQueue == false)
             {
@@ -269,11 +368,23 @@ namespace ServerlessPoolOptimizer
             return null;
         }
 
-        public void SchedulePodDeletion(Pod pod)
+        private PodHandle GetHandle(int slot)
+        {
+            return new PodHandle(PoolIndex, slot, _pods._ids[slot]);
+        }
+
+        public void SchedulePodDeletion(PodHandle pod)
+        {
+            Debug.Assert(pod.PoolIndex == PoolIndex && _pods.IsLive(pod));
+            SchedulePodDeletion(pod.Slot);
+        }
+
+        private void SchedulePodDeletion(int slot)
         {
-            if (pod._myState == PodState.Ready || pod._myState == PodState.Pending || pod._myState == PodState.Created)
+            var state = _pods._states[slot];
+            if (state == PodState.Ready || state == PodState.Pending || state == PodState.Created)
             {
-                HandlePodStateTransition(pod, PodState.Deleted);
+                HandlePodStateTransition(GetHandle(slot), PodState.Deleted);
             }
         }
 
@@ -281,164 +392,158 @@ namespace ServerlessPoolOptimizer
         {
             int count = 0;
 
-            for (int i = _createdPodList.Count - 1; i >= 0; i--)
+            // the newest pod leaves the list when its deletion is scheduled
+            while (count < deletePodsCount && _createdPodList.Count > 0)
             {
-                Pod pod = _createdPodList[i];
-                if (count >= deletePodsCount)
-                {
-                    break;
-                }
-                SchedulePodDeletion(pod);
+                SchedulePodDeletion(_createdPodList.Last());
                 count++;
             }
 
             // delete pending pods first            
-            for (int i = _pendingPodList.Count - 1; i >= 0; i--)
+            while (count < deletePodsCount && _pendingPodList.Count > 0)
             {
-                Pod pod = _pendingPodList[i];
-                if (count >= deletePodsCount)
-                {
-                    break;
-                }
-                SchedulePodDeletion(pod);
+                SchedulePodDeletion(_pendingPodList.Last());
                 count++;
             }
             // delete ready pods 
-            for (int i = _readyPodList.Count - 1; i >= 0; i--)
+            while (count < deletePodsCount && _readyPodList.Count > 0)
             {
-                Pod pod = _readyPodList[i];
-                if (count >= deletePodsCount)
-                {
-                    break;
-                }
-                SchedulePodDeletion(pod);
+                SchedulePodDeletion(_readyPodList.Last());
                 count++;
             }
         }
 
-        private void AdjustPodLifeCycle(Pod pod, double realDeleteTimePoint)
+        private void AdjustPodLifeCycle(int slot, double realDeleteTimePoint)
         {
-            Debug.Assert(pod._lastStateBeforeDeleted == PodState.UserWorkload
-                            || pod._lastStateBeforeDeleted == PodState.Pending
-                            || pod._lastStateBeforeDeleted == PodState.Created
-                            || pod._lastStateBeforeDeleted == PodState.Ready);
+            Debug.Assert(_pods._lastStatesBeforeDeleted[slot] == PodState.UserWorkload
+                            || _pods._lastStatesBeforeDeleted[slot] == PodState.Pending
+                            || _pods._lastStatesBeforeDeleted[slot] == PodState.Created
+                            || _pods._lastStatesBeforeDeleted[slot] == PodState.Ready);
 
-            switch (pod._lastStateBeforeDeleted)
+            switch (_pods._lastStatesBeforeDeleted[slot])
             {
                 case PodState.UserWorkload:
                     // no changes needed
                     break;
                 case PodState.Created:
-                    double creationStartTimePoint = pod.LifeCycleTimestamps._timePointCreation;
+                    double creationStartTimePoint = _pods._lifeCycles[slot]._timePointCreation;
                     Debug.Assert(SimulationTime.Round(creationStartTimePoint) <= SimulationTime.Round(realDeleteTimePoint));
                     double spentInCreation = realDeleteTimePoint - creationStartTimePoint;
-                    pod.LifeCycleTimestamps._durationCreation = spentInCreation;
-                    pod.LifeCycleTimestamps._durationPending = 0;
-                    pod.LifeCycleTimestamps._durationReady = 0;
-                    pod.LifeCycleTimestamps._durationAllocated = 0;
-                    pod.LifeCycleTimestamps._durationSpecialized = 0;
-                    pod.LifeCycleTimestamps._durationUserWorkload = 0;
+                    _pods._lifeCycles[slot]._durationCreation = spentInCreation;
+                    _pods._lifeCycles[slot]._durationPending = 0;
+                    _pods._lifeCycles[slot]._durationReady = 0;
+                    _pods._lifeCycles[slot]._durationAllocated = 0;
+                    _pods._lifeCycles[slot]._durationSpecialized = 0;
+                    _pods._lifeCycles[slot]._durationUserWorkload = 0;
                     break;
                 case PodState.Pending:
-                    double pendingStartTimePoint = pod.LifeCycleTimestamps.GetTransitionEndTimePoint(PodState.Created);
-                    double pendingEndTimePoint = pod.LifeCycleTimestamps.GetTransitionEndTimePoint(PodState.Pending);
+                    double pendingStartTimePoint = _pods._lifeCycles[slot].GetTransitionEndTimePoint(PodState.Created);
+                    double pendingEndTimePoint = _pods._lifeCycles[slot].GetTransitionEndTimePoint(PodState.Pending);
                     Debug.Assert(SimulationTime.Round(pendingEndTimePoint) >= SimulationTime.Round(realDeleteTimePoint));
                     Debug.Assert(SimulationTime.Round(pendingStartTimePoint) <= SimulationTime.Round(realDeleteTimePoint));
                     double spentInPending = realDeleteTimePoint - pendingStartTimePoint;
-                    pod.LifeCycleTimestamps._durationPending = spentInPending;
-                    pod.LifeCycleTimestamps._durationReady = 0;
-                    pod.LifeCycleTimestamps._durationAllocated = 0;
-                    pod.LifeCycleTimestamps._durationSpecialized = 0;
-                    pod.LifeCycleTimestamps._durationUserWorkload = 0;
+                    _pods._lifeCycles[slot]._durationPending = spentInPending;
+                    _pods._lifeCycles[slot]._durationReady = 0;
+                    _pods._lifeCycles[slot]._durationAllocated = 0;
+                    _pods._lifeCycles[slot]._durationSpecialized = 0;
+                    _pods._lifeCycles[slot]._durationUserWorkload = 0;
                     break;
                 case PodState.Ready:
-                    double readyStartTimePoint = pod.LifeCycleTimestamps.GetTransitionEndTimePoint(PodState.Pending);
-                    pod.LifeCycleTimestamps._durationReady = realDeleteTimePoint - readyStartTimePoint;
+                    double readyStartTimePoint = _pods._lifeCycles[slot].GetTransitionEndTimePoint(PodState.Pending);
+                    _pods._lifeCycles[slot]._durationReady = realDeleteTimePoint - readyStartTimePoint;
                     double spentInReady = realDeleteTimePoint - readyStartTimePoint;
-                    pod.LifeCycleTimestamps._durationReady = spentInReady;
-                    pod.LifeCycleTimestamps._durationAllocated = 0;
-                    pod.LifeCycleTimestamps._durationSpecialized = 0;
-                    pod.LifeCycleTimestamps._durationUserWorkload = 0;
+                    _pods._lifeCycles[slot]._durationReady = spentInReady;
+                    _pods._lifeCycles[slot]._durationAllocated = 0;
+                    _pods._lifeCycles[slot]._durationSpecialized = 0;
+                    _pods._lifeCycles[slot]._durationUserWorkload = 0;
                     break;
                 default:
                     throw new ArgumentOutOfRangeException();
             }
         }
 
-        public void HandlePodStateTransition(Pod pod, PodState nextState)
+        public void HandlePodStateTransition(PodHandle pod, PodState nextState)
         {
+            Debug.Assert(pod.PoolIndex == PoolIndex);
+            if (!_pods.IsLive(pod))
+            {
+                // the pod was recycled and its slot released, only transitions scheduled before it was deleted remain
+                Debug.Assert(nextState == PodState.Pending || nextState == PodState.Ready);
+                return;
+            }
+            int slot = pod.Slot;
             SimEvent? nextEvent;
             switch (nextState)
             {
                 case PodState.Created:
-                    Debug.Assert(pod._myState == PodState.Created);
-                    _createdPodList.Add(pod);
-                    double pendingTimePoint = pod.LifeCycleTimestamps.GetTransitionEndTimePoint(nextState);
+                    Debug.Assert(_pods._states[slot] == PodState.Created);
+                    _createdPodList.Add(slot);
+                    double pendingTimePoint = _pods._lifeCycles[slot].GetTransitionEndTimePoint(nextState);
                     nextEvent = _simulator.CreateEvent(EventType.PodBecomesPending, _clock.Now, pendingTimePoint, null, null, pod);
                     FireSchedulePodStateTransitionAt(this, nextEvent);
                     break;
 
                 case PodState.Pending:
-                    Debug.Assert(pod._myState == PodState.Deleted
-                                    || pod._myState == PodState.BeingRecycled
-                                    || pod._myState == PodState.Recycled
-                                    || pod._myState == PodState.Created);
+                    Debug.Assert(_pods._states[slot] == PodState.Deleted
+                                    || _pods._states[slot] == PodState.BeingRecycled
+                                    || _pods._states[slot] == PodState.Recycled
+                                    || _pods._states[slot] == PodState.Created);
 
-                    if (pod._myState != PodState.Created)
+                    if (_pods._states[slot] != PodState.Created)
                     {
                         return;
                     }
 
-                    _createdPodList.Remove(pod);
-                    _pendingPodList.Add(pod);
-                    double readyTimePoint = pod.LifeCycleTimestamps.GetTransitionEndTimePoint(nextState);
+                    _createdPodList.Remove(slot);
+                    _pendingPodList.Add(slot);
+                    double readyTimePoint = _pods._lifeCycles[slot].GetTransitionEndTimePoint(nextState);
                     nextEvent = _simulator.CreateEvent(EventType.PodBecomesReady, _clock.Now, readyTimePoint, null, null, pod);
                     FireSchedulePodStateTransitionAt(this, nextEvent);
                     break;
 
                 case PodState.Ready:
                     // a pod can be deleted while in Pending state and Ready transition already scheduled
-                    Debug.Assert(pod._myState == PodState.Pending
-                                    || pod._myState == PodState.Deleted
-                                    || pod._myState == PodState.BeingRecycled
-                                    || pod._myState == PodState.Recycled);
+                    Debug.Assert(_pods._states[slot] == PodState.Pending
+                                    || _pods._states[slot] == PodState.Deleted
+                                    || _pods._states[slot] == PodState.BeingRecycled
+                                    || _pods._states[slot] == PodState.Recycled);
 
-                    if (pod._myState != PodState.Pending) { return; }
-                    var readyStartTimePoint = pod.LifeCycleTimestamps.GetTransitionEndTimePoint(PodState.Pending);
+                    if (_pods._states[slot] != PodState.Pending) { return; }
+                    var readyStartTimePoint = _pods._lifeCycles[slot].GetTransitionEndTimePoint(PodState.Pending);
                     Debug.Assert(_clock.Now >= readyStartTimePoint);
-                    _pendingPodList.Remove(pod);
-                    _readyPodList.Add(pod);
+                    _pendingPodList.Remove(slot);
+                    _readyPodList.Add(slot);
                     break;
 
                 case PodState.Allocated:
                     // a pod can be deleted while in Ready state and Allocated transition already scehduled
-                    Debug.Assert(pod._myState == PodState.Ready
-                                    || pod._myState == PodState.Deleted
-                                    || pod._myState == PodState.BeingRecycled
-                                    || pod._myState == PodState.Recycled);
-
-                    if (pod._myState != PodState.Ready) { return; }
-                    _readyPodList.Remove(pod);
-                    _allocatedPodList.Add(pod);
-                    double specializedTimePoint = pod.LifeCycleTimestamps.GetTransitionEndTimePoint(nextState);
+                    Debug.Assert(_pods._states[slot] == PodState.Ready
+                                    || _pods._states[slot] == PodState.Deleted
+                                    || _pods._states[slot] == PodState.BeingRecycled
+                                    || _pods._states[slot] == PodState.Recycled);
+
+                    if (_pods._states[slot] != PodState.Ready) { return; }
+                    _readyPodList.Remove(slot);
+                    _allocatedPodList.Add(slot);
+                    double specializedTimePoint = _pods._lifeCycles[slot].GetTransitionEndTimePoint(nextState);
                     nextEvent = _simulator.CreateEvent(EventType.PodBecomesSpecialized, _clock.Now, specializedTimePoint, null, null, pod);
                     FireSchedulePodStateTransitionAt(this, nextEvent);
                     break;
 
                 case PodState.Specialized:
-                    Debug.Assert(pod._myState == PodState.Allocated);
-                    _allocatedPodList.Remove(pod);
-                    _specializedPodList.Add(pod);
-                    double userWorkloadStartTimePoint = pod.LifeCycleTimestamps.GetTransitionEndTimePoint(nextState);
+                    Debug.Assert(_pods._states[slot] == PodState.Allocated);
+                    _allocatedPodList.Remove(slot);
+                    _specializedPodList.Add(slot);
+                    double userWorkloadStartTimePoint = _pods._lifeCycles[slot].GetTransitionEndTimePoint(nextState);
                     nextEvent = _simulator.CreateEvent(EventType.PodRunningUserWorkload, _clock.Now, userWorkloadStartTimePoint, null, null, pod);
                     FireSchedulePodStateTransitionAt(this, nextEvent);
                     break;
 
                 case PodState.UserWorkload:
-                    Debug.Assert(pod._myState == PodState.Specialized);
-                    _specializedPodList.Remove(pod);
-                    _userWorkloadPodList.Add(pod);
-                    double deletedTimePoint = pod.LifeCycleTimestamps.GetTransitionEndTimePoint(nextState);
+                    Debug.Assert(_pods._states[slot] == PodState.Specialized);
+                    _specializedPodList.Remove(slot);
+                    _userWorkloadPodList.Add(slot);
+                    double deletedTimePoint = _pods._lifeCycles[slot].GetTransitionEndTimePoint(nextState);
                     nextEvent = _simulator.CreateEvent(EventType.PodBecomesDeleted, _clock.Now, deletedTimePoint, null, null, pod);
                     if (_experiment.RecyclePodsSimulatorFlag)
                     {
@@ -447,64 +552,112 @@ namespace ServerlessPoolOptimizer
                     break;
 
                 case PodState.Deleted:
-                    Debug.Assert(pod._myState == PodState.UserWorkload
-                                || pod._myState == PodState.Pending
-                                || pod._myState == PodState.Created
-                                || pod._myState == PodState.Ready);
-                    switch (pod._myState)
+                    Debug.Assert(_pods._states[slot] == PodState.UserWorkload
+                                || _pods._states[slot] == PodState.Pending
+                                || _pods._states[slot] == PodState.Created
+                                || _pods._states[slot] == PodState.Ready);
+                    switch (_pods._states[slot])
                     {
                         case PodState.UserWorkload:
-                            _userWorkloadPodList.Remove(pod);
-                            pod._lastStateBeforeDeleted = PodState.UserWorkload;
+                            _userWorkloadPodList.Remove(slot);
+                            _pods._lastStatesBeforeDeleted[slot] = PodState.UserWorkload;
                             break;
                         case PodState.Pending:
-                            _pendingPodList.Remove(pod);
-                            pod._lastStateBeforeDeleted = PodState.Pending;
-                            AdjustPodLifeCycle(pod, _clock.Now);
+                            _pendingPodList.Remove(slot);
+                            _pods._lastStatesBeforeDeleted[slot] = PodState.Pending;
+                            AdjustPodLifeCycle(slot, _clock.Now);
                             break;
                         case PodState.Created:
-                            _createdPodList.Remove(pod);
-                            pod._lastStateBeforeDeleted = PodState.Created;
-                            AdjustPodLifeCycle(pod, _clock.Now);
+                            _createdPodList.Remove(slot);
+                            _pods._lastStatesBeforeDeleted[slot] = PodState.Created;
+                            AdjustPodLifeCycle(slot, _clock.Now);
                             break;
                         case PodState.Ready:
-                            _readyPodList.Remove(pod);
-                            pod._lastStateBeforeDeleted = PodState.Ready;
-                            AdjustPodLifeCycle(pod, _clock.Now);
+                            _readyPodList.Remove(slot);
+                            _pods._lastStatesBeforeDeleted[slot] = PodState.Ready;
+                            AdjustPodLifeCycle(slot, _clock.Now);
                             break;
                         default:
                             throw new ArgumentOutOfRangeException();
                     }
-                    _deletedPodList.Add(pod);
-                    double recyclingStartTimePoint = pod.LifeCycleTimestamps.GetTransitionEndTimePoint(nextState);
+                    _deletedPodList.Add(slot);
+                    double recyclingStartTimePoint = _pods._lifeCycles[slot].GetTransitionEndTimePoint(nextState);
                     nextEvent = _simulator.CreateEvent(EventType.PodRecyclingStarts, _clock.Now, recyclingStartTimePoint, null, null, pod);
                     FireSchedulePodStateTransitionAt(this, nextEvent);
                     break;
 
                 case PodState.BeingRecycled:
-                    Debug.Assert(pod._myState == PodState.Deleted);
-                    _deletedPodList.Remove(pod);
-                    _beingRecycledPodList.Add(pod);
-                    double recyclingCompletesTimePoint = pod.LifeCycleTimestamps.GetTransitionEndTimePoint(nextState);
+                    Debug.Assert(_pods._states[slot] == PodState.Deleted);
+                    _deletedPodList.Remove(slot);
+                    _beingRecycledPodList.Add(slot);
+                    double recyclingCompletesTimePoint = _pods._lifeCycles[slot].GetTransitionEndTimePoint(nextState);
                     nextEvent = _simulator.CreateEvent(EventType.PodBecomesRecycled, _clock.Now, recyclingCompletesTimePoint, null, null, pod);
                     FireSchedulePodStateTransitionAt(this, nextEvent);
                     break;
 
                 case PodState.Recycled:
-                    Debug.Assert(pod._myState == PodState.BeingRecycled);
-                    _beingRecycledPodList.Remove(pod);
-                    _recycledPodList.Add(pod);
+                    Debug.Assert(_pods._states[slot] == PodState.BeingRecycled);
+                    _beingRecycledPodList.Remove(slot);
+                    if (_experiment.ReclaimTerminalObjects)
+                    {
+                        _reclaimedPodsCount++;
+                    }
+                    else
+                    {
+                        _recycledPodList.Add(slot);
+                    }
                     break;
 
                 default:
                     throw new ArgumentOutOfRangeException();
             }
-            pod._myState = nextState;
-            pod.LifeCycleTimestamps.Assert();
-            pod.LifeCycleTimestamps.AssertLifeCycle();
-            AssertPodCounters();
+            _pods._states[slot] = nextState;
+            if (Validation.ShouldCheck())
+            {
+                _pods._lifeCycles[slot].Assert();
+                _pods._lifeCycles[slot].AssertLifeCycle();
+                AssertPodCounters();
+            }
+        }
+
+
+        internal ref PodLifeCycleTimestamps GetPodLifeCycle(PodHandle pod)
+        {
+            Debug.Assert(pod.PoolIndex == PoolIndex && _pods.IsLive(pod));
+            return ref _pods._lifeCycles[pod.Slot];
+        }
+
+        internal PodLifeCycleTimestamps GetRealPodLifeCycle(PodHandle pod)
+        {
+            Debug.Assert(pod.PoolIndex == PoolIndex && _pods.IsLive(pod));
+            return _pods.GetRealLifeCycle(pod.Slot, _clock.Now);
+        }
+
+        internal PodState GetPodState(PodHandle pod)
+        {
+            Debug.Assert(pod.PoolIndex == PoolIndex && _pods.IsLive(pod));
+            return _pods._states[pod.Slot];
+        }
+
+        internal double GetPodCores(PodHandle pod)
+        {
+            Debug.Assert(pod.PoolIndex == PoolIndex && _pods.IsLive(pod));
+            return _pods._podCores[pod.Slot];
         }
 
+        internal int GetPodHostRoleId(PodHandle pod)
+        {
+            Debug.Assert(pod.PoolIndex == PoolIndex && _pods.IsLive(pod));
+            return _pods._hostRoleIds[pod.Slot];
+        }
+
+        // releases the slot of a recycled pod that was reclaimed (see Experiment.ReclaimTerminalObjects)
+        internal void ReleasePod(PodHandle pod)
+        {
+            Debug.Assert(pod.PoolIndex == PoolIndex && _pods.IsLive(pod));
+            Debug.Assert(_pods._states[pod.Slot] == PodState.Recycled);
+            _pods.Release(pod.Slot);
+        }
 
         public int GetExtraPodsCount()
         {
@@ -523,38 +676,43 @@ namespace ServerlessPoolOptimizer
 
         public int GetReadyPodsCount()
         {
-            return _readyPodList.Count();
+            return _readyPodList.Count;
         }
 
         public int GetAlivePodsCount()
         {
-            return _podIdCounter - _deletedPodList.Count() - _beingRecycledPodList.Count() - _recycledPodList.Count() - _createdPodList.Count() - _pendingPodList.Count();
+            return _podIdCounter - _deletedPodList.Count - _beingRecycledPodList.Count - GetRecycledPodsCount() - _createdPodList.Count - _pendingPodList.Count;
         }
 
         public double GetTotalCores()
         {
-            int podsCount = _podIdCounter - _recycledPodList.Count();
+            int podsCount = _podIdCounter - GetRecycledPodsCount();
             return podsCount * _poolParameters.Cores;
         }
 
         public double GetUserAllocatedCores()
         {
-            int podsCount = _allocatedPodList.Count() + _specializedPodList.Count() + _userWorkloadPodList.Count();
+            int podsCount = _allocatedPodList.Count + _specializedPodList.Count + _userWorkloadPodList.Count;
             return podsCount * _poolParameters.Cores;
         }
 
         public int GetUserAllocatedPodsCount()
         {
-            return _allocatedPodList.Count() + _specializedPodList.Count() + _userWorkloadPodList.Count();
+            return _allocatedPodList.Count + _specializedPodList.Count + _userWorkloadPodList.Count;
         }
 
         public int GetFreePodsCount()
         {
-            return _createdPodList.Count() + _pendingPodList.Count() + _readyPodList.Count();
+            return _createdPodList.Count + _pendingPodList.Count + _readyPodList.Count;
         }
         public int GetPoolSize()
         {
-            return _createdPodList.Count() + _pendingPodList.Count() + _readyPodList.Count();
+            return _createdPodList.Count + _pendingPodList.Count + _readyPodList.Count;
+        }
+
+        public int GetRecycledPodsCount()
+        {
+            return _recycledPodList.Count + _reclaimedPodsCount;
         }
 
         public int GetTotalCreatedPodsCount()
@@ -570,7 +728,8 @@ namespace ServerlessPoolOptimizer
                         "p-pending", "p-ready", "p-allocated", "p-specialized", "p-user", "p-deleted", "p-being-recycled", "p-recycled");
         }
 
-        public string GetStats(bool collectWindowStats = true)
+        // adds the pool columns to the current stats row, the window counters are still reset without a writer
+        public void AddStats(StatsWriter? statsWriter, bool collectWindowStats = true)
         {
             PoolStatistics.AssertRequestsCounters();
             var utilization = 100.0;
@@ -593,33 +752,35 @@ namespace ServerlessPoolOptimizer
                 PoolStatistics._windowFailedRequestsCount = 0;
                 PoolStatistics._windowSucceededRequestsCount = 0;
             }
-            var str = String.Format("{0:0.00},{1},{2},{3},{4},{5},{6},{7},{8},{9},{10},{11},{12},{13}",
-                            utilization, windowRequestCount, windowSucceededRequestsCount,
-                            windowFailedRequestsCount, _poolParameters._minPodsCount, _createdPodList.Count(),
-                            _pendingPodList.Count(), _readyPodList.Count(), _allocatedPodList.Count(),
-                            _specializedPodList.Count(), _userWorkloadPodList.Count(), _deletedPodList.Count(),
-                            _beingRecycledPodList.Count(), _recycledPodList.Count());
-
-            return str;
+            if (statsWriter == null)
+            {
+                return;
+            }
+            statsWriter.AddFixedPoint(utilization);
+            statsWriter.Add(windowRequestCount);
+            statsWriter.Add(windowSucceededRequestsCount);
+            statsWriter.Add(windowFailedRequestsCount);
+            statsWriter.Add(_poolParameters._minPodsCount);
+            statsWriter.Add(_createdPodList.Count);
+            statsWriter.Add(_pendingPodList.Count);
+            statsWriter.Add(_readyPodList.Count);
+            statsWriter.Add(_allocatedPodList.Count);
+            statsWriter.Add(_specializedPodList.Count);
+            statsWriter.Add(_userWorkloadPodList.Count);
+            statsWriter.Add(_deletedPodList.Count);
+            statsWriter.Add(_beingRecycledPodList.Count);
+            statsWriter.Add(GetRecycledPodsCount());
         }
 
         public void AssertPodCounters()
         {
-            double total = _createdPodList.Count() + _pendingPodList.Count() + _readyPodList.Count()
-                            + _allocatedPodList.Count() + _specializedPodList.Count()
-                            + _userWorkloadPodList.Count() + _deletedPodList.Count()
-                            + _beingRecycledPodList.Count() + _recycledPodList.Count();
-
-            Debug.Assert(_createdPodList.Count() >= 0);
-            Debug.Assert(_pendingPodList.Count() >= 0);
-            Debug.Assert(_readyPodList.Count() >= 0);
-            Debug.Assert(_allocatedPodList.Count() >= 0);
-            Debug.Assert(_specializedPodList.Count() >= 0);
-            Debug.Assert(_userWorkloadPodList.Count() >= 0);
-            Debug.Assert(_deletedPodList.Count() >= 0);
-            Debug.Assert(_beingRecycledPodList.Count() >= 0);
-            Debug.Assert(_recycledPodList.Count() >= 0);
-            Debug.Assert(total == _podIdCounter);
+            int total = _createdPodList.Count + _pendingPodList.Count + _readyPodList.Count
+                            + _allocatedPodList.Count + _specializedPodList.Count
+                            + _userWorkloadPodList.Count + _deletedPodList.Count
+                            + _beingRecycledPodList.Count + GetRecycledPodsCount();
+
+            Validation.Check(total == _podIdCounter, "pod state lists of {0} hold {1} pods, {2} were created",
+                                PoolLabel, total, _podIdCounter);
         }
 
     }
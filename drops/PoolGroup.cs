@@ -94,6 +94,16 @@ namespace ServerlessPoolOptimizer
                     RuntimeToPools[runtime][poolCores] = new Pool(pSimulationTimeReaderdouble, pSimulator, poolParameters, pExp, pPercentileResults);
                 }
             }
+            // pod handles refer to their pool by its position in the RuntimeToPools order
+            int poolIndex = 0;
+            foreach (var (runtime, pools) in RuntimeToPools)
+            {
+                foreach (var (poolCores, pool) in pools)
+                {
+                    pool.PoolIndex = poolIndex;
+                    poolIndex++;
+                }
+            }
         }
     }
 
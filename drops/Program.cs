@@ -6,9 +6,50 @@ namespace ServerlessPoolOptimizer
     {
         static void Main(string[] args)
         {
+            if (args.Length >= 1 && args[0] == "--serve")
+            {
+                if (args.Length == 2)
+                {
+                    SimulationServer.ServeUnixSocket(args[1]);
+                }
+                else
+                {
+                    SimulationServer.ServeStdio();
+                }
+                return;
+            }
+            if (args.Length == 2 && args[0] == "--recommend")
+            {
+                OnlineRecommender.Run(args[1]);
+                return;
+            }
+            if (args.Length == 3 && args[0] == "--shard")
+            {
+                var shard = args[1].Split('/');
+                ShardedRun.RunShard(args[2], int.Parse(shard[0]), int.Parse(shard[1]));
+                return;
+            }
+            if ((args.Length == 3 || args.Length == 4) && args[0] == "--replicate")
+            {
+                int replicationsCount = int.Parse(args[1]);
+                int parallelism = args.Length == 4 ? int.Parse(args[2]) : Math.Min(replicationsCount, Environment.ProcessorCount);
+                ReplicatedRun.Run(args[args.Length - 1], replicationsCount, parallelism);
+                return;
+            }
+            if (args.Length == 3 && args[0] == "--merge")
+            {
+                ShardedRun.Merge(args[2], int.Parse(args[1]));
+                return;
+            }
+
             if (args.Length != 1)
             {
                 Console.WriteLine("Usage: drops experiments.json");
+                Console.WriteLine("       drops --serve [unix socket path]");
+                Console.WriteLine("       drops --recommend recommender.json");
+                Console.WriteLine("       drops --shard <index>/<count> experiments.json");
+                Console.WriteLine("       drops --merge <count> experiments.json");
+                Console.WriteLine("       drops --replicate <count> [parallelism] experiments.json");
                 Console.WriteLine("Arguments passed to the program:");
                 foreach (var arg in args)
                 {
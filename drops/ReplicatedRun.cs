@@ -0,0 +1,164 @@
+namespace ServerlessPoolOptimizer
+{
+    /*
+     *  Seeded replications of the experiments of a config (drops --replicate <count> [parallelism] exp.json), run in
+     *  parallel. Replication r gives every experiment the simulation seed (simulationSeed or 0) + r and starts each of
+     *  them from a generator seeded with it: the compared methods of a replication see the same analysis samples and,
+     *  per pool, the same pod life cycles (common random numbers), replications differ only by their seed. Every
+     *  replication writes its results to <results folder>/replication-<r>/, the cost.csv of the results folder has the
+     *  mean of every cost.csv value over the replications and the half-width of its 95% confidence interval.
+     */
+    public static class ReplicatedRun
+    {
+        private static readonly string[] CostColumns =
+        {
+            "Total Core Hours",
+            "Total Containers Core Hours",
+            "Pool Core Hours",
+            "Total Requests",
+            "Total Failed Requests",
+            "Failure Rate"
+        };
+
+        public static void Run(string experimentsConfig, int replicationsCount, int parallelism)
+        {
+            // parsed here, the experiments parsing shares the VM creation distributions through a cache
+            var replications = new List<Experiment>[replicationsCount];
+            string resultPath = null;
+            for (int r = 0; r < replicationsCount; r++)
+            {
+                var experiments = Utilities.ParseExperiments(experimentsConfig);
+                resultPath ??= experiments[0].ResultPath;
+                foreach (var exp in experiments)
+                {
+                    exp.SimulationSeed = (exp.SimulationSeed ?? 0) + r;
+                    exp.ResultPath = resultPath + GetReplicationFolderName(r);
+                }
+                Directory.CreateDirectory(resultPath + GetReplicationFolderName(r));
+                replications[r] = experiments;
+            }
+            Console.WriteLine("Experiments count: {0}, replications: {1}, in parallel: {2}",
+                                replications[0].Count, replicationsCount, parallelism);
+
+            RandomSource.Init();
+            var replicationsCostRows = new List<(string, string, double[])>[replicationsCount];
+            var parallelOptions = new ParallelOptions { MaxDegreeOfParallelism = parallelism };
+            Parallel.For(0, replicationsCount, parallelOptions, r =>
+            {
+                var experiments = replications[r];
+                for (int i = 0; i < experiments.Count; i++)
+                {
+                    var exp = experiments[i];
+                    exp.Id = i;
+                    var previousRandom = RandomSource.InitThread(exp.SimulationSeed.Value);
+                    try
+                    {
+                        Analyzer.RunOneExperiment(exp);
+                    }
+                    finally
+                    {
+                        RandomSource.ResetThread(previousRandom);
+                    }
+                }
+                Utilities.WriteResults(experiments);
+                replicationsCostRows[r] = GetCostRows(experiments);
+                // the simulation results are written, only the cost rows are kept
+                replications[r] = null;
+                Console.WriteLine("Replication {0} done", r);
+            });
+
+            WriteCostResults(replicationsCostRows, resultPath + "cost.csv");
+        }
+
+        private static string GetReplicationFolderName(int replication)
+        {
+            return String.Format("replication-{0}/", replication);
+        }
+
+        // the rows of Utilities.WriteCostResults, after WriteResults appended the combined experiments
+        private static List<(string, string, double[])> GetCostRows(List<Experiment> experiments)
+        {
+            var costRows = new List<(string, string, double[])>();
+            foreach (var percentile in experiments[0].TargetPercentiles)
+            {
+                foreach (var exp in experiments)
+                {
+                    if (exp.ExpName.Contains("sub")
+                        || !exp.Results.PercentileToResultsMap.TryGetValue(percentile, out var percentileResults)
+                        || percentileResults == null)
+                    {
+                        continue;
+                    }
+                    costRows.Add((Utilities.PercentileToString(percentile), exp.ExpName, new double[]
+                    {
+                        percentileResults.TotalCoreHour,
+                        percentileResults.PodsTotalCoreHour,
+                        percentileResults.PoolTotalCoreHour,
+                        percentileResults.TotalRequests,
+                        percentileResults.TotalFailedRequests,
+                        percentileResults.MeasuredFailureRate
+                    }));
+                }
+            }
+            return costRows;
+        }
+
+        private static void WriteCostResults(List<(string, string, double[])>[] replicationsCostRows, string filePath)
+        {
+            string resultsStr = String.Format("{0},{1},{2},{3},{4}\n",
+                                                "Percentile",
+                                                "Exp",
+                                                String.Join(",", CostColumns),
+                                                String.Join(",", CostColumns.Select(column => column + " CI")),
+                                                "Replications");
+
+            int replicationsCount = replicationsCostRows.Length;
+            double tQuantile = replicationsCount > 1 ? Utilities.GetStudentTQuantile975(replicationsCount - 1) : 0;
+            for (int row = 0; row < replicationsCostRows[0].Count; row++)
+            {
+                var (percentile, expName, _) = replicationsCostRows[0][row];
+                var means = new string[CostColumns.Length];
+                var confidenceIntervals = new string[CostColumns.Length];
+                for (int column = 0; column < CostColumns.Length; column++)
+                {
+                    double sum = 0;
+                    foreach (var costRows in replicationsCostRows)
+                    {
+                        var (_, rowExpName, values) = costRows[row];
+                        if (rowExpName != expName)
+                        {
+                            throw new InvalidOperationException("The replications do not have the same cost rows");
+                        }
+                        sum += values[column];
+                    }
+                    double mean = sum / replicationsCount;
+                    means[column] = mean.ToString();
+                    confidenceIntervals[column] = "N/A";
+                    if (replicationsCount > 1)
+                    {
+                        double squaredDeviations = 0;
+                        foreach (var (_, _, values) in replicationsCostRows.Select(costRows => costRows[row]))
+                        {
+                            squaredDeviations += (values[column] - mean) * (values[column] - mean);
+                        }
+                        double standardError = Math.Sqrt(squaredDeviations / (replicationsCount - 1) / replicationsCount);
+                        confidenceIntervals[column] = (tQuantile * standardError).ToString();
+                    }
+                }
+                resultsStr += String.Format("{0},{1},{2},{3},{4}\n", percentile, expName,
+                                            String.Join(",", means), String.Join(",", confidenceIntervals), replicationsCount);
+            }
+
+            try
+            {
+                StreamWriter outputFile = new StreamWriter(filePath);
+                outputFile.WriteLine(resultsStr);
+                outputFile.Close();
+            }
+            catch (Exception e)
+            {
+                Console.WriteLine(e.ToString());
+            }
+        }
+    }
+}
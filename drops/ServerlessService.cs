@@ -8,7 +8,7 @@ namespace ServerlessPoolOptimizer
 
     public class ServerlessService
     {
-        private StreamWriter? _statsWriter;
+        private StatsWriter? _statsWriter;
         private int _hostRoleIdCount;
         private readonly ISimulationTimeReader _clock;
         private readonly Simulator _simulator;
@@ -21,13 +21,36 @@ namespace ServerlessPoolOptimizer
         private readonly List<HostRole> _fullHostRoleList;
         private readonly List<HostRole> _beingDeletedHostRoleList;
         private readonly List<HostRole> _deletedHostRoleList;
+        // cost breakdown of deleted host roles that were released (see Experiment.ReclaimTerminalObjects)
+        private readonly HostRoleStateTimeTracker _reclaimedHostRolesTimeTracker;
+        private int _reclaimedHostRolesCount;
         private readonly List<HostRole> _assignedHostRoleList;
+        private readonly HostRolePlacementIndex _hostRolePlacementIndex;
         private readonly Experiment _experiment;
         private readonly double _targetPercentile;
         private readonly PercentileResults _percentileResults;
         public IDistribution? _hostRoleBootDemandDistribution;
+        // host role boot delay stream when the experiment has a simulation seed
+        private readonly Random? _hostRoleBootRandom;
 
         public IDictionary<PoolLabel, List<AllocationRequest>> _poolLabelToAllocationRequest;
+        // pools in the order ProcessRequests used to walk them (runtime, then cores)
+        private readonly List<Pool> _poolsInProcessingOrder;
+        private readonly Dictionary<PoolLabel, int> _poolLabelToProcessingIndex;
+        // pools with queued requests that may be served now (a request arrived or a pod became ready)
+        private readonly SortedSet<int> _dirtyPoolIndices;
+        // running aggregates used by the optimizer, kept in step with host role, pod and queue transitions
+        private double _readyHostRolesIdleCores;
+        private double _pendingHostRolesIdleCores;
+        private double _assignedCores;
+        private int _queuedRequestsCount;
+        private readonly Dictionary<double, int> _queuedRequestsPerCoresMap;
+        // per-pool prediction inputs, see BuildPredictionArrays
+        private bool _isPredictionArraysBuilt = false;
+        private Pool[] _predictionPools = Array.Empty<Pool>();
+        private double[][] _predictedRequestRates = Array.Empty<double[]>();
+        private double[] _supplyDelayMeans = Array.Empty<double>();
+        private int[] _predictionWindowIndexes = Array.Empty<int>();
 
         public ServerlessService(ISimulationTimeReader pSimulationTimeReader,
                                 Simulator pSimulator,
@@ -45,8 +68,12 @@ namespace ServerlessPoolOptimizer
             _percentileResults = _experiment.Results.PercentileToResultsMap[_targetPercentile];
             _statsWriter = null;
             if (pStatsFilePath != null)
-                _statsWriter = new StreamWriter(pStatsFilePath);
+                _statsWriter = new StatsWriter(pStatsFilePath);
             _hostRoleBootDemandDistribution = pHostRoleBootDemandDistribution;
+            if (pExp.SimulationSeed != null)
+            {
+                _hostRoleBootRandom = RandomSource.CreateStream(pExp.SimulationSeed.Value, "HostRoles");
+            }
             _hostRoleIdCount = 0;
             _clock = pSimulationTimeReader;
             _hostRoleInitialCount = pHostRoleInitialCount;
@@ -55,15 +82,31 @@ namespace ServerlessPoolOptimizer
             _fullHostRoleList = new List<HostRole>();
             _beingDeletedHostRoleList = new List<HostRole>();
             _deletedHostRoleList = new List<HostRole>();
+            _reclaimedHostRolesTimeTracker = new HostRoleStateTimeTracker(-1);
+            _reclaimedHostRolesCount = 0;
             _assignedHostRoleList = new List<HostRole>();
+            _hostRolePlacementIndex = new HostRolePlacementIndex();
             _poolLabelToAllocationRequest = new Dictionary<PoolLabel, List<AllocationRequest>>();
+            _poolsInProcessingOrder = new List<Pool>();
+            _poolLabelToProcessingIndex = new Dictionary<PoolLabel, int>();
+            _dirtyPoolIndices = new SortedSet<int>();
+            _readyHostRolesIdleCores = 0;
+            _pendingHostRolesIdleCores = 0;
+            _assignedCores = 0;
+            _queuedRequestsCount = 0;
+            _queuedRequestsPerCoresMap = new Dictionary<double, int>();
             PoolGroup = new PoolGroup(pPoolGroupParameters, _clock, _simulator, _experiment, _percentileResults);
             _allocationLabelToPoolsMap = PoolGroup.RuntimeToPools;
             foreach (var (allocationLabel, pools) in _allocationLabelToPoolsMap)
             {
                 foreach (var (size, pool) in pools)
                 {
+                    // the pod handles of the pool refer to it by this index
+                    Debug.Assert(pool.PoolIndex == _poolsInProcessingOrder.Count);
                     _poolLabelToAllocationRequest.Add(pool.PoolLabel, new List<AllocationRequest>());
+                    _poolLabelToProcessingIndex.Add(pool.PoolLabel, _poolsInProcessingOrder.Count);
+                    _poolsInProcessingOrder.Add(pool);
+                    _queuedRequestsPerCoresMap.TryAdd(pool._poolParameters.Cores, 0);
                 }
             }
         }
@@ -118,6 +161,7 @@ namespace ServerlessPoolOptimizer
             Debug.Assert(sender is Simulator);
             if (request == null)
             {
+                MarkAllPoolsDirty();
                 ProcessRequests();
                 return;
             }
@@ -135,21 +179,73 @@ namespace ServerlessPoolOptimizer
                 {
                     continue;
                 }
-                pool.RequestQueue.AddRequest(request);
+                AddQueuedRequest(pool, request);
+                MarkPoolDirty(pool);
                 break;
             }
             ProcessRequests();
         }
 
-        public void ProcessRequests()
+        private void AddQueuedRequest(Pool pool, AllocationRequest request)
         {
+            pool.RequestQueue.AddRequest(request);
+            _queuedRequestsCount++;
+            _queuedRequestsPerCoresMap[pool._poolParameters.Cores]++;
+        }
+
+        private void RemoveQueuedRequest(Pool pool)
+        {
+            pool.RequestQueue.RemoveRequest();
+            _queuedRequestsCount--;
+            _queuedRequestsPerCoresMap[pool._poolParameters.Cores]--;
+            Debug.Assert(_queuedRequestsCount >= 0);
+        }
 
-            foreach (var (runtime, runtimePools) in PoolGroup.RuntimeToPools)
+        private void MarkPoolDirty(Pool pool)
+        {
+            if (pool.RequestQueue.Count() > 0)
             {
-                foreach (var (cores, pool) in runtimePools)
+                _dirtyPoolIndices.Add(_poolLabelToProcessingIndex[pool.PoolLabel]);
+            }
+        }
+
+        private void MarkAllPoolsDirty()
+        {
+            foreach (var pool in _poolsInProcessingOrder)
+            {
+                MarkPoolDirty(pool);
+            }
+        }
+
+        /*
+         *  A ready pod of a pool can serve queued requests of the same runtime pools that are not larger
+         *  (see ProcessOneRequest), so all of them may make progress.
+         */
+        private void MarkRuntimePoolsDirty(Pool readyPool)
+        {
+            var runtimePools = _allocationLabelToPoolsMap[readyPool._poolParameters.AllocationLabel];
+            foreach (var (poolCores, pool) in runtimePools)
+            {
+                if (poolCores > readyPool._poolParameters.Cores)
                 {
-                    ProcessPoolRequests(pool);
+                    break;
                 }
+                MarkPoolDirty(pool);
+            }
+        }
+
+        /*
+         *  Processes only the pools marked dirty since the last call, in the same order the full walk over
+         *  all pools used. A pool that is not dirty either has an empty queue or no ready pod it could use,
+         *  so skipping it does not change the outcome.
+         */
+        public void ProcessRequests()
+        {
+            while (_dirtyPoolIndices.Count > 0)
+            {
+                int poolIndex = _dirtyPoolIndices.Min;
+                _dirtyPoolIndices.Remove(poolIndex);
+                ProcessPoolRequests(_poolsInProcessingOrder[poolIndex]);
             }
             if (_myState != ServerlessState.Initializing)
             {
@@ -173,7 +269,7 @@ namespace ServerlessPoolOptimizer
                 bool isSuccess = ProcessOneRequest(request);
                 if (isSuccess)
                 {
-                    requestQueue.RemoveRequest();
+                    RemoveQueuedRequest(pool);
                     bool requestSucceeded = true;
                     if (_experiment.UseRequestsQueue)
                     {
@@ -204,7 +300,7 @@ namespace ServerlessPoolOptimizer
                 }
                 else if (_experiment.UseRequestsQueue == false)
                 {
-                    requestQueue.RemoveRequest();
+                    RemoveQueuedRequest(pool);
                     var latency = _clock.Now - request.ArrivalTimePoint;
                     Debug.Assert(latency >= 0);
                     _percentileResults.RequestLatencyDistribution.AddValue(latency);
@@ -221,7 +317,7 @@ namespace ServerlessPoolOptimizer
 
         public bool ProcessOneRequest(AllocationRequest request)
         {
-            Pod? allocatedPod = null;
+            PodHandle? allocatedPod = null;
             var runtimePools = _allocationLabelToPoolsMap[request.AllocationPoolGroupLabel];
             Debug.Assert(runtimePools != null);
             // try to allocate pods from the smallest pool to the largest
@@ -253,38 +349,19 @@ namespace ServerlessPoolOptimizer
 
         public bool HasQueuedRequests()
         {
-            foreach (var (runtime, runtimePools) in PoolGroup.RuntimeToPools)
-            {
-                foreach (var (cores, pool) in runtimePools)
-                {
-                    if (pool.RequestQueue.Count() > 0)
-                    {
-                        return true;
-                    }
-                }
-            }
-            return false;
+            return _queuedRequestsCount > 0;
         }
 
         public int QueuedRequestsCount()
         {
-            var count = 0;
-            foreach (var (runtime, runtimePools) in PoolGroup.RuntimeToPools)
-            {
-                foreach (var (cores, pool) in runtimePools)
-                {
-                    count += pool.RequestQueue.Count(); 
-                }
-            }
-            return count;
+            return _queuedRequestsCount;
         }
 
         public void ScheduleHostedPodsDeletion(HostRole hostrole)
         {
             foreach (var pod in hostrole.HostedPods)
             {
-                AllocationLabel allocationLabel = pod._allocationLabel;
-                Pool pool = _allocationLabelToPoolsMap[allocationLabel][pod._poolCores];
+                Pool pool = _poolsInProcessingOrder[pod.PoolIndex];
                 pool.SchedulePodDeletion(pod);
             }
         }
@@ -297,12 +374,16 @@ namespace ServerlessPoolOptimizer
             {
                 case HostRoleState.Pending:
                     _pendingHostRoleList.Add(hostRole);
+                    _pendingHostRolesIdleCores += hostRole.GetIdleCores();
                     hostRole.SetState(nextState);
                     break;
                 case HostRoleState.Ready:
                     Debug.Assert(hostRole.MyState == HostRoleState.Pending);
                     _pendingHostRoleList.Remove(hostRole);
                     _readyHostRoleList.Add(hostRole);
+                    _hostRolePlacementIndex.Add(hostRole);
+                    _pendingHostRolesIdleCores -= hostRole.GetIdleCores();
+                    _readyHostRolesIdleCores += hostRole.GetIdleCores();
                     ServiceTransitionToStableState();
                     hostRole.SetState(nextState);
                     if (_myState != ServerlessState.Initializing)
@@ -311,56 +392,90 @@ namespace ServerlessPoolOptimizer
                     }
                     break;
                 case HostRoleState.BeingDeleted:
-                    _readyHostRoleList.Remove(hostRole);
+                    if (_readyHostRoleList.Remove(hostRole))
+                    {
+                        _readyHostRolesIdleCores -= hostRole.GetIdleCores();
+                    }
+                    _hostRolePlacementIndex.Remove(hostRole);
                     _beingDeletedHostRoleList.Add(hostRole);
                     hostRole.SetState(nextState);
                     break;
                 case HostRoleState.Deleted:
                     _beingDeletedHostRoleList.Remove(hostRole);
-                    _deletedHostRoleList.Add(hostRole);
                     ServiceTransitionToStableState();
                     hostRole.SetState(nextState);
+                    AddDeletedHostRole(hostRole);
                     break;
             }
         }
 
-        public Pod? CreatePod(Pool pool, bool collectStat)
+        /*
+         *  A deleted host role does not change anymore. When reclaiming, its cost breakdown is final, so it is
+         *  added to the running total and the host role is dropped instead of kept until the end of the run.
+         */
+        private void AddDeletedHostRole(HostRole hostRole)
         {
-            var podCores = pool._poolParameters.Cores;
-            var poolGroupId = pool._poolParameters.PoolGroupId;
-            // find a host role to host the pod
-            // var hostRolesList = GetAssignedHostRolesToPoolGroup(poolGroupId);
-            var hostRolesList = GetNonFullHostRoles();
-            var hostRolesSortedBasedOnUtilization = hostRolesList.OrderBy(o => o.GetIdleCores()).ToList();
-            if (hostRolesList.Count == 0)
+            Debug.Assert(hostRole.IsDeleted());
+            if (!_experiment.ReclaimTerminalObjects)
             {
-                if (collectStat)
-                {
-                    pool.PoolStatistics._totalPodCreationCount++;
-                    pool.PoolStatistics._failedPodCreationCount++;
-                }
-                return null;
+                _deletedHostRoleList.Add(hostRole);
+                return;
             }
-            Pod? pod = null;
+            hostRole.PopulateHostRoleStateTimeTracker();
+            _reclaimedHostRolesTimeTracker.Add(hostRole.HostRoleStateTimeTracker);
+            _reclaimedHostRolesCount++;
+        }
+
+        private HostRole? FindHostRoleForPod(double podCores)
+        {
+            if (!_experiment.AssignHostRolesToPoolGroup)
+            {
+                return _hostRolePlacementIndex.FindBestFit(podCores);
+            }
+            var hostRolesSortedBasedOnUtilization = GetNonFullHostRoles().OrderBy(o => o.GetIdleCores()).ToList();
             for (int i = 0; i < hostRolesSortedBasedOnUtilization.Count; i++)
             {
                 var hostRole = hostRolesSortedBasedOnUtilization[i];
                 if (hostRole.IsReady() && hostRole.HasCapacity(podCores))
                 {
-                    pod = pool.CreatePod(hostRole._id, null);
-                    if (_myState == ServerlessState.Initializing)
-                    {
-                        pod.LifeCycleTimestamps._durationCreation = 0;
-                        pod.LifeCycleTimestamps._durationPending = 0;
-                    }
-                    pool.HandlePodStateTransition(pod, PodState.Created);
-                    hostRole.PlacePod(pod);
-                    if (hostRole.GetIdleCores() == 0)
-                    {
-                        _fullHostRoleList.Add(hostRole);
-                        _readyHostRoleList.Remove(hostRole);
-                    }
-                    break;
+                    return hostRole;
+                }
+            }
+            return null;
+        }
+
+        public PodHandle? CreatePod(Pool pool, bool collectStat)
+        {
+            var podCores = pool._poolParameters.Cores;
+            var poolGroupId = pool._poolParameters.PoolGroupId;
+            // find a host role to host the pod (best fit: the least idle cores that still fit)
+            // var hostRolesList = GetAssignedHostRolesToPoolGroup(poolGroupId);
+            var hostRole = FindHostRoleForPod(podCores);
+            PodHandle? pod = null;
+            if (hostRole != null)
+            {
+                var newPod = pool.CreatePod(hostRole._id, null);
+                if (_myState == ServerlessState.Initializing)
+                {
+                    ref var lifeCycle = ref pool.GetPodLifeCycle(newPod);
+                    lifeCycle._durationCreation = 0;
+                    lifeCycle._durationPending = 0;
+                }
+                pool.HandlePodStateTransition(newPod, PodState.Created);
+                var idleCoresBeforePlacement = hostRole.GetIdleCores();
+                hostRole.PlacePod(newPod, pool.GetPodCores(newPod));
+                pod = newPod;
+                _readyHostRolesIdleCores += hostRole.GetIdleCores() - idleCoresBeforePlacement;
+                _assignedCores += podCores;
+                if (hostRole.GetIdleCores() == 0)
+                {
+                    _fullHostRoleList.Add(hostRole);
+                    _readyHostRoleList.Remove(hostRole);
+                    _hostRolePlacementIndex.Remove(hostRole);
+                }
+                else
+                {
+                    _hostRolePlacementIndex.Update(hostRole);
                 }
             }
             if (collectStat)
@@ -382,7 +497,7 @@ namespace ServerlessPoolOptimizer
         {
             for (int i = 0; i < newPodsCount; i++)
             {
-                Pod? pod = CreatePod(pool, collectStat);
+                PodHandle? pod = CreatePod(pool, collectStat);
                 if (pod == null)
                 {
                     return i;
@@ -396,34 +511,54 @@ namespace ServerlessPoolOptimizer
             pool.DeletePods(deletePodsCount);
         }
 
-        public void HandlePodStateTransitionNotification(object sender, (Pod, PodState) PodNextStateTuple)
+        public void HandlePodStateTransitionNotification(object sender, (PodHandle, PodState) PodNextStateTuple)
         {
             Debug.Assert(sender.GetType() == typeof(Simulator));
-            Pod pod = PodNextStateTuple.Item1;
+            PodHandle pod = PodNextStateTuple.Item1;
             PodState nextState = PodNextStateTuple.Item2;
-            Pool pool = _allocationLabelToPoolsMap[pod._allocationLabel][pod._poolCores];
+            Pool pool = _poolsInProcessingOrder[pod.PoolIndex];
             Debug.Assert(pool != null);
             pool.HandlePodStateTransition(pod, nextState);
             if (nextState == PodState.Recycled)
             {
-                var hostRole = _readyHostRoleList.Find(h => h._id == pod._hostRoleId);
+                int hostRoleId = pool.GetPodHostRoleId(pod);
+                var hostRole = _readyHostRoleList.Find(h => h._id == hostRoleId);
                 var isHostRoleFull = false;
                 if (hostRole == null)
                 {
-                    hostRole = _fullHostRoleList.Find(h => h._id == pod._hostRoleId);
+                    hostRole = _fullHostRoleList.Find(h => h._id == hostRoleId);
                     isHostRoleFull = true;
                 }
                 if (hostRole == null)
                 {
-                    hostRole = _beingDeletedHostRoleList.Find(h => h._id == pod._hostRoleId);
+                    hostRole = _beingDeletedHostRoleList.Find(h => h._id == hostRoleId);
                     isHostRoleFull = false;
                 }
                 Debug.Assert(hostRole != null);
-                hostRole.DeallocatePod(pod);
+                var idleCoresBeforeDeallocation = hostRole.GetIdleCores();
+                if (_experiment.ReclaimTerminalObjects)
+                {
+                    // before DeallocatePod, which may delete (and reclaim) the host role
+                    Debug.Assert(pool.GetPodState(pod) == PodState.Recycled);
+                    hostRole.ReclaimPod(pod, pool.GetRealPodLifeCycle(pod), pool.GetPodCores(pod));
+                }
+                hostRole.DeallocatePod(pool.GetPodCores(pod));
+                if (_experiment.ReclaimTerminalObjects)
+                {
+                    pool.ReleasePod(pod);
+                }
+                _assignedCores -= pool._poolParameters.Cores;
                 if (isHostRoleFull)
                 {
                     _fullHostRoleList.Remove(hostRole);
                     _readyHostRoleList.Add(hostRole);
+                    _hostRolePlacementIndex.Add(hostRole);
+                    _readyHostRolesIdleCores += hostRole.GetIdleCores();
+                }
+                else if (hostRole.IsReady())
+                {
+                    _hostRolePlacementIndex.Update(hostRole);
+                    _readyHostRolesIdleCores += hostRole.GetIdleCores() - idleCoresBeforeDeallocation;
                 }
                 if (_experiment.PoolOptimizationMethod != PoolOptimizationMethod.Reactive
                     && _experiment.PoolOptimizationMethod != PoolOptimizationMethod.PredictiveReactive
@@ -438,6 +573,7 @@ namespace ServerlessPoolOptimizer
             }
             if (nextState == PodState.Ready)
             {
+                MarkRuntimePoolsDirty(pool);
                 ProcessRequests();
             }
         }
@@ -476,10 +612,11 @@ namespace ServerlessPoolOptimizer
                 var hostRole = _pendingHostRoleList[i];
                 SetServiceState(ServerlessState.Shrinking);
                 _pendingHostRoleList.Remove(hostRole);
-                _deletedHostRoleList.Add(hostRole);
+                _pendingHostRolesIdleCores -= hostRole.GetIdleCores();
                 hostRole.SetState(HostRoleState.Ready);
                 hostRole.SetState(HostRoleState.BeingDeleted);
                 hostRole.SetState(HostRoleState.Deleted);
+                AddDeletedHostRole(hostRole);
             }
 
             List<HostRole> hostRolesSortedBasedOnUtilization = _readyHostRoleList.OrderBy(o => o.GetIdleCores()).ToList();
@@ -517,14 +654,23 @@ namespace ServerlessPoolOptimizer
                 }
                 else if (_experiment.SamplingApproach == SamplingApproach.Random)
                 {
-                    hostRoleBootDemand = _hostRoleBootDemandDistribution.GetSample();
-
+                    if (_hostRoleBootRandom != null)
+                    {
+                        var previousRandom = RandomSource.UseThread(_hostRoleBootRandom);
+                        hostRoleBootDemand = _hostRoleBootDemandDistribution.GetSample();
+                        RandomSource.ResetThread(previousRandom);
+                    }
+                    else
+                    {
+                        hostRoleBootDemand = _hostRoleBootDemandDistribution.GetSample();
+                    }
                 }
                 HostRole newHostRole = new HostRole(_hostRoleIdCount++, _clock,
                                                     _experiment.HostRoleCores,
                                                     _experiment.MaxPodsPerHostRole,
                                                     hostRoleBootDemand,
                                                     _experiment.HostRoleReservedCores,
+                                                    _poolsInProcessingOrder,
                                                     HandleHostRoleStateTransitionNotification);
 
                 HandleHostRoleStateTransitionNotification(this, (newHostRole, HostRoleState.Pending));
@@ -543,7 +689,7 @@ namespace ServerlessPoolOptimizer
                 // assume these host roles are ready (created and initialized)
                 HostRole newHostRole = new HostRole(_hostRoleIdCount++, _clock, _experiment.HostRoleCores,
                                                         _experiment.MaxPodsPerHostRole, 0.0, _experiment.HostRoleReservedCores,
-                                                        HandleHostRoleStateTransitionNotification);
+                                                        _poolsInProcessingOrder, HandleHostRoleStateTransitionNotification);
 
                 HandleHostRoleStateTransitionNotification(this, (newHostRole, HostRoleState.Pending));
                 HandleHostRoleStateTransitionNotification(this, (newHostRole, HostRoleState.Ready));
@@ -558,13 +704,13 @@ namespace ServerlessPoolOptimizer
                 {
                     for (int i = 0; i < pool._poolParameters._minPodsCount; i++)
                     {
-                        Pod? pod = CreatePod(pool, false);
+                        PodHandle? pod = CreatePod(pool, false);
                         if (pod == null)
                         {
                             break;
                             // throw new Exception("No enough host roles to initialize the service!!!");
                         }
-                        double podReadyStartTimePoint = pod.LifeCycleTimestamps.GetTransitionEndTimePoint(PodState.Pending);
+                        double podReadyStartTimePoint = pool.GetPodLifeCycle(pod.Value).GetTransitionEndTimePoint(PodState.Pending);
                         if (pointTimeServiceInitializationComplete < podReadyStartTimePoint)
                         {
                             pointTimeServiceInitializationComplete = podReadyStartTimePoint;
@@ -584,6 +730,8 @@ namespace ServerlessPoolOptimizer
                 || _experiment.PoolOptimizationMethod == PoolOptimizationMethod.PredictiveReactive)
             {
                 HandleReactiveScaleDownPoolSizes(null, false);
+                SimEvent newEvent = _simulator.CreatePeriodicEvent(EventType.ReactiveUpdatePoolSize, _clock.Now, _experiment.ReactiveScalingDownFactor);
+                FireReactiveScaleDownPoolSizesAt(this, newEvent);
             }
         }
 
@@ -637,8 +785,13 @@ namespace ServerlessPoolOptimizer
                     .. _beingDeletedHostRoleList,
                     .. _deletedHostRoleList,
                 ];
+            if (_experiment.ReclaimTerminalObjects)
+            {
+                _percentileResults.ReclaimedHostRolesTimeTracker = _reclaimedHostRolesTimeTracker;
+                _percentileResults.ReclaimedHostRolesCount = _reclaimedHostRolesCount;
+            }
 
-            Debug.Assert(_percentileResults.HostRolesList.Count == _hostRoleIdCount);
+            Debug.Assert(_percentileResults.HostRolesList.Count + _reclaimedHostRolesCount == _hostRoleIdCount);
         }
 
 
@@ -662,6 +815,10 @@ namespace ServerlessPoolOptimizer
                     str = hostrole.HostRoleStateTimeTracker.ToString(isForTerminal: true);
                     str = hostrole.HostRoleStateTimeTracker.ToString(isForTerminal: false);
                 }
+                if (percentileResults.ReclaimedHostRolesTimeTracker != null)
+                {
+                    aggregateHostRoleStateTimeTracker.Add(percentileResults.ReclaimedHostRolesTimeTracker);
+                }
 
                 if (referenceHostRoleStateTimeTracker != null)
                 {
@@ -700,15 +857,7 @@ namespace ServerlessPoolOptimizer
 
         public double GetTotalAssignedCores()
         {
-            var totalPodsCores = 0.0;
-            foreach (var (allocationLabel, poolGroup) in _allocationLabelToPoolsMap)
-            {
-                foreach (var (poolCores, pool) in poolGroup)
-                {
-                    totalPodsCores += pool.GetTotalCores();
-                }
-            }
-            return totalPodsCores;
+            return _assignedCores;
         }
 
         public double GetTotalPodsPoolsUtilization()
@@ -824,8 +973,13 @@ namespace ServerlessPoolOptimizer
             return hostrolesUtilization;
         }
 
-        public string CollectStats(bool collectWindowStats = true)
+        // updates the utilization statistics and, if there is a stats file, adds a row to it
+        public void CollectStats(bool collectWindowStats = true)
         {
+            if (Validation.ShouldCheck())
+            {
+                AssertAggregateCounters();
+            }
             var totalReadyHostRolesCount = _readyHostRoleList.Count + _fullHostRoleList.Count;
             var idleHostRolesCount = GetIdleHostRolesCount();
             var nonFullHostRoles = GetIdleHostRolesCount();
@@ -839,18 +993,27 @@ namespace ServerlessPoolOptimizer
             _percentileResults.HostRolesCountDistribution.AddValue(totalReadyHostRolesCount);
             _percentileResults.NonFullHostRolesCountDistribution.AddValue(idleHostRolesCount);
 
-            string str = String.Format("{0:0.00},{1:0.00},{2:0.00},{3:0.00},{4},{5}",
-                            _clock.Now, totalIdleResourceUtilization, coresUtilization, podCoreUtilization,
-                            nonFullHostRoles, nonFullHostRoles + _pendingHostRoleList.Count);
+            if (_statsWriter != null)
+            {
+                _statsWriter.AddFixedPoint(_clock.Now);
+                _statsWriter.AddFixedPoint(totalIdleResourceUtilization);
+                _statsWriter.AddFixedPoint(coresUtilization);
+                _statsWriter.AddFixedPoint(podCoreUtilization);
+                _statsWriter.Add(nonFullHostRoles);
+                _statsWriter.Add(nonFullHostRoles + _pendingHostRoleList.Count);
+            }
 
             foreach (var (allocationLabel, poolGroup) in _allocationLabelToPoolsMap)
             {
                 foreach (var (poolCores, pool) in poolGroup)
                 {
-                    str += "," + pool.GetStats(collectWindowStats);
+                    pool.AddStats(_statsWriter, collectWindowStats);
                 }
             }
-            return str;
+            if (_statsWriter != null)
+            {
+                _statsWriter.EndRow();
+            }
         }
         public void PrintStatsHeader()
         {
@@ -864,17 +1027,21 @@ namespace ServerlessPoolOptimizer
             }
             if (_statsWriter != null)
             {
-                _statsWriter.WriteLine(header);
+                _statsWriter.WriteHeader(header);
             }
         }
         public void ScheduleCollectStatsEvent()
         {
-            SimEvent newEvent = _simulator.CreateEvent(EventType.CollectStats, _clock.Now,
-                                _clock.Now + _experiment.CollectStatsFrequency,
-                                null, null, null);
+            SimEvent newEvent = _simulator.CreatePeriodicEvent(EventType.CollectStats, _clock.Now, _experiment.CollectStatsFrequency);
             FireCollectStatsAt(this, newEvent);
         }
 
+        public void StartCollectingStats()
+        {
+            WriteStats();
+            ScheduleCollectStatsEvent();
+        }
+
         public void PrintResultsSummary()
         {
             Console.WriteLine("Simulation Completes - Results Summary");
@@ -916,94 +1083,116 @@ namespace ServerlessPoolOptimizer
                 return;
             }
 
-            var nextWindowPodsCount = 0.0;
+            if (!_isPredictionArraysBuilt)
+            {
+                BuildPredictionArrays();
+            }
+            HashSet<PoolLabel>? selectedPoolLabels = poolLabels == null ? null : new HashSet<PoolLabel>(poolLabels);
+            var minPodsCount = 1;
+            var epsilon = 1.0 - _targetPercentile;
+            if (epsilon == 0)
+            {
+                epsilon = 0.000001;
+            }
 
-            foreach (var (allocationLabel, runtimePools) in _allocationLabelToPoolsMap)
+            for (int i = 0; i < _predictionPools.Length; i++)
             {
-                foreach (var (cores, pool) in runtimePools)
+                var pool = _predictionPools[i];
+                if (selectedPoolLabels != null && !selectedPoolLabels.Contains(pool.PoolLabel))
                 {
-                    if (poolLabels != null && !poolLabels.Contains(pool.PoolLabel))
-                    {
-                        continue;
-                    }
-                    if (pool.PredictionWindowCurrentIdx >= pool._poolParameters.SmoothedTrace.Trace.Count)
-                    {
-                        Console.WriteLine("Short Predicted trace. Current interval is {0}, trace length: {1}", pool.PredictionWindowCurrentIdx, pool._poolParameters.SmoothedTrace.Trace.Count);
-                    }
-                    var predictedRequestsCount = pool._poolParameters.SmoothedTrace.Trace[pool.PredictionWindowCurrentIdx].Item2;
-                    var creationDelay = pool._poolParameters._lifeCycleDistributions._supplyDelayDistribution.GetMean();
-                    var currentWindowPodsCount = 1.0;
-                    var minPodsCount = 1;
-                    switch (_experiment.PoolOptimizationMethod)
-                    {
-                        case PoolOptimizationMethod.PredictionConcentratedLoad:
-                            currentWindowPodsCount = predictedRequestsCount * _experiment.PredictionWindowSize;
-                            currentWindowPodsCount = Math.Max(currentWindowPodsCount, minPodsCount);
-                            break;
+                    continue;
+                }
+                var predictedRequestRates = _predictedRequestRates[i];
+                int windowIdx = _predictionWindowIndexes[i];
+                if (windowIdx >= predictedRequestRates.Length)
+                {
+                    Console.WriteLine("Short Predicted trace. Current interval is {0}, trace length: {1}", windowIdx, predictedRequestRates.Length);
+                }
+                var predictedRequestsCount = predictedRequestRates[windowIdx];
+                var creationDelay = _supplyDelayMeans[i];
+                var currentWindowPodsCount = 1.0;
+                switch (_experiment.PoolOptimizationMethod)
+                {
+                    case PoolOptimizationMethod.PredictionConcentratedLoad:
+                        currentWindowPodsCount = predictedRequestsCount * _experiment.PredictionWindowSize;
+                        currentWindowPodsCount = Math.Max(currentWindowPodsCount, minPodsCount);
+                        break;
 
-                        case PoolOptimizationMethod.PredictionConstantLoad:
-                            currentWindowPodsCount = predictedRequestsCount * creationDelay * _targetPercentile;
-                            currentWindowPodsCount = Math.Max(currentWindowPodsCount, minPodsCount);
-                            break;
+                    case PoolOptimizationMethod.PredictionConstantLoad:
+                        currentWindowPodsCount = predictedRequestsCount * creationDelay * _targetPercentile;
+                        currentWindowPodsCount = Math.Max(currentWindowPodsCount, minPodsCount);
+                        break;
 
-                        case PoolOptimizationMethod.PredictiveReactive:
-                            double previousWindowRequests = pool.PoolStatistics._windowRequestsCount;
-                            var previousPoolSize = pool._poolParameters._minPodsCount;
-                            var nextWindowRequestsCount = Math.Ceiling(predictedRequestsCount * _experiment.PredictionWindowSize);
-                            if (nextWindowRequestsCount == 0)
-                            {
-                                currentWindowPodsCount = Parameter.ReactiveMinPoolSize;
-                            }
-                            else if (previousWindowRequests == 0 && nextWindowRequestsCount != 0)
-                            {
-                                currentWindowPodsCount = nextWindowRequestsCount;
-                            }
-                            else
-                            {
-                                currentWindowPodsCount = nextWindowRequestsCount;
-                            }
-                            break;
+                    case PoolOptimizationMethod.PredictiveReactive:
+                        var nextWindowRequestsCount = Math.Ceiling(predictedRequestsCount * _experiment.PredictionWindowSize);
+                        currentWindowPodsCount = nextWindowRequestsCount == 0 ? Parameter.ReactiveMinPoolSize : nextWindowRequestsCount;
+                        break;
 
-                        case PoolOptimizationMethod.PredictionPoissonLoad:
-                            var epsilon = 1.0 - _targetPercentile;
-                            if (epsilon == 0)
-                            {
-                                epsilon = 0.000001;
-                            }
-                            if (predictedRequestsCount <= 0)
-                            {
-                                currentWindowPodsCount = 0;
-                            }
-                            else
-                            {
-                                currentWindowPodsCount = AnalysisHelper.ComputePoissonPoolSize(predictedRequestsCount, creationDelay, epsilon);
-                            }
-                            currentWindowPodsCount = Math.Max(currentWindowPodsCount, minPodsCount);
-                            break;
-                    }
-                    pool._poolParameters._minPodsCount = (int)Math.Ceiling(currentWindowPodsCount);
-                    switch (_experiment.PoolOptimizationMethod)
-                    {
-                        case PoolOptimizationMethod.PredictionConstantLoad:
-                        case PoolOptimizationMethod.PredictionPoissonLoad:
-                        case PoolOptimizationMethod.PredictionConcentratedLoad:
-                        case PoolOptimizationMethod.PredictiveReactive:
-                            if (pool._poolParameters.SmoothedTrace.Trace.Count - 1 > pool.PredictionWindowCurrentIdx)
-                            {
-                                pool.PredictionWindowCurrentIdx++;
-                            }
-                            break;
-                    }
+                    case PoolOptimizationMethod.PredictionPoissonLoad:
+                        if (predictedRequestsCount <= 0)
+                        {
+                            currentWindowPodsCount = 0;
+                        }
+                        else
+                        {
+                            currentWindowPodsCount = AnalysisHelper.ComputePoissonPoolSize(predictedRequestsCount, creationDelay, epsilon);
+                        }
+                        currentWindowPodsCount = Math.Max(currentWindowPodsCount, minPodsCount);
+                        break;
+                }
+                pool._poolParameters._minPodsCount = (int)Math.Ceiling(currentWindowPodsCount);
+                if (predictedRequestRates.Length - 1 > windowIdx)
+                {
+                    windowIdx++;
+                    _predictionWindowIndexes[i] = windowIdx;
+                    pool.PredictionWindowCurrentIdx = windowIdx;
                 }
             }
 
             FireRunOptimizerNow(this, false);
-            SimEvent newEvent = _simulator.CreateEvent(EventType.UpdatePoolSizes, _clock.Now,
-                            _clock.Now + _experiment.PredictionWindowSize,
-                            null, null, null);
+        }
+
+        // first prediction update, the following ones are driven by a periodic UpdatePoolSizes event
+        public void StartPoolSizesPrediction()
+        {
+            if (_myState == ServerlessState.Initializing || !ShouldUpdatePoolSize())
+            {
+                return;
+            }
+            UpdatePoolSizesPrediction(null);
+            SimEvent newEvent = _simulator.CreatePeriodicEvent(EventType.UpdatePoolSizes, _clock.Now, _experiment.PredictionWindowSize);
             FireUpdatePoolSizesAt(this, newEvent);
         }
 
+        /*
+         *  Per-pool arrays read by the prediction update (predicted request rate per window, mean supply delay, current
+         *  window), so a periodic update is a single pass over plain arrays. Built once: the smoothed traces and the
+         *  supply delay distributions do not change during the simulation.
+         */
+        private void BuildPredictionArrays()
+        {
+            var pools = new List<Pool>();
+            foreach (var (allocationLabel, runtimePools) in _allocationLabelToPoolsMap)
+            {
+                foreach (var (cores, pool) in runtimePools)
+                {
+                    pools.Add(pool);
+                }
+            }
+            _predictionPools = pools.ToArray();
+            _predictedRequestRates = new double[_predictionPools.Length][];
+            _supplyDelayMeans = new double[_predictionPools.Length];
+            _predictionWindowIndexes = new int[_predictionPools.Length];
+            for (int i = 0; i < _predictionPools.Length; i++)
+            {
+                var pool = _predictionPools[i];
+                _predictedRequestRates[i] = pool._poolParameters.SmoothedTrace.Trace.Select(window => window.Item2).ToArray();
+                _supplyDelayMeans[i] = pool._poolParameters._lifeCycleDistributions._supplyDelayDistribution.GetMean();
+                _predictionWindowIndexes[i] = pool.PredictionWindowCurrentIdx;
+            }
+            _isPredictionArraysBuilt = true;
+        }
+
         public void HandleReactiveScaleDownPoolSizes(object sender, bool scaleDownVmPool = false)
         {
             foreach (var (allocationLabel, runtimePools) in _allocationLabelToPoolsMap)
@@ -1025,11 +1214,6 @@ namespace ServerlessPoolOptimizer
                     PoolGroup.PoolGroupParameters.MinAssignedHostRolesCount = PoolGroup.PoolGroupParameters.MinAssignedHostRolesCount - 1;
                 }
             }
-
-            SimEvent newEvent = _simulator.CreateEvent(EventType.ReactiveUpdatePoolSize, _clock.Now,
-                                _clock.Now + _experiment.ReactiveScalingDownFactor,
-                                null, null, null);
-            FireReactiveScaleDownPoolSizesAt(this, newEvent);
         }
 
 
@@ -1041,45 +1225,54 @@ namespace ServerlessPoolOptimizer
         public void HandleCollectStatsNotification(object sender, EventArgs e)
         {
             WriteStats();
-            ScheduleCollectStatsEvent();
         }
 
         public void WriteStats()
         {
-            string statsString = CollectStats();
-            if (_statsWriter == null)
-            {
-                return;
-            }
-            _statsWriter.WriteLine(statsString);
+            CollectStats();
         }
 
         public double GetIdleHostRoleCores()
         {
-            var hostRolesList = _readyHostRoleList.FindAll(h => h.GetIdleCores() > 0);
-            double totalCores = 0;
-            foreach (var hostRole in hostRolesList)
-            {
-                totalCores += hostRole.GetIdleCores();
-            }
-            return totalCores;
+            return _readyHostRolesIdleCores;
         }
 
         public double GetIdlePendingHostRoleCores()
         {
-            var hostRolesList = _readyHostRoleList.FindAll(h => h.GetIdleCores() >= 0);
-            double totalCores = 0;
-            foreach (var hostRole in hostRolesList)
+            return _readyHostRolesIdleCores + _pendingHostRolesIdleCores;
+        }
+
+        /*
+         *  Recomputes the running aggregates from the host role lists and pools and checks them against the
+         *  counters, to catch a transition that forgot to update them.
+         */
+        public void AssertAggregateCounters()
+        {
+            double readyIdleCores = 0;
+            foreach (var hostRole in _readyHostRoleList)
             {
-                totalCores += hostRole.GetIdleCores();
+                readyIdleCores += hostRole.GetIdleCores();
             }
-
+            double pendingIdleCores = 0;
             foreach (var hostRole in _pendingHostRoleList)
             {
-                totalCores += hostRole.GetIdleCores();
+                pendingIdleCores += hostRole.GetIdleCores();
             }
-
-            return totalCores;
+            double assignedCores = 0;
+            int queuedRequestsCount = 0;
+            foreach (var pool in _poolsInProcessingOrder)
+            {
+                assignedCores += pool.GetTotalCores();
+                queuedRequestsCount += pool.RequestQueue.Count();
+            }
+            Validation.Check(Math.Abs(readyIdleCores - _readyHostRolesIdleCores) < 1e-6,
+                                "ready host roles idle cores: counted {0}, tracked {1}", readyIdleCores, _readyHostRolesIdleCores);
+            Validation.Check(Math.Abs(pendingIdleCores - _pendingHostRolesIdleCores) < 1e-6,
+                                "pending host roles idle cores: counted {0}, tracked {1}", pendingIdleCores, _pendingHostRolesIdleCores);
+            Validation.Check(Math.Abs(assignedCores - _assignedCores) < 1e-6,
+                                "assigned cores: counted {0}, tracked {1}", assignedCores, _assignedCores);
+            Validation.Check(queuedRequestsCount == _queuedRequestsCount,
+                                "queued requests: counted {0}, tracked {1}", queuedRequestsCount, _queuedRequestsCount);
         }
 
 
@@ -1210,21 +1403,11 @@ namespace ServerlessPoolOptimizer
 
         public int GetRequiredHostRolesForQueuedRequests()
         {
-            var coresToCountMap = new Dictionary<double, int>();
-            foreach (var (allocationLabel, runtimePools) in _allocationLabelToPoolsMap)
+            if (_queuedRequestsCount == 0)
             {
-                foreach (var (poolCores, pool) in runtimePools)
-                {
-                    if (!coresToCountMap.ContainsKey(poolCores))
-                    {
-                        coresToCountMap.Add(poolCores, 0);
-                    }
-                    var waitingRequests = pool.RequestQueue.Count();
-                    coresToCountMap[poolCores] += waitingRequests;
-                }
+                return 0;
             }
-
-            return (int)Math.Ceiling(Utilities.ComputeNeededHostRoles(coresToCountMap, _experiment.HostRoleCores, _experiment.MaxPodsPerHostRole));
+            return (int)Math.Ceiling(Utilities.ComputeNeededHostRoles(_queuedRequestsPerCoresMap, _experiment.HostRoleCores, _experiment.MaxPodsPerHostRole));
         }
 
         internal void WirePodEvents(
@@ -76,10 +76,10 @@ namespace ServerlessPoolOptimizer
         public void HandleServiceInitializationCompleteNowNotification(object sender, EventArgs e)
         {
             Debug.Assert(sender.GetType() == typeof(Simulator));
-            ServerlessService.UpdatePoolSizesPrediction(null);
+            ServerlessService.StartPoolSizesPrediction();
             Loader.HandleRequestNowArrivesNotification(this, null);
             // PoolOptimizer.ScheduleOptimizeEvent(this);
-            ServerlessService.HandleCollectStatsNotification(this, EventArgs.Empty);
+            ServerlessService.StartCollectingStats();
         }
         public void HandleGetStatusNotification(object sender, string s)
         {
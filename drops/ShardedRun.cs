@@ -0,0 +1,249 @@
+using System.Diagnostics;
+using System.Text;
+
+namespace ServerlessPoolOptimizer
+{
+    /*
+     *  Runs the experiments of one config across several processes (drops --shard <index>/<count> exp.json) and merges
+     *  their results (drops --merge <count> exp.json) into the cost.csv and combined latency CDFs of a single run.
+     *  Shard i runs the experiments whose index modulo count is i, with the same experiment ids (and so the same result
+     *  file names) as a single run, and writes a partial result file in the results directory: the request counters,
+     *  the utilization and latency histograms and, instead of the host role objects, the cost breakdown summed over
+     *  the host roles of every percentile. The merge step rebuilds the experiment results from the partial files and
+     *  writes them as Utilities.WriteResults does after a single run.
+     *  Every experiment of a sharded run starts from a fresh random source, its results depend neither on the shards
+     *  count nor on the experiments run before it in the same process.
+     */
+    public static class ShardedRun
+    {
+        // bump when the partial result file layout changes
+        private const int FormatVersion = 1;
+        private const string FileMagic = "DROPS-PARTIAL-RESULTS";
+
+        public static void RunShard(string experimentsConfig, int shardIndex, int shardsCount)
+        {
+            Debug.Assert(0 <= shardIndex && shardIndex < shardsCount);
+            var experiments = Utilities.ParseExperiments(experimentsConfig);
+            Console.WriteLine("Experiments count: {0}, running shard {1} of {2}", experiments.Count(), shardIndex, shardsCount);
+
+            var partialResults = new MemoryStream();
+            using (var writer = new BinaryWriter(partialResults, Encoding.UTF8, true))
+            {
+                writer.Write(FileMagic);
+                writer.Write(FormatVersion);
+                writer.Write(experiments.Count);
+                writer.Write(shardsCount);
+                for (int i = shardIndex; i < experiments.Count; i += shardsCount)
+                {
+                    var exp = experiments[i];
+                    exp.Id = i;
+                    RandomSource.Init();
+                    Analyzer.RunOneExperiment(exp);
+                    WriteExperimentResults(writer, exp);
+                    // the host roles of the simulation are only needed for the cost breakdown written above
+                    exp.Results = null;
+                }
+            }
+
+            var partialResultsPath = experiments[0].ResultPath + GetPartialResultsFileName(shardIndex, shardsCount);
+            var tmpFilePath = String.Format("{0}.{1}.tmp", partialResultsPath, Environment.ProcessId);
+            File.WriteAllBytes(tmpFilePath, partialResults.ToArray());
+            File.Move(tmpFilePath, partialResultsPath, true);
+            Console.WriteLine("Saved the partial results to {0}", partialResultsPath);
+        }
+
+        public static void Merge(string experimentsConfig, int shardsCount)
+        {
+            var experiments = Utilities.ParseExperiments(experimentsConfig);
+            Console.WriteLine("Experiments count: {0}, merging {1} shards", experiments.Count(), shardsCount);
+            for (int shardIndex = 0; shardIndex < shardsCount; shardIndex++)
+            {
+                var partialResultsPath = experiments[0].ResultPath + GetPartialResultsFileName(shardIndex, shardsCount);
+                using var reader = new BinaryReader(new MemoryStream(File.ReadAllBytes(partialResultsPath)), Encoding.UTF8);
+                if (reader.ReadString() != FileMagic || reader.ReadInt32() != FormatVersion
+                    || reader.ReadInt32() != experiments.Count || reader.ReadInt32() != shardsCount)
+                {
+                    throw new InvalidDataException(String.Format("{0} is not a partial result of this config", partialResultsPath));
+                }
+                for (int i = shardIndex; i < experiments.Count; i += shardsCount)
+                {
+                    experiments[i].Id = i;
+                    ReadExperimentResults(reader, experiments[i], partialResultsPath);
+                }
+            }
+
+            Utilities.WriteResults(experiments);
+        }
+
+        private static string GetPartialResultsFileName(int shardIndex, int shardsCount)
+        {
+            return String.Format("shard-{0}-of-{1}.bin", shardIndex, shardsCount);
+        }
+
+        private static void WriteExperimentResults(BinaryWriter writer, Experiment exp)
+        {
+            writer.Write(exp.ExpName);
+            var percentileToResultsMap = exp.Results.PercentileToResultsMap;
+            writer.Write(exp.TargetPercentiles.Count);
+            foreach (var percentile in exp.TargetPercentiles)
+            {
+                writer.Write(percentile);
+            }
+            writer.Write(percentileToResultsMap.Count);
+            foreach (var (percentile, percentileResults) in percentileToResultsMap)
+            {
+                writer.Write(percentile);
+                // percentiles that were not simulated (1.0 added for the cost normalization) have no host roles
+                bool simulated = percentileResults.HostRolesList != null;
+                writer.Write(simulated);
+                writer.Write(percentileResults.TotalCoreHour);
+                writer.Write(percentileResults.PodsTotalCoreHour);
+                writer.Write(percentileResults.PoolTotalCoreHour);
+                writer.Write(percentileResults.ExpectedFailureRate);
+                writer.Write(percentileResults.MeasuredFailureRate);
+                writer.Write(percentileResults.TotalFailedRequests);
+                writer.Write(percentileResults.TotalRequests);
+                writer.Write(percentileResults.HostRolesPoolSize);
+                if (simulated)
+                {
+                    var hostRolesTimeTracker = new HostRoleStateTimeTracker(-1);
+                    foreach (var hostRole in percentileResults.HostRolesList)
+                    {
+                        hostRole.PopulateHostRoleStateTimeTracker();
+                        hostRolesTimeTracker.Add(hostRole.HostRoleStateTimeTracker);
+                    }
+                    if (percentileResults.ReclaimedHostRolesTimeTracker != null)
+                    {
+                        hostRolesTimeTracker.Add(percentileResults.ReclaimedHostRolesTimeTracker);
+                    }
+                    WriteHostRoleStateTimeTracker(writer, hostRolesTimeTracker);
+                    writer.Write(percentileResults.HostRolesList.Count + percentileResults.ReclaimedHostRolesCount);
+                }
+
+                DemandAnalysisCache.WriteDistribution(writer, percentileResults.HostRoleUtilizationStats);
+                DemandAnalysisCache.WriteDistribution(writer, percentileResults.PodCoreUtilizationStats);
+                DemandAnalysisCache.WriteDistribution(writer, percentileResults.HostRolesCountDistribution);
+                DemandAnalysisCache.WriteDistribution(writer, percentileResults.NonFullHostRolesCountDistribution);
+                DemandAnalysisCache.WriteDistribution(writer, percentileResults.HostRoleDemandDistribution);
+                DemandAnalysisCache.WriteDistribution(writer, percentileResults.RequestLatencyDistribution);
+
+                writer.Write(percentileResults.PoolLabelToPoolStatsMap.Count);
+                foreach (var (poolLabel, poolStats) in percentileResults.PoolLabelToPoolStatsMap)
+                {
+                    writer.Write(poolLabel.AllocationLabel.Runtime);
+                    writer.Write(poolLabel.AllocationLabel.RuntimeVersion);
+                    writer.Write(poolLabel.Cores);
+                    writer.Write(percentileResults.PoolSizeMap[poolLabel]);
+                    writer.Write(poolStats._totalRequestsCount);
+                    writer.Write(poolStats._totalSucceededRequestsCount);
+                    writer.Write(poolStats._totalFailedRequestsCount);
+                    writer.Write(poolStats._totalPodCreationCount);
+                    writer.Write(poolStats._failedPodCreationCount);
+                    DemandAnalysisCache.WriteDistribution(writer, poolStats.PoolUtilizationDistribution);
+                }
+            }
+        }
+
+        private static void ReadExperimentResults(BinaryReader reader, Experiment exp, string partialResultsPath)
+        {
+            if (reader.ReadString() != exp.ExpName)
+            {
+                throw new InvalidDataException(String.Format("{0}: experiment {1} does not match the config", partialResultsPath, exp.Id));
+            }
+            // the run adds 1.0 to the target percentiles, WriteResults iterates over them
+            exp.TargetPercentiles.Clear();
+            int targetPercentilesCount = reader.ReadInt32();
+            for (int i = 0; i < targetPercentilesCount; i++)
+            {
+                exp.TargetPercentiles.Add(reader.ReadDouble());
+            }
+            exp.Results = new ExperimentResults(new List<PoolLabel>(), new List<double>());
+            int percentilesCount = reader.ReadInt32();
+            for (int i = 0; i < percentilesCount; i++)
+            {
+                double percentile = reader.ReadDouble();
+                var percentileResults = new PercentileResults(new List<PoolLabel>());
+                exp.Results.PercentileToResultsMap.Add(percentile, percentileResults);
+                bool simulated = reader.ReadBoolean();
+                percentileResults.TotalCoreHour = reader.ReadDouble();
+                percentileResults.PodsTotalCoreHour = reader.ReadDouble();
+                percentileResults.PoolTotalCoreHour = reader.ReadDouble();
+                percentileResults.ExpectedFailureRate = reader.ReadDouble();
+                percentileResults.MeasuredFailureRate = reader.ReadDouble();
+                percentileResults.TotalFailedRequests = reader.ReadDouble();
+                percentileResults.TotalRequests = reader.ReadDouble();
+                percentileResults.HostRolesPoolSize = reader.ReadInt32();
+                if (simulated)
+                {
+                    // the summed breakdown stands for all the host roles, as the one of the reclaimed host roles does
+                    percentileResults.HostRolesList = new List<HostRole>();
+                    percentileResults.ReclaimedHostRolesTimeTracker = ReadHostRoleStateTimeTracker(reader);
+                    percentileResults.ReclaimedHostRolesCount = reader.ReadInt32();
+                }
+
+                RestoreDistribution(reader, percentileResults.HostRoleUtilizationStats);
+                RestoreDistribution(reader, percentileResults.PodCoreUtilizationStats);
+                RestoreDistribution(reader, percentileResults.HostRolesCountDistribution);
+                RestoreDistribution(reader, percentileResults.NonFullHostRolesCountDistribution);
+                RestoreDistribution(reader, percentileResults.HostRoleDemandDistribution);
+                RestoreDistribution(reader, percentileResults.RequestLatencyDistribution);
+
+                int poolsCount = reader.ReadInt32();
+                for (int j = 0; j < poolsCount; j++)
+                {
+                    var poolLabel = new PoolLabel(new AllocationLabel(reader.ReadString(), reader.ReadString()), reader.ReadDouble());
+                    var poolStats = new PoolStatistics();
+                    percentileResults.PoolSizeMap.Add(poolLabel, reader.ReadInt32());
+                    poolStats._totalRequestsCount = reader.ReadInt32();
+                    poolStats._totalSucceededRequestsCount = reader.ReadInt32();
+                    poolStats._totalFailedRequestsCount = reader.ReadInt32();
+                    poolStats._totalPodCreationCount = reader.ReadInt32();
+                    poolStats._failedPodCreationCount = reader.ReadInt32();
+                    RestoreDistribution(reader, poolStats.PoolUtilizationDistribution);
+                    percentileResults.PoolLabelToPoolStatsMap.Add(poolLabel, poolStats);
+                }
+            }
+        }
+
+        private static void RestoreDistribution(BinaryReader reader, DistributionEmpiricalFrequencyArray distribution)
+        {
+            var (moments, values, frequencies) = DemandAnalysisCache.ReadDistribution(reader);
+            DemandAnalysisCache.RestoreDistribution(distribution, moments, values, frequencies);
+        }
+
+        private static void WriteHostRoleStateTimeTracker(BinaryWriter writer, HostRoleStateTimeTracker tracker)
+        {
+            writer.Write(tracker.HostRoleTotalTime);
+            writer.Write(tracker.HostRoleServiceManagement);
+            writer.Write(tracker.HostRoleBootstrapping);
+            writer.Write(tracker.HostRoleUnallocatedCores);
+            writer.Write(tracker.PodCreation);
+            writer.Write(tracker.PodPending);
+            writer.Write(tracker.PodReady);
+            writer.Write(tracker.PodAllocated);
+            writer.Write(tracker.PodSpecialization);
+            writer.Write(tracker.PodUserWorkload);
+            writer.Write(tracker.PodDeletion);
+            writer.Write(tracker.PodRecycling);
+        }
+
+        private static HostRoleStateTimeTracker ReadHostRoleStateTimeTracker(BinaryReader reader)
+        {
+            return new HostRoleStateTimeTracker(-1)
+            {
+                HostRoleTotalTime = reader.ReadDouble(),
+                HostRoleServiceManagement = reader.ReadDouble(),
+                HostRoleBootstrapping = reader.ReadDouble(),
+                HostRoleUnallocatedCores = reader.ReadDouble(),
+                PodCreation = reader.ReadDouble(),
+                PodPending = reader.ReadDouble(),
+                PodReady = reader.ReadDouble(),
+                PodAllocated = reader.ReadDouble(),
+                PodSpecialization = reader.ReadDouble(),
+                PodUserWorkload = reader.ReadDouble(),
+                PodDeletion = reader.ReadDouble(),
+                PodRecycling = reader.ReadDouble(),
+            };
+        }
+    }
+}
@@ -13,33 +13,48 @@ namespace ServerlessPoolOptimizer
 
     public class SimEvent : EventArgs, IComparable
     {
-        private readonly int _id;
-        private readonly double _createTimePoint;
-        private readonly double _triggerTimePoint;
-        private readonly EventType _eventType;
-        public readonly AllocationRequest? Request;
-        public readonly HostRole? HostRole;
-        public readonly Pod? Pod;
-
-        public readonly List<PoolLabel>? PoolLabels;
+        // not readonly: the simulator can reuse a processed event for a new one (see Reset)
+        private int _id;
+        private double _createTimePoint;
+        private double _triggerTimePoint;
+        private EventType _eventType;
+        public AllocationRequest? Request;
+        public HostRole? HostRole;
+        // pod events carry the handle of the pod in the PodStore of its pool, not the pod itself
+        public PodHandle Pod;
+
+        public List<PoolLabel>? PoolLabels;
+        // periodic events are put back in the queue by the simulator every Period time units, 0 for one-shot events
+        public double Period;
 
         public SimEvent(int _eventId, EventType pEventType, double pCreateTimePoint, double pTriggerTimePoint,
-                            AllocationRequest? pRequest, HostRole? pHostRole, Pod? pPod, List<PoolLabel>? pPoolLabels)
+                            AllocationRequest? pRequest, HostRole? pHostRole, PodHandle? pPod, List<PoolLabel>? pPoolLabels)
+        {
+            Reset(_eventId, pEventType, pCreateTimePoint, pTriggerTimePoint, pRequest, pHostRole, pPod, pPoolLabels);
+        }
+
+        internal void Reset(int _eventId, EventType pEventType, double pCreateTimePoint, double pTriggerTimePoint,
+                            AllocationRequest? pRequest, HostRole? pHostRole, PodHandle? pPod, List<PoolLabel>? pPoolLabels)
         {
             if (pPod != null)
             {
-                Debug.Assert(pCreateTimePoint <= pTriggerTimePoint, String.Format("event trigger time cannot be before creation time: pEventType: {0}, creation time: {1}, trigger time: {2}, Pod lifecycle: {3}",
-                                                                                        pEventType, pCreateTimePoint, pTriggerTimePoint, pPod.LifeCycleTimestamps));
+                Validation.Check(pCreateTimePoint <= pTriggerTimePoint, "event trigger time cannot be before creation time: pEventType: {0}, creation time: {1}, trigger time: {2}, Pod: {3}",
+                                                                                        pEventType, pCreateTimePoint, pTriggerTimePoint, pPod.Value);
             }
             else
             {
-                Debug.Assert(pCreateTimePoint <= pTriggerTimePoint, String.Format("event trigger time cannot be before creation time: creation time: {0}, trigger time:{1}",
-                                                                                        pCreateTimePoint, pTriggerTimePoint));
+                Validation.Check(pCreateTimePoint <= pTriggerTimePoint, "event trigger time cannot be before creation time: creation time: {0}, trigger time:{1}",
+                                                                                        pCreateTimePoint, pTriggerTimePoint);
             }
             _id = _eventId;
             _createTimePoint = pCreateTimePoint;
             _triggerTimePoint = pTriggerTimePoint;
             _eventType = pEventType;
+            Request = null;
+            HostRole = null;
+            Pod = default;
+            PoolLabels = null;
+            Period = 0.0;
             switch (_eventType)
             {
                 case EventType.RequestArrive:
@@ -63,7 +78,7 @@ namespace ServerlessPoolOptimizer
                 case EventType.PodRecyclingStarts:
                 case EventType.PodBecomesRecycled:
                     Debug.Assert(pPod != null);
-                    Pod = pPod;
+                    Pod = pPod.Value;
                     break;
 
                 case EventType.UpdatePoolSizes:
@@ -105,7 +120,7 @@ namespace ServerlessPoolOptimizer
             return HostRole;
         }
 
-        public Pod? GetPod()
+        public PodHandle GetPod()
         {
             Debug.Assert(_eventType == EventType.PodBecomesPending
                             || _eventType == EventType.PodBecomesReady
@@ -0,0 +1,165 @@
+using System.Diagnostics;
+using System.Net.Sockets;
+using System.Text;
+using System.Text.Json;
+
+namespace ServerlessPoolOptimizer
+{
+    /*
+     *  Long-lived mode of the simulator (drops --serve [socket path]). Jobs are experiments configs, one JSON object
+     *  per line, read from stdin or from the connections of a Unix socket; every job gets a "started" reply, one
+     *  "progress" reply per finished experiment and a final "ok" (with the content of cost.csv) or "error" reply.
+     *  The process keeps what can be shared between jobs: the VM creation distributions, the predicted traces and
+     *  the demand analysis cache files. Jobs run one at a time, the simulator uses process-wide state.
+     *
+     *  Requests:  {"id": <any>, "configPath": "exp.json"}  or  {"id": <any>, "config": { ...experiments config... }}
+     *             {"command": "shutdown"}
+     */
+    public static class SimulationServer
+    {
+        // reads jobs from stdin and writes the replies to stdout, the simulator log goes to stderr
+        public static void ServeStdio()
+        {
+            var replies = Console.Out;
+            Console.SetOut(Console.Error);
+            Console.WriteLine("Serving experiment jobs on stdin");
+            ServeJobs(Console.In, replies);
+        }
+
+        public static void ServeUnixSocket(string socketPath)
+        {
+            if (File.Exists(socketPath))
+            {
+                File.Delete(socketPath);
+            }
+            using var listener = new Socket(AddressFamily.Unix, SocketType.Stream, ProtocolType.Unspecified);
+            listener.Bind(new UnixDomainSocketEndPoint(socketPath));
+            listener.Listen(Parameter.ServerSocketBacklog);
+            Console.WriteLine("Serving experiment jobs on {0}", socketPath);
+            try
+            {
+                bool shutdown = false;
+                while (!shutdown)
+                {
+                    using var connection = listener.Accept();
+                    using var stream = new NetworkStream(connection);
+                    using var requests = new StreamReader(stream, new UTF8Encoding(false));
+                    using var replies = new StreamWriter(stream, new UTF8Encoding(false)) { AutoFlush = true };
+                    try
+                    {
+                        shutdown = ServeJobs(requests, replies);
+                    }
+                    catch (IOException e)
+                    {
+                        Console.WriteLine("Client connection closed: {0}", e.Message);
+                    }
+                }
+            }
+            finally
+            {
+                File.Delete(socketPath);
+            }
+        }
+
+        // serves the requests until the end of the stream, returns true if a shutdown was requested
+        private static bool ServeJobs(TextReader requests, TextWriter replies)
+        {
+            string? line;
+            while ((line = requests.ReadLine()) != null)
+            {
+                if (String.IsNullOrWhiteSpace(line))
+                {
+                    continue;
+                }
+                JsonDocument request;
+                try
+                {
+                    request = JsonDocument.Parse(line);
+                }
+                catch (JsonException e)
+                {
+                    WriteReply(replies, null, "error", writer => writer.WriteString("message", e.Message));
+                    continue;
+                }
+                using (request)
+                {
+                    var root = request.RootElement;
+                    if (root.TryGetProperty("command", out JsonElement commandElem) && commandElem.GetString() == "shutdown")
+                    {
+                        WriteReply(replies, null, "shutdown", null);
+                        return true;
+                    }
+                    JsonElement? id = root.TryGetProperty("id", out JsonElement idElem) ? idElem : null;
+                    RunJob(root, id, replies);
+                }
+            }
+            return false;
+        }
+
+        private static void RunJob(JsonElement request, JsonElement? id, TextWriter replies)
+        {
+            var stopwatch = Stopwatch.StartNew();
+            WriteReply(replies, id, "started", null);
+            try
+            {
+                List<Experiment> experiments;
+                if (request.TryGetProperty("config", out JsonElement configElem))
+                {
+                    experiments = Utilities.ParseExperimentsJson(configElem.GetRawText());
+                }
+                else
+                {
+                    experiments = Utilities.ParseExperiments(request.GetProperty("configPath").GetString());
+                }
+                Console.WriteLine("Experiments count: {0}", experiments.Count());
+                if (experiments.Count == 0)
+                {
+                    throw new ArgumentException("The config has no experiments");
+                }
+
+                Analyzer.RunExperiments(experiments, exp =>
+                    WriteReply(replies, id, "progress", writer =>
+                    {
+                        writer.WriteString("experiment", exp.ExpName);
+                        writer.WriteNumber("index", exp.Id);
+                        writer.WriteNumber("count", experiments.Count);
+                    }));
+                Utilities.WriteResults(experiments);
+
+                string resultPath = experiments[0].ResultPath;
+                string cost = File.ReadAllText(resultPath + "cost.csv");
+                WriteReply(replies, id, "ok", writer =>
+                {
+                    writer.WriteString("resultsPath", resultPath);
+                    writer.WriteNumber("elapsedSeconds", stopwatch.Elapsed.TotalSeconds);
+                    writer.WriteString("cost", cost);
+                });
+            }
+            catch (Exception e)
+            {
+                Console.WriteLine(e.ToString());
+                WriteReply(replies, id, "error", writer => writer.WriteString("message", e.Message));
+            }
+        }
+
+        // one JSON object per line: {"id": ..., "status": ..., <fields>}
+        private static void WriteReply(TextWriter replies, JsonElement? id, string status, Action<Utf8JsonWriter>? writeFields)
+        {
+            var reply = new MemoryStream();
+            using (var writer = new Utf8JsonWriter(reply))
+            {
+                writer.WriteStartObject();
+                if (id != null)
+                {
+                    writer.WritePropertyName("id");
+                    id.Value.WriteTo(writer);
+                }
+                writer.WriteString("status", status);
+                writeFields?.Invoke(writer);
+                writer.WriteEndObject();
+            }
+            replies.WriteLine(Encoding.UTF8.GetString(reply.ToArray()));
+            replies.Flush();
+        }
+    }
+}
@@ -8,6 +8,9 @@ namespace ServerlessPoolOptimizer
         private readonly SortedSet<SimEvent> _futureEvents = new SortedSet<SimEvent>(new ComparerAllowDuplicate<SimEvent>());
         private readonly SimulationTime _simulationTime = pSimulationTime;
         private int _eventCounter = 0;
+        // if true, processed events are kept and reused by CreateEvent instead of allocating new ones
+        public bool ReuseEvents = false;
+        private readonly Stack<SimEvent> _freeEvents = new Stack<SimEvent>();
 
         private void ScheduleEvent(SimEvent pEvent)
         {
@@ -21,13 +24,37 @@ namespace ServerlessPoolOptimizer
                                     double pTriggerTimePoint,
                                     AllocationRequest? pRequest,
                                     HostRole? pHostRole,
-                                    Pod? pPod,
+                                    PodHandle? pPod,
                                     List<PoolLabel>? pPoolLabels = null)
         {
             Debug.Assert(_simulationTime.Now >= pCreateTimePoint && pCreateTimePoint <= pTriggerTimePoint);
+            if (_freeEvents.TryPop(out SimEvent? freeEvent))
+            {
+                freeEvent.Reset(_eventCounter++, pEventType, pCreateTimePoint, pTriggerTimePoint, pRequest, pHostRole, pPod, pPoolLabels);
+                return freeEvent;
+            }
             return new SimEvent(_eventCounter++, pEventType, pCreateTimePoint, pTriggerTimePoint, pRequest, pHostRole, pPod, pPoolLabels);
         }
 
+        // event that fires every pPeriod time units starting from pCreateTimePoint + pPeriod, the same event object is
+        // rescheduled after each firing instead of the handler creating a new one
+        public SimEvent CreatePeriodicEvent(EventType pEventType, double pCreateTimePoint, double pPeriod)
+        {
+            Debug.Assert(pPeriod > 0);
+            SimEvent newEvent = CreateEvent(pEventType, pCreateTimePoint, pCreateTimePoint + pPeriod, null, null, null);
+            newEvent.Period = pPeriod;
+            return newEvent;
+        }
+
+        private void ReschedulePeriodicEvent(SimEvent pEvent)
+        {
+            double period = pEvent.Period;
+            pEvent.Reset(_eventCounter++, pEvent.GetEventType(), _simulationTime.Now, _simulationTime.Now + period,
+                            null, null, null, pEvent.PoolLabels);
+            pEvent.Period = period;
+            ScheduleEvent(pEvent);
+        }
+
         public override string ToString()
         {
             return String.Format("Simulator [time {0:000.00}]", _simulationTime.Now);
@@ -136,13 +163,23 @@ namespace ServerlessPoolOptimizer
                 {
                     FireRequestNowArrives(this, null);
                 }
+
+                if (myEvent.Period > 0)
+                {
+                    ReschedulePeriodicEvent(myEvent);
+                }
+                else if (ReuseEvents)
+                {
+                    // nothing keeps a reference to an event once it has been processed
+                    _freeEvents.Push(myEvent);
+                }
             }
         }
 
 
         public event EventHandler<AllocationRequest> FireRequestNowArrives;
         public event EventHandler<(HostRole, HostRoleState)> FireHostRoleStateTransitionNow;
-        public event EventHandler<(Pod, PodState)> FirePodStateTransitionNow;
+        public event EventHandler<(PodHandle, PodState)> FirePodStateTransitionNow;
         public event EventHandler FireServiceInitializationNowComplete;
         public event EventHandler<bool> FireRunOptimizerNow;
         public event EventHandler<bool> FireReactiveScaleDownPoolSizesNow;
@@ -181,7 +218,6 @@ namespace ServerlessPoolOptimizer
         public void HandleSchedulePodStateTransitionAt(object sender, SimEvent e)
         {
             Debug.Assert(sender.GetType() == typeof(Pool));
-            Debug.Assert(e.GetPod() != null);
             ScheduleEvent(e);
         }
         public void HandleOptimizerRunAtNotification(object sender, SimEvent e)
@@ -0,0 +1,183 @@
+using System.Collections.Concurrent;
+using System.Diagnostics;
+using System.Globalization;
+using System.Text;
+
+namespace ServerlessPoolOptimizer
+{
+    /*
+     *  Replay stats sink. The simulation thread only copies the numeric values of a row into a preallocated block;
+     *  full blocks are formatted and written to the CSV file by a background thread, so collecting stats does not
+     *  pay for string formatting or file IO. The file content is the same as formatting every row in place with
+     *  String.Format: "{0:0.00}" for the fixed point columns, "{0}" for the others.
+     */
+    public class StatsWriter
+    {
+        private class StatsBlock
+        {
+            public double[] Values;
+            public bool[] IsFixedPoint;
+            public readonly int[] RowEnds;
+            public int CellsCount;
+            public int RowsCount;
+
+            public StatsBlock(int pCellsCapacity, int pRowsCapacity)
+            {
+                Values = new double[pCellsCapacity];
+                IsFixedPoint = new bool[pCellsCapacity];
+                RowEnds = new int[pRowsCapacity];
+                CellsCount = 0;
+                RowsCount = 0;
+            }
+        }
+
+        private readonly StreamWriter _writer;
+        private readonly CultureInfo _culture;
+        private readonly int _blockRows;
+        private readonly BlockingCollection<StatsBlock> _fullBlocks;
+        private readonly ConcurrentBag<StatsBlock> _freeBlocks;
+        // started with the first full block, everything written before (the header) goes directly to the file
+        private Thread? _writerThread;
+        private StatsBlock? _currentBlock;
+        private int _rowWidth;
+        private bool _closed;
+
+        public StatsWriter(string pFilePath)
+        {
+            _writer = new StreamWriter(pFilePath, false, new UTF8Encoding(false), Parameter.StatsWriterBufferSize);
+            // rows are formatted on another thread, keep the culture of the simulation thread
+            _culture = CultureInfo.CurrentCulture;
+            _blockRows = Parameter.StatsWriterBlockRows;
+            _fullBlocks = new BlockingCollection<StatsBlock>(Parameter.StatsWriterMaxPendingBlocks);
+            _freeBlocks = new ConcurrentBag<StatsBlock>();
+            _writerThread = null;
+            _currentBlock = null;
+            _rowWidth = 1;
+            _closed = false;
+        }
+
+        public void WriteHeader(string header)
+        {
+            Debug.Assert(_writerThread == null && _currentBlock == null);
+            _rowWidth = header.Split(',').Length;
+            _writer.WriteLine(header);
+        }
+
+        // value written with two decimals
+        public void AddFixedPoint(double value)
+        {
+            AddCell(value, true);
+        }
+
+        // value written in the default format (counters)
+        public void Add(double value)
+        {
+            AddCell(value, false);
+        }
+
+        public void EndRow()
+        {
+            var block = _currentBlock!;
+            block.RowEnds[block.RowsCount++] = block.CellsCount;
+            if (block.RowsCount == _blockRows)
+            {
+                HandOver(block);
+                _currentBlock = null;
+            }
+        }
+
+        // writes the pending rows and waits for the background thread to finish
+        public void Close()
+        {
+            if (_closed)
+            {
+                return;
+            }
+            _closed = true;
+            if (_currentBlock != null && _currentBlock.RowsCount > 0)
+            {
+                HandOver(_currentBlock);
+            }
+            _currentBlock = null;
+            _fullBlocks.CompleteAdding();
+            if (_writerThread != null)
+            {
+                _writerThread.Join();
+            }
+            _writer.Close();
+        }
+
+        private void AddCell(double value, bool isFixedPoint)
+        {
+            if (_currentBlock == null)
+            {
+                _currentBlock = GetFreeBlock();
+            }
+            var block = _currentBlock;
+            if (block.CellsCount == block.Values.Length)
+            {
+                Array.Resize(ref block.Values, block.Values.Length * 2);
+                Array.Resize(ref block.IsFixedPoint, block.IsFixedPoint.Length * 2);
+            }
+            block.Values[block.CellsCount] = value;
+            block.IsFixedPoint[block.CellsCount] = isFixedPoint;
+            block.CellsCount++;
+        }
+
+        private StatsBlock GetFreeBlock()
+        {
+            if (_freeBlocks.TryTake(out StatsBlock? block))
+            {
+                block.CellsCount = 0;
+                block.RowsCount = 0;
+                return block;
+            }
+            return new StatsBlock(_rowWidth * _blockRows, _blockRows);
+        }
+
+        private void HandOver(StatsBlock block)
+        {
+            if (_writerThread == null)
+            {
+                _writerThread = new Thread(WriteBlocks)
+                {
+                    IsBackground = true,
+                    Name = "StatsWriter"
+                };
+                _writerThread.Start();
+            }
+            _fullBlocks.Add(block);
+        }
+
+        private void WriteBlocks()
+        {
+            var line = new StringBuilder();
+            foreach (var block in _fullBlocks.GetConsumingEnumerable())
+            {
+                int cell = 0;
+                for (int row = 0; row < block.RowsCount; row++)
+                {
+                    line.Clear();
+                    int rowStart = cell;
+                    for (; cell < block.RowEnds[row]; cell++)
+                    {
+                        if (cell > rowStart)
+                        {
+                            line.Append(',');
+                        }
+                        if (block.IsFixedPoint[cell])
+                        {
+                            line.Append(block.Values[cell].ToString("0.00", _culture));
+                        }
+                        else
+                        {
+                            line.Append(block.Values[cell].ToString(_culture));
+                        }
+                    }
+                    _writer.WriteLine(line);
+                }
+                _freeBlocks.Add(block);
+            }
+        }
+    }
+}
@@ -129,6 +129,164 @@ namespace ServerlessPoolOptimizer
 
             return smoothedTrace;
         }
+
+        // same trace as CreateSmoothedTrace over the arrivals the counts were built from, computed from the counts
+        public static SmoothedTrace CreateSmoothedTrace(ArrivalCountPyramid arrivalCounts, List<double> originalTrace, double WindowSize)
+        {
+            if (!arrivalCounts.CanServe(WindowSize))
+            {
+                return CreateSmoothedTrace(originalTrace, WindowSize);
+            }
+            SmoothedTrace smoothedTrace = new SmoothedTrace
+            {
+                WindowSize = WindowSize
+            };
+            int totalWindowsCount = (int)(Math.Ceiling(arrivalCounts.LastArrivalTimePoint) / WindowSize);
+            smoothedTrace.Trace = arrivalCounts.GetWindowCounts(WindowSize, totalWindowsCount + 1);
+            for (int i = 0; i < totalWindowsCount; i++)
+            {
+                var element = smoothedTrace.Trace[i];
+                smoothedTrace.Trace[i] = (element.Item1, element.Item2 / WindowSize);
+            }
+            if (smoothedTrace.Trace.Count >= 2)
+                smoothedTrace.Trace.RemoveAt(smoothedTrace.Trace.Count - 1);
+
+            return smoothedTrace;
+        }
+    }
+
+    /*
+     *  Arrival counts of a pool at a base resolution (Parameter.SmoothedTraceBaseResolution), built once from the
+     *  arrival list. The windows of any size that is a multiple of the base resolution are sums of base windows
+     *  (prefix sums), so smoothing the trace for another window size does not read the arrivals again.
+     *  CreateSmoothedTrace puts an arrival that falls exactly on a window boundary one window further, so
+     *  arrivals strictly inside a base window and arrivals on its start are counted separately.
+     */
+    public class ArrivalCountPyramid
+    {
+        public readonly double BaseResolution;
+        public readonly int ArrivalsCount;
+        public readonly double LastArrivalTimePoint;
+        // the first arrival is never moved to the next window
+        private readonly double _firstArrivalTimePoint;
+        // prefix sums of the arrivals strictly inside base window j, and of the arrivals exactly at its start
+        private readonly int[] _insideCountsPrefix;
+        private readonly int[] _onStartCountsPrefix;
+        // last base windows with an arrival inside / at the start, -1 if there is none
+        private readonly int _lastInsideBaseWindow;
+        private readonly int _lastOnStartBaseWindow;
+
+        public ArrivalCountPyramid(List<double> arrivalTimeList, double pBaseResolution)
+        {
+            Debug.Assert(pBaseResolution > 0);
+            BaseResolution = pBaseResolution;
+            ArrivalsCount = arrivalTimeList.Count;
+            _lastInsideBaseWindow = -1;
+            _lastOnStartBaseWindow = -1;
+            if (ArrivalsCount == 0)
+            {
+                _insideCountsPrefix = new int[1];
+                _onStartCountsPrefix = new int[1];
+                return;
+            }
+            LastArrivalTimePoint = arrivalTimeList[ArrivalsCount - 1];
+            _firstArrivalTimePoint = arrivalTimeList[0];
+            int baseWindowsCount = (int)(arrivalTimeList.Max() / BaseResolution) + 1;
+            var insideCounts = new int[baseWindowsCount];
+            var onStartCounts = new int[baseWindowsCount];
+            for (int i = 1; i < ArrivalsCount; i++)
+            {
+                var ts = arrivalTimeList[i];
+                int baseWindowIdx = (int)(ts / BaseResolution);
+                if (ts % BaseResolution == 0)
+                {
+                    onStartCounts[baseWindowIdx]++;
+                    _lastOnStartBaseWindow = Math.Max(_lastOnStartBaseWindow, baseWindowIdx);
+                }
+                else
+                {
+                    insideCounts[baseWindowIdx]++;
+                    _lastInsideBaseWindow = Math.Max(_lastInsideBaseWindow, baseWindowIdx);
+                }
+            }
+            _insideCountsPrefix = new int[baseWindowsCount + 1];
+            _onStartCountsPrefix = new int[baseWindowsCount + 1];
+            for (int j = 0; j < baseWindowsCount; j++)
+            {
+                _insideCountsPrefix[j + 1] = _insideCountsPrefix[j] + insideCounts[j];
+                _onStartCountsPrefix[j + 1] = _onStartCountsPrefix[j] + onStartCounts[j];
+            }
+        }
+
+        public bool CanServe(double windowSize)
+        {
+            if (ArrivalsCount == 0)
+            {
+                return false;
+            }
+            double baseWindowsPerWindow = windowSize / BaseResolution;
+            if (baseWindowsPerWindow < 1 || baseWindowsPerWindow != Math.Floor(baseWindowsPerWindow))
+            {
+                return false;
+            }
+            // an arrival beyond the last window makes CreateSmoothedTrace fail, let it do so
+            int totalWindowsCount = (int)(Math.Ceiling(LastArrivalTimePoint) / windowSize);
+            int baseWindowsPerWindowInt = (int)baseWindowsPerWindow;
+            int lastWindowIdx = (int)(_firstArrivalTimePoint / windowSize);
+            if (_lastInsideBaseWindow >= 0)
+            {
+                lastWindowIdx = Math.Max(lastWindowIdx, _lastInsideBaseWindow / baseWindowsPerWindowInt);
+            }
+            if (_lastOnStartBaseWindow >= 0)
+            {
+                // an arrival on a window start is counted in the next window
+                int blockStart = _lastOnStartBaseWindow / baseWindowsPerWindowInt * baseWindowsPerWindowInt;
+                lastWindowIdx = Math.Max(lastWindowIdx, _lastOnStartBaseWindow / baseWindowsPerWindowInt);
+                if (_onStartCountsPrefix[blockStart + 1] - _onStartCountsPrefix[blockStart] > 0)
+                {
+                    lastWindowIdx = Math.Max(lastWindowIdx, blockStart / baseWindowsPerWindowInt + 1);
+                }
+            }
+            return lastWindowIdx <= totalWindowsCount;
+        }
+
+        // (arrivals in the earlier windows, arrivals count) of each window, the counts are the ones CreateSmoothedTrace
+        // computes; the first item is the index of the first arrival of the window for sorted arrivals
+        public List<(int, double)> GetWindowCounts(double windowSize, int windowsCount)
+        {
+            Debug.Assert(CanServe(windowSize));
+            int baseWindowsPerWindow = (int)(windowSize / BaseResolution);
+            var windowCounts = new int[windowsCount];
+            for (int k = 0; k < windowsCount; k++)
+            {
+                int start = Math.Min(k * baseWindowsPerWindow, _insideCountsPrefix.Length - 1);
+                int end = Math.Min(start + baseWindowsPerWindow, _insideCountsPrefix.Length - 1);
+                int count = _insideCountsPrefix[end] - _insideCountsPrefix[start];
+                // arrivals on the start of the inner base windows stay in this window
+                int innerStart = Math.Min(start + 1, end);
+                count += _onStartCountsPrefix[end] - _onStartCountsPrefix[innerStart];
+                // arrivals on the start of the previous window were moved to this one
+                if (k >= 1)
+                {
+                    int previousStart = (k - 1) * baseWindowsPerWindow;
+                    if (previousStart < _onStartCountsPrefix.Length - 1)
+                    {
+                        count += _onStartCountsPrefix[previousStart + 1] - _onStartCountsPrefix[previousStart];
+                    }
+                }
+                windowCounts[k] = count;
+            }
+            windowCounts[(int)(_firstArrivalTimePoint / windowSize)]++;
+
+            var trace = new List<(int, double)>(windowsCount);
+            int arrivalsBefore = 0;
+            for (int k = 0; k < windowsCount; k++)
+            {
+                trace.Add((windowCounts[k] > 0 ? arrivalsBefore : 0, windowCounts[k]));
+                arrivalsBefore += windowCounts[k];
+            }
+            return trace;
+        }
     }
 
     public class PoolEmpiricalDistributions
@@ -137,6 +295,8 @@ namespace ServerlessPoolOptimizer
         public List<double> SampledRecyclingTimeList;
         public List<double> InputRecyclingTimeList;
         public SmoothedTrace SmoothedTrace;
+        // built from ArrivalTimeList on the first smoothing, see GetArrivalCounts
+        private ArrivalCountPyramid? _arrivalCounts;
         public Dictionary<double, IDistribution> RequestRateChangeDistribution;
         public Dictionary<double, IDistribution> AverageRequestRateDistribution;
         public Dictionary<double, IDistribution> PercentileToPoolSizeDistributionMap;
@@ -153,7 +313,8 @@ namespace ServerlessPoolOptimizer
         public PodLifeCycleDistributions PodLifeCycleDistributions;
         public double OptimalWindowSize;
 
-        public PoolEmpiricalDistributions(List<double> targetPercentiles)
+        public PoolEmpiricalDistributions(List<double> targetPercentiles,
+                                            LifeCycleDistributionType pLifeCycleDistributionType = LifeCycleDistributionType.Practical)
         {
             ArrivalTimeList = new List<double>();
             SampledRecyclingTimeList = new List<double>();
@@ -177,23 +338,46 @@ namespace ServerlessPoolOptimizer
                 hostRolePoolSizeDistribution.Add(percentile, new DistributionEmpiricalFrequencyArray());
             }
             PodLifeCycleDistributions = new PodLifeCycleDistributions(
-                new DistributionEmpiricalPractical(),
-                new DistributionEmpiricalPractical(),
-                new DistributionEmpiricalPractical(),
-                new DistributionEmpiricalPractical(),
-                new DistributionEmpiricalPractical(),
-                new DistributionEmpiricalPractical(),
-                new DistributionEmpiricalPractical(),
-                new DistributionEmpiricalPractical(),
-                new DistributionEmpiricalPractical(),
-                new DistributionEmpiricalPractical(),
-                new DistributionEmpiricalPractical(),
-                new DistributionEmpiricalPractical()
+                CreateLifeCycleDistribution(pLifeCycleDistributionType),
+                CreateLifeCycleDistribution(pLifeCycleDistributionType),
+                CreateLifeCycleDistribution(pLifeCycleDistributionType),
+                CreateLifeCycleDistribution(pLifeCycleDistributionType),
+                CreateLifeCycleDistribution(pLifeCycleDistributionType),
+                CreateLifeCycleDistribution(pLifeCycleDistributionType),
+                CreateLifeCycleDistribution(pLifeCycleDistributionType),
+                CreateLifeCycleDistribution(pLifeCycleDistributionType),
+                CreateLifeCycleDistribution(pLifeCycleDistributionType),
+                CreateLifeCycleDistribution(pLifeCycleDistributionType),
+                CreateLifeCycleDistribution(pLifeCycleDistributionType),
+                CreateLifeCycleDistribution(pLifeCycleDistributionType),
+                pLifeCycleDistributionType == LifeCycleDistributionType.Sketch ? Parameter.LifeCycleReservoirSize : int.MaxValue
             );
             RateChangeForDifferentWindowSizesList = new SortedDictionary<double, double>();
             allocationRequestsCount = 0;
             deallocationRequestsCount = 0;
         }
+
+        public ArrivalCountPyramid GetArrivalCounts()
+        {
+            if (_arrivalCounts == null || _arrivalCounts.ArrivalsCount != ArrivalTimeList.Count)
+            {
+                _arrivalCounts = new ArrivalCountPyramid(ArrivalTimeList, Parameter.SmoothedTraceBaseResolution);
+            }
+            return _arrivalCounts;
+        }
+
+        private static IDistribution CreateLifeCycleDistribution(LifeCycleDistributionType lifeCycleDistributionType)
+        {
+            switch (lifeCycleDistributionType)
+            {
+                case LifeCycleDistributionType.Practical:
+                    return new DistributionEmpiricalPractical();
+                case LifeCycleDistributionType.Sketch:
+                    return new DistributionEmpiricalSketch(Parameter.SketchRelativeAccuracy);
+                default:
+                    throw new ArgumentOutOfRangeException();
+            }
+        }
     }
     public class Trace
     {
@@ -208,6 +392,13 @@ namespace ServerlessPoolOptimizer
         private double _referenceTimePoint;
         private DateTime _referenceDateTime;
         private IDictionary<string, TraceLineFields> PodUuidToTraceLine;
+        // streaming life cycle join state (see JoinPodLifeCycle)
+        private bool _streamingLifeCycleJoin;
+        private double _lifeCycleJoinWindow;
+        private Dictionary<string, PodLifeCycleLineFields> _windowPodLifeCycles;
+        private Queue<PodLifeCycleLineFields> _windowPodLifeCyclesOrder;
+        private PodLifeCycleLineFields? _bufferedPodLifeCycleLine;
+        private LifeCycleDistributionType _lifeCycleDistributionType;
         public Trace(TraceType pTraceType, string pAllocationTracePath, string? pPodLifeCycleTracePath)
         {
             _traceType = pTraceType;
@@ -219,6 +410,8 @@ namespace ServerlessPoolOptimizer
             PoolLabelToDistributions = new Dictionary<PoolLabel, PoolEmpiricalDistributions>();
             PoolLabelToTraceLines = new Dictionary<PoolLabel, List<TraceLineFields>>();
             PodUuidToTraceLine = new Dictionary<string, TraceLineFields>();
+            _windowPodLifeCycles = new Dictionary<string, PodLifeCycleLineFields>();
+            _windowPodLifeCyclesOrder = new Queue<PodLifeCycleLineFields>();
             PoolGroupParametersList = new List<PoolGroupParameters>();
             requestsList = new List<(PoolLabel, double)>();
             deallocationList = new List<(PoolLabel, double)>();
@@ -281,130 +474,203 @@ namespace ServerlessPoolOptimizer
         public void ParsePodLifeCycleTrace(bool useCombinedPool)
         {
             int counter = 0;
-            PodLifeCycleLineFields? podLifeCycleLine = _podLifeCycleTraceReader.ParsePodLifeCycleLine();
+            PodLifeCycleLineFields? podLifeCycleLine = ReadPodLifeCycleLine();
             while (podLifeCycleLine != null && PodUuidToTraceLine.Count > 0)
             {
                 if (podLifeCycleLine.HasErrors)
                 {
-                    podLifeCycleLine = _podLifeCycleTraceReader.ParsePodLifeCycleLine();
+                    podLifeCycleLine = ReadPodLifeCycleLine();
                     continue;
                 }
                 if (PodUuidToTraceLine.ContainsKey(podLifeCycleLine.PodUUID))
                 {
                     TraceLineFields allocationLine = PodUuidToTraceLine[podLifeCycleLine.PodUUID];
-                    PoolLabel poolLabel = TraceLineFields.ConvertToPoolLabel(allocationLine.Runtime, allocationLine.RuntimeVersion, allocationLine.Cores);
-                    var podLifeCycleDistributions = PoolLabelToDistributions[poolLabel].PodLifeCycleDistributions;
-                    PodLifeCycleDistributions? combinedPoolPodLifeCycleDistributions = null;
-                    if (useCombinedPool)
-                    {
-                        combinedPoolPodLifeCycleDistributions = PoolLabelToDistributions[Parameter.CombinedPoolLabel].PodLifeCycleDistributions;
-                    }
-
-                    if (podLifeCycleLine.CreationDuration > 0)
-                    {
-                        podLifeCycleDistributions._creationDemandDistribution.AddValue(podLifeCycleLine.CreationDuration);
-                        if (combinedPoolPodLifeCycleDistributions != null)
-                            combinedPoolPodLifeCycleDistributions._creationDemandDistribution.AddValue(podLifeCycleLine.CreationDuration);
-                    }
-                    if (podLifeCycleLine.PendingDuration > 0)
-                    {
-                        podLifeCycleDistributions._pendingDemandDistribution.AddValue(podLifeCycleLine.PendingDuration);
-                        if (combinedPoolPodLifeCycleDistributions != null)
-                            combinedPoolPodLifeCycleDistributions._pendingDemandDistribution.AddValue(podLifeCycleLine.PendingDuration);
-                    }
-                    if (podLifeCycleLine.ReadyDuration > 0)
-                    {
-                        podLifeCycleDistributions._idleDurationDistribution.AddValue(podLifeCycleLine.ReadyDuration);
-                        if (combinedPoolPodLifeCycleDistributions != null)
-                            combinedPoolPodLifeCycleDistributions._idleDurationDistribution.AddValue(podLifeCycleLine.ReadyDuration);
-                    }
-                    if (podLifeCycleLine.AllocationDuration > 0)
-                    {
-                        podLifeCycleDistributions._allocatedDemandDistribution.AddValue(podLifeCycleLine.AllocationDuration);
-                        if (combinedPoolPodLifeCycleDistributions != null)
-                            combinedPoolPodLifeCycleDistributions._allocatedDemandDistribution.AddValue(podLifeCycleLine.AllocationDuration);
-                    }
-                    if (podLifeCycleLine.SpecializationDuration >= 0)
-                    {
-                        podLifeCycleDistributions._specializedDemandDistribution.AddValue(podLifeCycleLine.SpecializationDuration);
-                        if (combinedPoolPodLifeCycleDistributions != null)
-                            combinedPoolPodLifeCycleDistributions._specializedDemandDistribution.AddValue(podLifeCycleLine.SpecializationDuration);
-                    }
-                    if (podLifeCycleLine.UserWorkloadDuration > 0)
-                    {
-                        podLifeCycleDistributions._userWorkloadDemandDistribution.AddValue(podLifeCycleLine.UserWorkloadDuration);
-                        if (combinedPoolPodLifeCycleDistributions != null)
-                            combinedPoolPodLifeCycleDistributions._userWorkloadDemandDistribution.AddValue(podLifeCycleLine.UserWorkloadDuration);
-                    }
-                    if (podLifeCycleLine.DeletionDuration > 0)
-                    {
-                        podLifeCycleDistributions._deleteDemandDistribution.AddValue(podLifeCycleLine.DeletionDuration);
-                        if (combinedPoolPodLifeCycleDistributions != null)
-                            combinedPoolPodLifeCycleDistributions._deleteDemandDistribution.AddValue(podLifeCycleLine.DeletionDuration);
-                    }
-                    if (podLifeCycleLine.RecyclingDuration > 0)
-                    {
-                        podLifeCycleDistributions._vmRecyclingDemandDistribution.AddValue(podLifeCycleLine.RecyclingDuration);
-                        if (combinedPoolPodLifeCycleDistributions != null)
-                            combinedPoolPodLifeCycleDistributions._vmRecyclingDemandDistribution.AddValue(podLifeCycleLine.RecyclingDuration);
-                    }
-                    if (podLifeCycleLine.CreationDuration > 0 && podLifeCycleLine.PendingDuration > 0)
-                    {
-                        var totalSupplyDelay = podLifeCycleLine.CreationDuration + podLifeCycleLine.PendingDuration;
-                        podLifeCycleDistributions._supplyDelayDistribution.AddValue(totalSupplyDelay);
-                        if (combinedPoolPodLifeCycleDistributions != null)
-                            combinedPoolPodLifeCycleDistributions._supplyDelayDistribution.AddValue(totalSupplyDelay);
-                    }
-
-                    if (podLifeCycleLine.DeletionDuration > 0 && podLifeCycleLine.RecyclingDuration > 0)
-                    {
-                        var totalDeleteRecycleDelay = podLifeCycleLine.DeletionDuration + podLifeCycleLine.RecyclingDuration;
-                        podLifeCycleDistributions._deleteRecycleDelayDistribution.AddValue(totalDeleteRecycleDelay);
-                        if (combinedPoolPodLifeCycleDistributions != null)
-                            combinedPoolPodLifeCycleDistributions._deleteRecycleDelayDistribution.AddValue(totalDeleteRecycleDelay);
-                    }
-
-                    if (podLifeCycleLine.CreationDuration > 0
-                        && podLifeCycleLine.PendingDuration > 0
-                        && podLifeCycleLine.AllocationDuration > 0
-                        && podLifeCycleLine.SpecializationDuration >= 0
-                        && podLifeCycleLine.UserWorkloadDuration > 0
-                        && podLifeCycleLine.DeletionDuration > 0
-                        && podLifeCycleLine.RecyclingDuration > 0)
-                    {
-                        var total = podLifeCycleLine.CreationDuration + podLifeCycleLine.PendingDuration
-                                    // + podLifeCycleLine.ReadyDuration
-                                    + podLifeCycleLine.AllocationDuration + podLifeCycleLine.SpecializationDuration
-                                    + podLifeCycleLine.UserWorkloadDuration + podLifeCycleLine.DeletionDuration
-                                    + podLifeCycleLine.RecyclingDuration;
-
-                        podLifeCycleDistributions._fullLifeCycleDistribution.AddValue(total);
-                        if (combinedPoolPodLifeCycleDistributions != null)
-                            combinedPoolPodLifeCycleDistributions._fullLifeCycleDistribution.AddValue(total);
-
-
-                        var allocatedToRecycled = podLifeCycleLine.AllocationDuration + podLifeCycleLine.SpecializationDuration
-                                    + podLifeCycleLine.UserWorkloadDuration + podLifeCycleLine.DeletionDuration
-                                    + podLifeCycleLine.RecyclingDuration;
-
-                        podLifeCycleDistributions._allocatedToRecycledDistribution.AddValue(allocatedToRecycled);
-                        if (combinedPoolPodLifeCycleDistributions != null)
-                            combinedPoolPodLifeCycleDistributions._allocatedToRecycledDistribution.AddValue(allocatedToRecycled);
-
-                        podLifeCycleDistributions._lifeCyclesList.Add(new PodLifeCycleTimestamps(
-                                0, podLifeCycleLine.CreationDuration, podLifeCycleLine.PendingDuration,
-                                podLifeCycleLine.ReadyDuration, podLifeCycleLine.AllocationDuration,
-                                podLifeCycleLine.SpecializationDuration,
-                                podLifeCycleLine.UserWorkloadDuration, podLifeCycleLine.DeletionDuration,
-                                podLifeCycleLine.RecyclingDuration));
-                    }
+                    AddPodLifeCycle(podLifeCycleLine, allocationLine, useCombinedPool);
                     PodUuidToTraceLine.Remove(podLifeCycleLine.PodUUID);
                 }
-                podLifeCycleLine = _podLifeCycleTraceReader.ParsePodLifeCycleLine();
+                podLifeCycleLine = ReadPodLifeCycleLine();
                 counter++;
             }
         }
 
+        /*
+         *  Streaming join of the life cycle trace with the allocation trace. Both traces are sorted by time and
+         *  a pod is always created before it is allocated, so when an allocation line at time t is parsed, only
+         *  life cycle lines created at or before t need to be read. These lines wait in a window keyed by the pod
+         *  UUID and are evicted once their creation time is older than t - window (i.e., the pod was never
+         *  allocated or the allocation fell outside the window). Memory is bounded by the window size instead
+         *  of the number of pods in the trace.
+         */
+        private void JoinPodLifeCycle(TraceLineFields allocationLine, bool useCombinedPool)
+        {
+            PodLifeCycleLineFields? podLifeCycleLine = ReadPodLifeCycleLine();
+            while (podLifeCycleLine != null)
+            {
+                if (podLifeCycleLine.HasErrors)
+                {
+                    podLifeCycleLine = ReadPodLifeCycleLine();
+                    continue;
+                }
+                if (podLifeCycleLine.CreationRealTime == DateTime.MinValue)
+                {
+                    // the trace has no creation timestamps, the join falls back to the full (in-memory) join
+                    Console.WriteLine("Pod life cycle trace has no creation time, falling back to the full join");
+                    _streamingLifeCycleJoin = false;
+                    _bufferedPodLifeCycleLine = podLifeCycleLine;
+                    return;
+                }
+                if (podLifeCycleLine.CreationRealTime > allocationLine.RealTime)
+                {
+                    // created after the current allocation, keep it for the next call
+                    _bufferedPodLifeCycleLine = podLifeCycleLine;
+                    break;
+                }
+                _windowPodLifeCycles[podLifeCycleLine.PodUUID] = podLifeCycleLine;
+                _windowPodLifeCyclesOrder.Enqueue(podLifeCycleLine);
+                podLifeCycleLine = ReadPodLifeCycleLine();
+            }
+
+            while (_windowPodLifeCyclesOrder.Count > 0)
+            {
+                var oldestPodLifeCycle = _windowPodLifeCyclesOrder.Peek();
+                if (_traceReader.ComputeTimeDiff(oldestPodLifeCycle.CreationRealTime, allocationLine.RealTime) <= _lifeCycleJoinWindow)
+                {
+                    break;
+                }
+                _windowPodLifeCyclesOrder.Dequeue();
+                if (_windowPodLifeCycles.TryGetValue(oldestPodLifeCycle.PodUUID, out var windowLine) && windowLine == oldestPodLifeCycle)
+                {
+                    _windowPodLifeCycles.Remove(oldestPodLifeCycle.PodUUID);
+                }
+            }
+
+            if (allocationLine.PodUUID != null && _windowPodLifeCycles.Remove(allocationLine.PodUUID, out var matchedLine))
+            {
+                AddPodLifeCycle(matchedLine, allocationLine, useCombinedPool);
+            }
+        }
+
+        private PodLifeCycleLineFields? ReadPodLifeCycleLine()
+        {
+            if (_bufferedPodLifeCycleLine != null)
+            {
+                var podLifeCycleLine = _bufferedPodLifeCycleLine;
+                _bufferedPodLifeCycleLine = null;
+                return podLifeCycleLine;
+            }
+            return _podLifeCycleTraceReader.ParsePodLifeCycleLine();
+        }
+
+        private void AddPodLifeCycle(PodLifeCycleLineFields podLifeCycleLine, TraceLineFields allocationLine, bool useCombinedPool)
+        {
+            PoolLabel poolLabel = TraceLineFields.ConvertToPoolLabel(allocationLine.Runtime, allocationLine.RuntimeVersion, allocationLine.Cores);
+            var podLifeCycleDistributions = PoolLabelToDistributions[poolLabel].PodLifeCycleDistributions;
+            PodLifeCycleDistributions? combinedPoolPodLifeCycleDistributions = null;
+            if (useCombinedPool)
+            {
+                combinedPoolPodLifeCycleDistributions = PoolLabelToDistributions[Parameter.CombinedPoolLabel].PodLifeCycleDistributions;
+            }
+
+            if (podLifeCycleLine.CreationDuration > 0)
+            {
+                podLifeCycleDistributions._creationDemandDistribution.AddValue(podLifeCycleLine.CreationDuration);
+                if (combinedPoolPodLifeCycleDistributions != null)
+                    combinedPoolPodLifeCycleDistributions._creationDemandDistribution.AddValue(podLifeCycleLine.CreationDuration);
+            }
+            if (podLifeCycleLine.PendingDuration > 0)
+            {
+                podLifeCycleDistributions._pendingDemandDistribution.AddValue(podLifeCycleLine.PendingDuration);
+                if (combinedPoolPodLifeCycleDistributions != null)
+                    combinedPoolPodLifeCycleDistributions._pendingDemandDistribution.AddValue(podLifeCycleLine.PendingDuration);
+            }
+            if (podLifeCycleLine.ReadyDuration > 0)
+            {
+                podLifeCycleDistributions._idleDurationDistribution.AddValue(podLifeCycleLine.ReadyDuration);
+                if (combinedPoolPodLifeCycleDistributions != null)
+                    combinedPoolPodLifeCycleDistributions._idleDurationDistribution.AddValue(podLifeCycleLine.ReadyDuration);
+            }
+            if (podLifeCycleLine.AllocationDuration > 0)
+            {
+                podLifeCycleDistributions._allocatedDemandDistribution.AddValue(podLifeCycleLine.AllocationDuration);
+                if (combinedPoolPodLifeCycleDistributions != null)
+                    combinedPoolPodLifeCycleDistributions._allocatedDemandDistribution.AddValue(podLifeCycleLine.AllocationDuration);
+            }
+            if (podLifeCycleLine.SpecializationDuration >= 0)
+            {
+                podLifeCycleDistributions._specializedDemandDistribution.AddValue(podLifeCycleLine.SpecializationDuration);
+                if (combinedPoolPodLifeCycleDistributions != null)
+                    combinedPoolPodLifeCycleDistributions._specializedDemandDistribution.AddValue(podLifeCycleLine.SpecializationDuration);
+            }
+            if (podLifeCycleLine.UserWorkloadDuration > 0)
+            {
+                podLifeCycleDistributions._userWorkloadDemandDistribution.AddValue(podLifeCycleLine.UserWorkloadDuration);
+                if (combinedPoolPodLifeCycleDistributions != null)
+                    combinedPoolPodLifeCycleDistributions._userWorkloadDemandDistribution.AddValue(podLifeCycleLine.UserWorkloadDuration);
+            }
+            if (podLifeCycleLine.DeletionDuration > 0)
+            {
+                podLifeCycleDistributions._deleteDemandDistribution.AddValue(podLifeCycleLine.DeletionDuration);
+                if (combinedPoolPodLifeCycleDistributions != null)
+                    combinedPoolPodLifeCycleDistributions._deleteDemandDistribution.AddValue(podLifeCycleLine.DeletionDuration);
+            }
+            if (podLifeCycleLine.RecyclingDuration > 0)
+            {
+                podLifeCycleDistributions._vmRecyclingDemandDistribution.AddValue(podLifeCycleLine.RecyclingDuration);
+                if (combinedPoolPodLifeCycleDistributions != null)
+                    combinedPoolPodLifeCycleDistributions._vmRecyclingDemandDistribution.AddValue(podLifeCycleLine.RecyclingDuration);
+            }
+            if (podLifeCycleLine.CreationDuration > 0 && podLifeCycleLine.PendingDuration > 0)
+            {
+                var totalSupplyDelay = podLifeCycleLine.CreationDuration + podLifeCycleLine.PendingDuration;
+                podLifeCycleDistributions._supplyDelayDistribution.AddValue(totalSupplyDelay);
+                if (combinedPoolPodLifeCycleDistributions != null)
+                    combinedPoolPodLifeCycleDistributions._supplyDelayDistribution.AddValue(totalSupplyDelay);
+            }
+
+            if (podLifeCycleLine.DeletionDuration > 0 && podLifeCycleLine.RecyclingDuration > 0)
+            {
+                var totalDeleteRecycleDelay = podLifeCycleLine.DeletionDuration + podLifeCycleLine.RecyclingDuration;
+                podLifeCycleDistributions._deleteRecycleDelayDistribution.AddValue(totalDeleteRecycleDelay);
+                if (combinedPoolPodLifeCycleDistributions != null)
+                    combinedPoolPodLifeCycleDistributions._deleteRecycleDelayDistribution.AddValue(totalDeleteRecycleDelay);
+            }
+
+            if (podLifeCycleLine.CreationDuration > 0
+                && podLifeCycleLine.PendingDuration > 0
+                && podLifeCycleLine.AllocationDuration > 0
+                && podLifeCycleLine.SpecializationDuration >= 0
+                && podLifeCycleLine.UserWorkloadDuration > 0
+                && podLifeCycleLine.DeletionDuration > 0
+                && podLifeCycleLine.RecyclingDuration > 0)
+            {
+                var total = podLifeCycleLine.CreationDuration + podLifeCycleLine.PendingDuration
+                            // + podLifeCycleLine.ReadyDuration
+                            + podLifeCycleLine.AllocationDuration + podLifeCycleLine.SpecializationDuration
+                            + podLifeCycleLine.UserWorkloadDuration + podLifeCycleLine.DeletionDuration
+                            + podLifeCycleLine.RecyclingDuration;
+
+                podLifeCycleDistributions._fullLifeCycleDistribution.AddValue(total);
+                if (combinedPoolPodLifeCycleDistributions != null)
+                    combinedPoolPodLifeCycleDistributions._fullLifeCycleDistribution.AddValue(total);
+
+
+                var allocatedToRecycled = podLifeCycleLine.AllocationDuration + podLifeCycleLine.SpecializationDuration
+                            + podLifeCycleLine.UserWorkloadDuration + podLifeCycleLine.DeletionDuration
+                            + podLifeCycleLine.RecyclingDuration;
+
+                podLifeCycleDistributions._allocatedToRecycledDistribution.AddValue(allocatedToRecycled);
+                if (combinedPoolPodLifeCycleDistributions != null)
+                    combinedPoolPodLifeCycleDistributions._allocatedToRecycledDistribution.AddValue(allocatedToRecycled);
+
+                podLifeCycleDistributions.AddLifeCycle(new PodLifeCycleTimestamps(
+                        0, podLifeCycleLine.CreationDuration, podLifeCycleLine.PendingDuration,
+                        podLifeCycleLine.ReadyDuration, podLifeCycleLine.AllocationDuration,
+                        podLifeCycleLine.SpecializationDuration,
+                        podLifeCycleLine.UserWorkloadDuration, podLifeCycleLine.DeletionDuration,
+                        podLifeCycleLine.RecyclingDuration));
+            }
+        }
+
         public void RemovePools(List<PoolLabel> pools)
         {
             var poolLabels = PoolLabelToTraceLines.Keys.ToList();
@@ -449,8 +715,16 @@ namespace ServerlessPoolOptimizer
 
         public void Parse(Experiment exp)
         {
+            _lifeCycleJoinWindow = exp.PodLifeCycleJoinWindow;
+            _lifeCycleDistributionType = exp.LifeCycleDistributionType;
+            _streamingLifeCycleJoin = _podLifeCycleTraceReader != null && _lifeCycleJoinWindow > 0;
             ParseAllocationTrace(exp.TargetPercentiles, exp.UseCombinedPool);
-            ParsePodLifeCycleTrace(exp.UseCombinedPool);
+            if (!_streamingLifeCycleJoin)
+            {
+                ParsePodLifeCycleTrace(exp.UseCombinedPool);
+            }
+            _windowPodLifeCycles.Clear();
+            _windowPodLifeCyclesOrder.Clear();
             Close();
             RemovePoolsWithNoData();
         }
@@ -614,7 +888,7 @@ namespace ServerlessPoolOptimizer
             if (useCombinedPool)
             {
                 poolGroupParameters.RuntimeToPoolParameters.Add(Parameter.CombinedPoolAllocationLabel, new SortedList<double, PoolParameters>());
-                PoolLabelToDistributions[Parameter.CombinedPoolLabel] = new PoolEmpiricalDistributions(percentileList);
+                PoolLabelToDistributions[Parameter.CombinedPoolLabel] = new PoolEmpiricalDistributions(percentileList, _lifeCycleDistributionType);
                 PoolLabelToTraceLines[Parameter.CombinedPoolLabel] = new List<TraceLineFields>();
             }
 
@@ -649,7 +923,7 @@ namespace ServerlessPoolOptimizer
                 var poolLabel = TraceLineFields.ConvertToPoolLabel(lineFields);
                 if (!PoolLabelToDistributions.ContainsKey(poolLabel))
                 {
-                    PoolLabelToDistributions[poolLabel] = new PoolEmpiricalDistributions(percentileList);
+                    PoolLabelToDistributions[poolLabel] = new PoolEmpiricalDistributions(percentileList, _lifeCycleDistributionType);
                     PoolLabelToTraceLines[poolLabel] = new List<TraceLineFields>();
                 }
                 if (counter == 0)
@@ -664,6 +938,10 @@ namespace ServerlessPoolOptimizer
                 {
                     PoolLabelToDistributions[poolLabel].allocationRequestsCount++;
                     PoolLabelToDistributions[poolLabel].ArrivalTimeList.Add(lineFields.RelativeTimePoint);
+                    if (_streamingLifeCycleJoin)
+                    {
+                        JoinPodLifeCycle(lineFields, useCombinedPool);
+                    }
                 }
                 else
                 {
@@ -710,6 +988,12 @@ namespace ServerlessPoolOptimizer
                     }
                 }
 
+                if (_streamingLifeCycleJoin && lineFields.TraceLineType == TraceLineType.Deallocation)
+                {
+                    // life cycles are joined as allocations arrive, the pod line is not needed after deallocation
+                    PodUuidToTraceLine.Remove(lineFields.PodUUID);
+                }
+
                 prevRelativeTimePoint = lineFields.RelativeTimePoint;
                 lineFields = _traceReader.ParseTraceLine();
                 counter++;
@@ -759,6 +1043,27 @@ namespace ServerlessPoolOptimizer
             return requestsList;
         }
 
+        // the distributions draw from the random source of the thread, or from random when it is given
+        public PodLifeCycleTimestamps SamplePodLifeCycle(PoolLabel poolLabel,
+                                                        SamplingApproach samplingApproach,
+                                                        bool ignorePodTransitionsExceptCreation,
+                                                        Random? random)
+        {
+            if (random == null)
+            {
+                return SamplePodLifeCycle(poolLabel, samplingApproach, ignorePodTransitionsExceptCreation);
+            }
+            var previousRandom = RandomSource.UseThread(random);
+            try
+            {
+                return SamplePodLifeCycle(poolLabel, samplingApproach, ignorePodTransitionsExceptCreation);
+            }
+            finally
+            {
+                RandomSource.ResetThread(previousRandom);
+            }
+        }
+
         public PodLifeCycleTimestamps SamplePodLifeCycle(PoolLabel poolLabel,
                                                         SamplingApproach samplingApproach,
                                                         bool ignorePodTransitionsExceptCreation)
@@ -819,53 +1124,6 @@ namespace ServerlessPoolOptimizer
             return podLifeCycleTimestamps;
         }
 
-        public TraceLineFields? GetNextTraceLine(IDictionary<PoolLabel, int> poolLabelToIndex)
-        {
-            TraceLineFields? traceLine = null;
-            foreach (var (poolLabel, poolTraceLines) in PoolLabelToTraceLines)
-            {
-                if (!poolLabelToIndex.ContainsKey(poolLabel))
-                {
-                    continue;
-                }
-                int requestIndex = poolLabelToIndex[poolLabel];
-                if (requestIndex >= poolTraceLines.Count)
-                {
-                    continue;
-                }
-                var tmpTraceLine = poolTraceLines[requestIndex];
-                if (traceLine == null || tmpTraceLine.RelativeTimePoint < traceLine.RelativeTimePoint)
-                {
-                    traceLine = tmpTraceLine;
-                }
-            }
-            return traceLine;
-        }
-
-        public AllocationRequest? GetNextRequest(IDictionary<PoolLabel, int> poolLabelToIndex, double newRefernceTimePoint = -1.0)
-        {
-            AllocationRequest? request = null;
-            foreach (var (poolLabel, poolTraceLines) in PoolLabelToTraceLines)
-            {
-                if (!poolLabelToIndex.ContainsKey(poolLabel))
-                {
-                    continue;
-                }
-                int requestIndex = poolLabelToIndex[poolLabel];
-                if (requestIndex >= poolTraceLines.Count)
-                {
-                    continue;
-                }
-                AllocationRequest tmpRequest = LineFieldsToAllocationRequest(poolTraceLines[requestIndex], newRefernceTimePoint);
-                if (request == null || tmpRequest.ArrivalTimePoint < request.ArrivalTimePoint)
-                {
-                    request = tmpRequest;
-                }
-            }
-
-            return request;
-        }
-
         public AllocationRequest LineFieldsToAllocationRequest(TraceLineFields lineFields, double newRefernceTimePoint = -1.0)
         {
             var allocationLabel = TraceLineFields.ConvertToAllocationLabel(lineFields);
@@ -1011,7 +1269,7 @@ namespace ServerlessPoolOptimizer
     {
         private readonly TraceType _traceType;
         private readonly string _tracePath;
-        private StreamReader reader;
+        private TextReader reader;
 
         private int _linesCounter;
         public TraceReader(string pTracePath, int pSkipLines, TraceType pTraceType)
@@ -1034,6 +1292,15 @@ namespace ServerlessPoolOptimizer
             }
         }
 
+        // reads an already opened stream (stdin, a file being appended to), the header lines are not skipped
+        public TraceReader(TextReader pReader, TraceType pTraceType)
+        {
+            _traceType = pTraceType;
+            _tracePath = "";
+            reader = pReader;
+            _linesCounter = 0;
+        }
+
         public PodLifeCycleLineFields? ParsePodLifeCycleLine()
         {
             string? line = ReadLine();
@@ -1079,6 +1346,12 @@ namespace ServerlessPoolOptimizer
                 var temp = line.Split(",");
                 PodLifeCycleLineFields? podLifeCycle = new PodLifeCycleLineFields();
                 podLifeCycle.PodUUID = temp[0].Trim();
+                DateTime creationRealTime;
+                if (DateTime.TryParseExact(temp[1].Trim(), "yyyy-MM-dd HH:mm:ss.ffffff", System.Globalization.CultureInfo.InvariantCulture,
+                                            System.Globalization.DateTimeStyles.None, out creationRealTime))
+                {
+                    podLifeCycle.CreationRealTime = creationRealTime;
+                }
                 double pendingStartPoint = double.Parse(temp[2].Trim());
                 double readyStartPoint = double.Parse(temp[3].Trim());
                 double allocationStartPoint = double.Parse(temp[4].Trim());
@@ -1214,7 +1487,7 @@ namespace ServerlessPoolOptimizer
             return null;
         }
 
-        private TraceLineFields? LineToTraceFields(string line)
+        internal TraceLineFields? LineToTraceFields(string line)
         {
             try
             {
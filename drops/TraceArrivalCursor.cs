@@ -0,0 +1,97 @@
+using System.Diagnostics;
+
+namespace ServerlessPoolOptimizer
+{
+    /*
+     *  Time-ordered stream of the trace requests, merged lazily from the (already sorted) trace lines of every pool.
+     *  Requests with the same arrival time point come out in the order GetNextRequestsBatch created them:
+     *  by line index, then by pool (dictionary order), one request per pod of the line.
+     */
+    public class TraceArrivalCursor
+    {
+        private readonly List<List<TraceLineFields>> _poolsTraceLines;
+        private readonly int[] _nextLineIndex;
+        private readonly double _newReferenceTimePoint;
+        private readonly Trace _trace;
+        // (arrival time point, line index, pool order) of the current line of every pool that still has lines
+        private readonly PriorityQueue<int, (double, int, int)> _poolHeads;
+        private int _currentPool = -1;
+        private int _currentLinePodsLeft = 0;
+
+        public TraceArrivalCursor(Trace pTrace, double pNewReferenceTimePoint)
+        {
+            _trace = pTrace;
+            _newReferenceTimePoint = pNewReferenceTimePoint;
+            _poolsTraceLines = pTrace.PoolLabelToTraceLines.Values.ToList();
+            _nextLineIndex = new int[_poolsTraceLines.Count];
+            _poolHeads = new PriorityQueue<int, (double, int, int)>();
+            for (int pool = 0; pool < _poolsTraceLines.Count; pool++)
+            {
+                PushPoolHead(pool);
+            }
+        }
+
+        public bool IsExhausted()
+        {
+            return _currentLinePodsLeft == 0 && _poolHeads.Count == 0;
+        }
+
+        // arrival time point of the last request of the last batch, the trigger time of the end of trace event
+        public double GetLastBatchArrivalTimePoint()
+        {
+            int batchesCount = 0;
+            foreach (var poolTraceLines in _poolsTraceLines)
+            {
+                batchesCount = Math.Max(batchesCount, poolTraceLines.Count);
+            }
+            double lastArrivalTimePoint = 0.0;
+            foreach (var poolTraceLines in _poolsTraceLines)
+            {
+                if (poolTraceLines.Count == batchesCount)
+                {
+                    lastArrivalTimePoint = GetArrivalTimePoint(poolTraceLines[batchesCount - 1]);
+                }
+            }
+            return lastArrivalTimePoint;
+        }
+
+        public AllocationRequest? Next()
+        {
+            while (_currentLinePodsLeft == 0)
+            {
+                if (_poolHeads.Count == 0)
+                {
+                    return null;
+                }
+                _currentPool = _poolHeads.Dequeue();
+                _currentLinePodsLeft = _poolsTraceLines[_currentPool][_nextLineIndex[_currentPool]].Pods;
+                _nextLineIndex[_currentPool]++;
+                PushPoolHead(_currentPool);
+            }
+            var lineFields = _poolsTraceLines[_currentPool][_nextLineIndex[_currentPool] - 1];
+            _currentLinePodsLeft--;
+            return _trace.LineFieldsToAllocationRequest(lineFields, _newReferenceTimePoint);
+        }
+
+        private void PushPoolHead(int pool)
+        {
+            int lineIndex = _nextLineIndex[pool];
+            if (lineIndex >= _poolsTraceLines[pool].Count)
+            {
+                return;
+            }
+            var arrivalTimePoint = GetArrivalTimePoint(_poolsTraceLines[pool][lineIndex]);
+            Debug.Assert(lineIndex == 0 || arrivalTimePoint >= GetArrivalTimePoint(_poolsTraceLines[pool][lineIndex - 1]));
+            _poolHeads.Enqueue(pool, (arrivalTimePoint, lineIndex, pool));
+        }
+
+        private double GetArrivalTimePoint(TraceLineFields lineFields)
+        {
+            if (_newReferenceTimePoint == -1.0)
+            {
+                return lineFields.RelativeTimePoint;
+            }
+            return lineFields.RelativeTimePoint + _newReferenceTimePoint - lineFields.ReferenceTimePoint;
+        }
+    }
+}
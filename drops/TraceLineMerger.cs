@@ -0,0 +1,69 @@
+namespace ServerlessPoolOptimizer
+{
+    /*
+     *  k-way merge of the (time-sorted) trace lines of the selected pools, backed by a min-heap of the pool heads,
+     *  so reading N lines of P pools costs O(N log P) instead of scanning every pool per line. Lines with the same
+     *  time point come out in pool (dictionary) order.
+     */
+    public class TraceLineMerger
+    {
+        private readonly List<PoolLabel> _poolLabels;
+        private readonly List<List<TraceLineFields>> _poolsTraceLines;
+        private readonly int[] _nextLineIndex;
+        // (relative time point, pool order) of the current line of every pool that still has lines
+        private readonly PriorityQueue<int, (double, int)> _poolHeads;
+
+        public TraceLineMerger(Trace pTrace, ICollection<PoolLabel>? pPoolLabels = null)
+        {
+            _poolLabels = new List<PoolLabel>();
+            _poolsTraceLines = new List<List<TraceLineFields>>();
+            HashSet<PoolLabel>? selectedPoolLabels = pPoolLabels == null ? null : new HashSet<PoolLabel>(pPoolLabels);
+            foreach (var (poolLabel, poolTraceLines) in pTrace.PoolLabelToTraceLines)
+            {
+                if (selectedPoolLabels == null || selectedPoolLabels.Contains(poolLabel))
+                {
+                    _poolLabels.Add(poolLabel);
+                    _poolsTraceLines.Add(poolTraceLines);
+                }
+            }
+            _nextLineIndex = new int[_poolsTraceLines.Count];
+            _poolHeads = new PriorityQueue<int, (double, int)>();
+            for (int pool = 0; pool < _poolsTraceLines.Count; pool++)
+            {
+                PushPoolHead(pool);
+            }
+        }
+
+        // next line in time order without consuming it, null at the end of the trace
+        public TraceLineFields? Peek()
+        {
+            if (!_poolHeads.TryPeek(out int pool, out _))
+            {
+                return null;
+            }
+            return _poolsTraceLines[pool][_nextLineIndex[pool]];
+        }
+
+        public PoolLabel PeekPoolLabel()
+        {
+            return _poolLabels[_poolHeads.Peek()];
+        }
+
+        // consumes the line returned by Peek
+        public void Advance()
+        {
+            int pool = _poolHeads.Dequeue();
+            _nextLineIndex[pool]++;
+            PushPoolHead(pool);
+        }
+
+        private void PushPoolHead(int pool)
+        {
+            int lineIndex = _nextLineIndex[pool];
+            if (lineIndex < _poolsTraceLines[pool].Count)
+            {
+                _poolHeads.Enqueue(pool, (_poolsTraceLines[pool][lineIndex].RelativeTimePoint, pool));
+            }
+        }
+    }
+}
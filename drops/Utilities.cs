@@ -9,6 +9,12 @@ namespace ServerlessPoolOptimizer
         {
 
             string json = File.ReadAllText(configFile);
+            return ParseExperimentsJson(json);
+        }
+
+        // same as ParseExperiments, from the content of an experiments config file
+        public static List<Experiment> ParseExperimentsJson(string json)
+        {
             using JsonDocument doc = JsonDocument.Parse(json);
             JsonElement rootElement = doc.RootElement;
 
@@ -60,6 +66,7 @@ namespace ServerlessPoolOptimizer
                 }
 
                 string lifeCycleTraceName = exp.GetProperty("lifeCycleTraceName").GetString();
+                int firstNewExperimentIndex = experiments.Count;
 
                 string trainingTraceName;
                 string testingTraceName;
@@ -195,10 +202,75 @@ namespace ServerlessPoolOptimizer
                         ));
                         break;
                 }
+
+                for (int i = firstNewExperimentIndex; i < experiments.Count; i++)
+                {
+                    ParseOptionalExperimentParameters(exp, experiments[i]);
+                }
             }
             return experiments;
         }
 
+        // optional parameters shared by all optimization methods
+        internal static void ParseOptionalExperimentParameters(JsonElement exp, Experiment experiment)
+        {
+            if (exp.TryGetProperty("podLifeCycleJoinWindow", out JsonElement podLifeCycleJoinWindowElem))
+            {
+                experiment.PodLifeCycleJoinWindow = podLifeCycleJoinWindowElem.GetDouble();
+            }
+            if (exp.TryGetProperty("lifeCycleDistributionType", out JsonElement lifeCycleDistributionTypeElem))
+            {
+                experiment.LifeCycleDistributionType = (LifeCycleDistributionType)Enum.Parse(typeof(LifeCycleDistributionType),
+                                                                                            lifeCycleDistributionTypeElem.GetString());
+            }
+            if (exp.TryGetProperty("analysisParallelism", out JsonElement analysisParallelismElem))
+            {
+                experiment.AnalysisParallelism = analysisParallelismElem.GetInt32();
+            }
+            if (exp.TryGetProperty("analysisSeed", out JsonElement analysisSeedElem))
+            {
+                experiment.AnalysisSeed = analysisSeedElem.GetInt32();
+            }
+            if (exp.TryGetProperty("demandAnalysisCacheDirectory", out JsonElement demandAnalysisCacheDirectoryElem))
+            {
+                experiment.DemandAnalysisCacheDirectory = demandAnalysisCacheDirectoryElem.GetString();
+            }
+            if (exp.TryGetProperty("reclaimTerminalObjects", out JsonElement reclaimTerminalObjectsElem))
+            {
+                experiment.ReclaimTerminalObjects = reclaimTerminalObjectsElem.GetBoolean();
+            }
+            if (exp.TryGetProperty("validationLevel", out JsonElement validationLevelElem))
+            {
+                experiment.ValidationLevel = (ValidationLevel)Enum.Parse(typeof(ValidationLevel), validationLevelElem.GetString());
+            }
+            if (exp.TryGetProperty("simulationSeed", out JsonElement simulationSeedElem))
+            {
+                experiment.SimulationSeed = simulationSeedElem.GetInt32();
+            }
+        }
+
+
+        // 97.5% quantile of the Student t distribution (two-sided 95% confidence intervals)
+        public static double GetStudentTQuantile975(int degreesOfFreedom)
+        {
+            double[] quantiles =
+            {
+                12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+                2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+                2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042
+            };
+            if (degreesOfFreedom <= quantiles.Length)
+            {
+                return quantiles[degreesOfFreedom - 1];
+            }
+            // Cornish-Fisher expansion around the normal quantile up to the second order term, below 1e-4 off (too
+            // small) above 30 degrees of freedom
+            double z = 1.959964;
+            double z3 = z * z * z;
+            double z5 = z3 * z * z;
+            double v = degreesOfFreedom;
+            return z + (z3 + z) / (4.0 * v) + (5.0 * z5 + 16.0 * z3 + 3.0 * z) / (96.0 * v * v);
+        }
 
         public static string GetValuePercentageStr(double value, double total)
         {
@@ -263,6 +335,20 @@ namespace ServerlessPoolOptimizer
             }
         }
 
+        internal static void AddDistribution(IDistribution src, IDistribution dst)
+        {
+            if (src.Count() == 0)
+            {
+                return;
+            }
+            var count = src.PairsCount();
+            for (int i = 0; i < count; i++)
+            {
+                var element = src.GetValueFreqPairByIndex(i);
+                dst.AddValueFrequency(element.Key, element.Value.Item1);
+            }
+        }
+
         internal static void AddDistribution(DistributionEmpiricalFrequencyArray src,
                                                 DistributionEmpiricalFrequencyArray dst)
         {
@@ -276,8 +362,16 @@ namespace ServerlessPoolOptimizer
             }
         }
 
+        // frozen VM creation distributions by file path, shared read-only by the experiments of the process
+        private static readonly Dictionary<string, DistributionEmpiricalFrequencyArray> _vmCreationDistributionsCache =
+                                                                new Dictionary<string, DistributionEmpiricalFrequencyArray>();
+
         public static DistributionEmpiricalFrequencyArray GetVmCreationDistribution(string path)
         {
+            if (_vmCreationDistributionsCache.TryGetValue(path, out var cachedDistribution))
+            {
+                return cachedDistribution;
+            }
             var hostRoleCreationDelayDistribution = new DistributionEmpiricalFrequencyArray();
             try
             {
@@ -291,6 +385,8 @@ namespace ServerlessPoolOptimizer
                 Console.WriteLine("Error while parsing VM creation CDF file: {0}", path);
                 Environment.Exit(0);
             }
+            hostRoleCreationDelayDistribution.Freeze();
+            _vmCreationDistributionsCache[path] = hostRoleCreationDelayDistribution;
             return hostRoleCreationDelayDistribution;
         }
 
@@ -470,6 +566,12 @@ namespace ServerlessPoolOptimizer
                 combinedResults.TotalFailedRequests += percentileResults.TotalFailedRequests;
                 combinedResults.HostRolesPoolSize += percentileResults.HostRolesPoolSize;
                 combinedResults.HostRolesList.AddRange(percentileResults.HostRolesList);
+                if (percentileResults.ReclaimedHostRolesTimeTracker != null)
+                {
+                    combinedResults.ReclaimedHostRolesTimeTracker ??= new HostRoleStateTimeTracker(-1);
+                    combinedResults.ReclaimedHostRolesTimeTracker.Add(percentileResults.ReclaimedHostRolesTimeTracker);
+                    combinedResults.ReclaimedHostRolesCount += percentileResults.ReclaimedHostRolesCount;
+                }
                 Utilities.AddDistribution(percentileResults.RequestLatencyDistribution, combinedResults.RequestLatencyDistribution);
                 foreach (var (poolLabel, poolStats) in percentileResults.PoolLabelToPoolStatsMap)
                 {
@@ -0,0 +1,83 @@
+namespace ServerlessPoolOptimizer
+{
+    /*
+     *  Invariant checks of the simulator hot path (pod/host role transitions, event creation). Unlike Debug.Assert
+     *  they also run in Release builds, depending on the level: Full checks everything, Sampled checks one
+     *  checkpoint every Parameter.ValidationSampleEvery, Off skips all of them. The failure message is only
+     *  formatted when a check fails.
+     */
+    public static class Validation
+    {
+#if DEBUG
+        public static readonly ValidationLevel DefaultLevel = ValidationLevel.Full;
+#else
+        public static readonly ValidationLevel DefaultLevel = ValidationLevel.Off;
+#endif
+        // per thread, the experiments of parallel replications may have different levels
+        [ThreadStatic]
+        private static ValidationLevel? _level;
+        [ThreadStatic]
+        private static long _checkpointsCount;
+
+        public static ValidationLevel Level
+        {
+            get { return _level ?? DefaultLevel; }
+            set { _level = value; }
+        }
+
+        // true if the (expensive) invariants of the current checkpoint should be verified
+        public static bool ShouldCheck()
+        {
+            switch (Level)
+            {
+                case ValidationLevel.Full:
+                    return true;
+                case ValidationLevel.Sampled:
+                    _checkpointsCount++;
+                    return _checkpointsCount % Parameter.ValidationSampleEvery == 0;
+                default:
+                    return false;
+            }
+        }
+
+        public static void Check(bool condition, string message)
+        {
+            if (!condition && Level != ValidationLevel.Off)
+            {
+                throw new InvalidOperationException(message);
+            }
+        }
+
+        public static void Check<T0>(bool condition, string format, T0 arg0)
+        {
+            if (!condition && Level != ValidationLevel.Off)
+            {
+                throw new InvalidOperationException(String.Format(format, arg0));
+            }
+        }
+
+        public static void Check<T0, T1>(bool condition, string format, T0 arg0, T1 arg1)
+        {
+            if (!condition && Level != ValidationLevel.Off)
+            {
+                throw new InvalidOperationException(String.Format(format, arg0, arg1));
+            }
+        }
+
+        public static void Check<T0, T1, T2>(bool condition, string format, T0 arg0, T1 arg1, T2 arg2)
+        {
+            if (!condition && Level != ValidationLevel.Off)
+            {
+                throw new InvalidOperationException(String.Format(format, arg0, arg1, arg2));
+            }
+        }
+
+        public static void Check<T0, T1, T2, T3>(bool condition, string format, T0 arg0, T1 arg1, T2 arg2, T3 arg3)
+        {
+            if (!condition && Level != ValidationLevel.Off)
+            {
+                throw new InvalidOperationException(String.Format(format, arg0, arg1, arg2, arg3));
+            }
+        }
+    }
+}
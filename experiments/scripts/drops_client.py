@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Client of the long-lived simulator (drops --serve).
+
+The simulator keeps the VM creation distributions, predicted traces and demand analysis caches of the previous jobs,
+so sweeps and what-if queries sent to the same server skip that work. Use it either through a Unix socket served by
+`drops --serve /tmp/drops.sock`, or let the client start `drops --serve` itself and talk over its stdin/stdout.
+
+    from drops_client import DropsClient
+    with DropsClient() as client:
+        reply = client.run(config_path="./config/test.json")
+        print(reply["cost"])
+"""
+import argparse
+import json
+import socket
+import subprocess
+import sys
+from pathlib import Path
+
+DEFAULT_BINARY = str(Path(__file__).resolve().parent.parent.parent / "drops" / "build" / "drops")
+
+
+class DropsError(RuntimeError):
+    pass
+
+
+class DropsClient:
+    def __init__(self, socket_path=None, binary=DEFAULT_BINARY, log=None):
+        """
+        socket_path: connect to a running `drops --serve <socket_path>`, otherwise start `binary --serve`.
+        log: file object receiving the simulator log of a started server (default: inherited stderr).
+        """
+        self.socket_path = socket_path
+        self._process = None
+        if socket_path is None:
+            self._process = subprocess.Popen([binary, "--serve"],
+                                             stdin=subprocess.PIPE,
+                                             stdout=subprocess.PIPE,
+                                             stderr=log,
+                                             text=True,
+                                             bufsize=1)
+        self._next_id = 0
+
+    def run(self, config=None, config_path=None, on_progress=None):
+        """
+        Runs one experiments config (a dict, or the path of a config file) and returns the final reply:
+        {"id", "status": "ok", "resultsPath", "elapsedSeconds", "cost": <content of cost.csv>}.
+        on_progress(reply) is called after every finished experiment.
+        """
+        if (config is None) == (config_path is None):
+            raise ValueError("pass exactly one of config or config_path")
+        request = {"id": self._next_id}
+        self._next_id += 1
+        if config is not None:
+            request["config"] = config
+        else:
+            request["configPath"] = str(Path(config_path).resolve())
+
+        if self._process is not None:
+            return self._exchange(self._process.stdin, self._process.stdout, request, on_progress)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(self.socket_path)
+            with sock.makefile("rw", encoding="utf-8", newline="\n") as stream:
+                return self._exchange(stream, stream, request, on_progress)
+
+    def shutdown(self):
+        """Stops the server (started or connected to)."""
+        if self._process is not None:
+            if self._process.poll() is None:
+                self._process.stdin.close()
+                self._process.wait()
+            self._process = None
+        elif self.socket_path is not None:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(self.socket_path)
+                sock.sendall(b'{"command": "shutdown"}\n')
+                sock.recv(1024)
+
+    def close(self):
+        """Stops a started server, leaves a socket server running."""
+        if self._process is not None:
+            self.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def _exchange(requests, replies, request, on_progress):
+        requests.write(json.dumps(request) + "\n")
+        requests.flush()
+        while True:
+            line = replies.readline()
+            if not line:
+                raise DropsError("the simulator closed the connection")
+            reply = json.loads(line)
+            if reply.get("id") != request["id"]:
+                continue
+            status = reply["status"]
+            if status == "progress":
+                if on_progress is not None:
+                    on_progress(reply)
+            elif status == "ok":
+                return reply
+            elif status == "error":
+                raise DropsError(reply.get("message", "unknown error"))
+
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Run experiments configs on a long-lived drops simulator")
+    ap.add_argument("configs", nargs="*", help="experiments config files, run one after the other")
+    ap.add_argument("--socket", default=None,
+                    help="Unix socket of a running `drops --serve <socket>` (default: start a server)")
+    ap.add_argument("--binary", default=DEFAULT_BINARY, help="simulator binary used to start a server")
+    ap.add_argument("--shutdown", action="store_true", help="stop the server after the configs")
+    return ap.parse_args()
+
+
+def main():
+    args = parse_args()
+    client = DropsClient(socket_path=args.socket, binary=args.binary)
+    try:
+        for config_path in args.configs:
+            reply = client.run(config_path=config_path,
+                               on_progress=lambda r: print(f"[{r['index'] + 1}/{r['count']}] {r['experiment']}",
+                                                           file=sys.stderr))
+            print(f"# {config_path}: {reply['elapsedSeconds']:.1f} s, results in {reply['resultsPath']}",
+                  file=sys.stderr)
+            print(reply["cost"], end="")
+    finally:
+        if args.shutdown:
+            client.shutdown()
+        else:
+            client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Fast pool-size screening without the event simulator.
+
+Reads the allocation and lifecycle traces used by drops and, for every pool, estimates the failure rate (requests
+that find the pool empty) and the idle core-hours of the pool for static or per-window pool sizes. It uses the model
+of AnalysisHelper.PerRequestPodDemandAnalysis: every allocation takes a pod from the pool and a replacement becomes
+ready after a supply delay (creation + pending), so the pods missing from the pool at time t are the requests still
+waiting for their replacement. A request fails when the pool size is smaller than the in-flight replenishments plus
+itself. The estimate ignores host role capacity, recycling and the optimizer, use it to shortlist configs for drops.
+
+    python3 pool_estimator.py --trace ../traces/trace.csv --lifecycle ../traces/lifecycles.csv --sizes 0:400:10
+"""
+import argparse
+import csv
+import sys
+
+import numpy as np
+import pandas as pd
+
+# header lines of both traces (Parameter.TraceSkipLinesCount)
+TRACE_SKIP_LINES = 2
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def read_allocations(trace_path):
+    """Allocation requests of the trace: {pool label: sorted arrival times (s)}, {pod uuid: pool label}."""
+    df = pd.read_csv(trace_path, header=None, names=range(13), skiprows=TRACE_SKIP_LINES,
+                     usecols=[0, 2, 3, 6, 11, 12], quoting=csv.QUOTE_NONE, dtype=str, skipinitialspace=True)
+    real_time = pd.to_datetime(df[0].str.strip(), format=TIME_FORMAT)
+    # relative to the first line of the trace, as Trace.ParseAllocationTrace
+    relative_time = (real_time - real_time.iloc[0]).dt.total_seconds().to_numpy()
+
+    allocations = df[3].str.strip() == "Allocate"
+    df = df[allocations]
+    relative_time = relative_time[allocations.to_numpy()]
+
+    cores_str = df[6].str.strip()
+    millicores = cores_str.str.endswith("m")
+    cores = pd.to_numeric(cores_str.str.rstrip("m"))
+    cores = np.where(millicores, cores / 1000.0, cores)
+    runtime = df[11].str.split("=").str[1]
+    runtime_version = df[12].str.split("=").str[1].str.split('"').str[0].str.split("--cores").str[0]
+    labels = runtime + "|" + runtime_version + "|" + pd.Series(cores, index=df.index).map(lambda c: f"{c:g}")
+
+    arrivals = {}
+    for label, times in pd.Series(relative_time, index=df.index).groupby(labels):
+        arrivals[label] = np.sort(times.to_numpy())
+    pod_pools = dict(zip(df[2].str.strip(), labels))
+    return arrivals, pod_pools
+
+
+def read_supply_delays(lifecycle_path, pod_pools):
+    """Supply delays (creation + pending, s) of the allocated pods, by pool label."""
+    df = pd.read_csv(lifecycle_path, header=None, skiprows=TRACE_SKIP_LINES, usecols=range(11),
+                     quoting=csv.QUOTE_NONE, skipinitialspace=True,
+                     converters={0: str.strip, 1: str})
+    timestamps = df[list(range(2, 11))].apply(pd.to_numeric, errors="coerce")
+    # lines with a missing timestamp are life cycles with errors (TraceReader.LineToPodLifeCycle)
+    valid = (timestamps > 0).all(axis=1).to_numpy()
+    pods = df[0].to_numpy()[valid]
+    # creation = pending start, supply = creation + pending = ready start
+    supply = timestamps[3].to_numpy()[valid] / 1000.0
+    pools = pd.Series(pods).map(pod_pools)
+    delays = {}
+    for label, values in pd.Series(supply).groupby(pools.to_numpy()):
+        delays[label] = values.to_numpy()
+    return delays
+
+
+def sample_delays(delays, count, approach, rng):
+    if approach == "mean":
+        return np.full(count, delays.mean())
+    if approach == "max":
+        return np.full(count, delays.max())
+    return rng.choice(delays, size=count)
+
+
+class PoolEstimator:
+    """Demand of one pool: in-flight replenishments seen by every arrival and the time spent at each level."""
+
+    def __init__(self, arrivals, delays, cores, horizon):
+        self.cores = cores
+        self.horizon = horizon
+        self.arrivals = arrivals
+        replenished = np.sort(arrivals + delays)
+        # requests before i not replenished yet at arrivals[i], plus request i itself; a replacement is always
+        # ready after its own request (delay > 0), so counting all replenishments up to arrivals[i] is enough
+        self.in_flight = np.arange(1, arrivals.size + 1) - np.searchsorted(replenished, arrivals, side="right")
+        self.sorted_in_flight = np.sort(self.in_flight)
+
+        # in-flight level as a step function over [0, horizon]
+        self.times = np.concatenate(([0.0], arrivals, replenished))
+        steps = np.concatenate(([0], np.ones(arrivals.size, dtype=np.int64), -np.ones(arrivals.size, dtype=np.int64)))
+        order = np.argsort(self.times, kind="stable")
+        self.times = np.minimum(self.times[order], horizon)
+        self.levels = np.cumsum(steps[order])
+        durations = np.diff(np.append(self.times, horizon))
+        # seconds spent at every level, and their prefix sums for idle(size) = sum_{b < size} (size - b) * T[b]
+        time_at_level = np.bincount(self.levels, weights=durations)
+        self._cum_time = np.concatenate(([0.0], np.cumsum(time_at_level)))
+        self._cum_level_time = np.concatenate(([0.0], np.cumsum(time_at_level * np.arange(time_at_level.size))))
+
+    def static(self, sizes):
+        """(failed requests, idle core-hours) of every static pool size in sizes."""
+        sizes = np.asarray(sizes, dtype=np.int64)
+        failed = self.arrivals.size - np.searchsorted(self.sorted_in_flight, sizes, side="right")
+        # levels at or above the size leave no idle pod
+        below = np.minimum(sizes, self._cum_time.size - 1)
+        idle_seconds = sizes * self._cum_time[below] - self._cum_level_time[below]
+        return failed, idle_seconds * self.cores / 3600.0
+
+    def per_window(self, window_sizes, window):
+        """(failed requests, idle core-hours) of a pool size per window of `window` seconds."""
+        window_sizes = np.asarray(window_sizes, dtype=np.int64)
+        arrival_windows = np.minimum((self.arrivals // window).astype(np.int64), window_sizes.size - 1)
+        failed = int(np.count_nonzero(self.in_flight > window_sizes[arrival_windows]))
+
+        # split the level steps at the window boundaries, a boundary keeps the level of the step it falls in
+        boundaries = np.arange(1, window_sizes.size) * window
+        boundaries = boundaries[boundaries < self.horizon]
+        boundary_levels = self.levels[np.searchsorted(self.times, boundaries, side="right") - 1]
+        times = np.concatenate((self.times, boundaries))
+        order = np.argsort(times, kind="stable")
+        times = times[order]
+        levels = np.concatenate((self.levels, boundary_levels))[order]
+        durations = np.diff(np.append(times, self.horizon))
+        windows = np.minimum((times // window).astype(np.int64), window_sizes.size - 1)
+        idle_seconds = np.sum(np.maximum(window_sizes[windows] - levels, 0) * durations)
+        return failed, idle_seconds * self.cores / 3600.0
+
+
+def parse_sizes(sizes_str):
+    """'a:b:step' (b excluded) or 'a,b,c'."""
+    if ":" in sizes_str:
+        start, stop, step = (int(v) for v in sizes_str.split(":"))
+        return np.arange(start, stop, step)
+    return np.array([int(v) for v in sizes_str.split(",")])
+
+
+def read_window_sizes(path):
+    """CSV with columns pool,window,size (pool as runtime|version|cores), into {pool: sizes per window}."""
+    df = pd.read_csv(path)
+    window_sizes = {}
+    for pool, rows in df.groupby("pool"):
+        sizes = np.zeros(rows["window"].max() + 1, dtype=np.int64)
+        sizes[rows["window"].to_numpy()] = rows["size"].to_numpy()
+        window_sizes[pool] = sizes
+    return window_sizes
+
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Estimate per-pool failure rate and idle core-hours for pool sizes")
+    ap.add_argument("--trace", required=True, help="container allocation trace")
+    ap.add_argument("--lifecycle", required=True, help="pod lifecycle trace")
+    ap.add_argument("--sizes", default=None, help="static pool sizes, 'start:stop:step' or 'a,b,c'")
+    ap.add_argument("--window-sizes", default=None, help="CSV pool,window,size of per-window pool sizes")
+    ap.add_argument("--window", type=float, default=3600, help="window length (s) of --window-sizes")
+    ap.add_argument("--delay", choices=["random", "mean", "max"], default="random",
+                    help="supply delay of every request: sampled from the pool's delays, their mean or their max")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--min-requests", type=int, default=1, help="skip pools with fewer allocation requests")
+    ap.add_argument("--out", default="-", help="output CSV (default stdout)")
+    return ap.parse_args()
+
+
+def main():
+    args = parse_args()
+    if (args.sizes is None) == (args.window_sizes is None):
+        sys.exit("pass exactly one of --sizes or --window-sizes")
+    rng = np.random.default_rng(args.seed)
+
+    arrivals, pod_pools = read_allocations(args.trace)
+    delays = read_supply_delays(args.lifecycle, pod_pools)
+    horizon = max(times[-1] for times in arrivals.values())
+    sizes = parse_sizes(args.sizes) if args.sizes is not None else None
+    window_sizes = read_window_sizes(args.window_sizes) if args.window_sizes is not None else None
+
+    rows = []
+    for pool in sorted(arrivals):
+        pool_arrivals = arrivals[pool]
+        if pool_arrivals.size < args.min_requests or pool not in delays:
+            print(f"skipping {pool}: {pool_arrivals.size} requests, {pool in delays and delays[pool].size} delays",
+                  file=sys.stderr)
+            continue
+        cores = float(pool.split("|")[2])
+        estimator = PoolEstimator(pool_arrivals,
+                                  sample_delays(delays[pool], pool_arrivals.size, args.delay, rng),
+                                  cores, horizon)
+        if sizes is not None:
+            failed, idle = estimator.static(sizes)
+            for size, pool_failed, pool_idle in zip(sizes, failed, idle):
+                rows.append((pool, str(size), pool_arrivals.size, pool_failed, pool_idle))
+        elif pool in window_sizes:
+            failed, idle = estimator.per_window(window_sizes[pool], args.window)
+            rows.append((pool, "per-window", pool_arrivals.size, failed, idle))
+
+    df = pd.DataFrame(rows, columns=["Pool", "Size", "Requests", "Failed Requests", "Idle Core Hours"])
+    df["Failure Rate"] = df["Failed Requests"] / df["Requests"]
+    df.to_csv(sys.stdout if args.out == "-" else args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+#!/usr/bin/env bash
+
+# runs the experiments of a config in <shards> processes, then merges their results into cost.csv
+if [ $# -lt 2 ]; then
+    echo "Usage: $0 exp.json shards"
+    exit 1
+fi
+
+echo $1
+
+pids=()
+for ((i = 0; i < $2; i++)); do
+    ../drops/build/drops --shard "$i/$2" "$1" > >(sed "s/^/[shard $i] /") 2>&1 &
+    pids+=($!)
+done
+
+for pid in "${pids[@]}"; do
+    if ! wait "$pid"; then
+        echo "a shard failed, not merging"
+        exit 1
+    fi
+done
+
+../drops/build/drops --merge "$2" "$1"